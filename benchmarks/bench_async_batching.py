@@ -0,0 +1,164 @@
+"""Async batching benchmark: sequential vs dependency-aware concurrent API calls in generated async pytest suites.
+
+Every test logs in, reads a catalog of independent items, places an
+order and reads it back, against a local stub server that answers each
+request after ``--latency`` ms. The stub records when each request
+started and finished, so the run also checks that calls the diagram
+orders (everything after the login, the read after the order) never
+overlap the calls they depend on. Needs aiohttp and pytest-asyncio.
+
+Usage:
+    python benchmarks/bench_async_batching.py [--scenarios 50] [--items 6] [--latency 20] [--limit 4]
+"""
+
+import argparse
+import importlib.util
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.generators import PytestGenerator, ScenarioBundle, fan_out  # noqa: E402
+from bai_test_mcp.generators.lowering import lower_scenario, plan_call_batches  # noqa: E402
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+
+_SCENARIO = re.compile(r"^/s(\d+)/")
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self, latency):
+        super().__init__(("localhost", 0), StubHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.log = defaultdict(list)  # scenario -> [(method, path, start, end)]
+        self.active = 0
+        self.peak = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def respond(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        start = time.perf_counter()
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(server.latency)
+        with server.lock:
+            server.active -= 1
+            server.log[_SCENARIO.match(self.path).group(1)].append(
+                (self.command, self.path, start, time.perf_counter()))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    do_GET = do_POST = respond
+    
+    def log_message(self, *args):
+        pass
+
+
+def api_call(method, endpoint, payload=None):
+    data = {'method': method, 'endpoint': endpoint}
+    if payload:
+        data['payload'] = payload
+    return TestStep(StepType.API_CALL, "Frontend", "API", f"{method} {endpoint}", data)
+
+
+def make_scenarios(count, items):
+    scenarios = []
+    for n in range(count):
+        steps = [api_call('POST', f"/s{n}/auth/login", '{"email": "user@example.com"}'),
+                 TestStep(StepType.ASSERTION, "API", "Frontend", "JWT 토큰 발급", {})]
+        for i in range(items):
+            steps.append(api_call('GET', f"/s{n}/catalog/{i}"))
+            steps.append(TestStep(StepType.ASSERTION, "API", "Frontend", "200 OK", {}))
+        steps.append(api_call('POST', f"/s{n}/orders", '{"item": 1}'))
+        steps.append(api_call('GET', f"/s{n}/orders/1"))
+        scenarios.append(TestScenario(f"shop_{n}", f"Shop scenario {n}", steps))
+    return scenarios
+
+
+def check_order(log):
+    """Calls the diagram orders must not overlap: the login before all, the order before reading it back."""
+    for scenario, requests in log.items():
+        by_path = {path: (start, end) for _, path, start, end in requests}
+        login_end = by_path[f"/s{scenario}/auth/login"][1]
+        if any(start < login_end for path, (start, _) in by_path.items() if not path.endswith("/login")):
+            raise SystemExit(f"scenario {scenario}: a call started before the login finished")
+        if by_path[f"/s{scenario}/orders/1"][0] < by_path[f"/s{scenario}/orders"][1]:
+            raise SystemExit(f"scenario {scenario}: the order was read before it was placed")
+
+
+def run(server, test_file):
+    server.log.clear()
+    server.peak = 0
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-p", "asyncio",
+                             "--asyncio-mode=auto", str(test_file)], capture_output=True, text=True, cwd=test_file.parent)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(f"{test_file.name} failed:\n{result.stdout[-3000:]}{result.stderr[-2000:]}")
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", type=int, default=50)
+    ap.add_argument("--items", type=int, default=6)
+    ap.add_argument("--latency", type=float, default=20, help="Stub response time in ms")
+    ap.add_argument("--limit", type=int, default=4, help="max_concurrency of the batched suite")
+    args = ap.parse_args()
+    
+    if not all(importlib.util.find_spec(name) for name in ("aiohttp", "pytest_asyncio")):
+        raise SystemExit("needs aiohttp and pytest-asyncio")
+    
+    scenarios = make_scenarios(args.scenarios, args.items)
+    runs = plan_call_batches(lower_scenario(scenarios[0]).steps)
+    rounds = sum(1 for run_steps in runs if any(step.request is not None for step in run_steps))
+    calls = sum(1 for step in scenarios[0].steps if step.step_type == StepType.API_CALL)
+    print(f"{args.scenarios} tests x {calls} API calls, {args.latency:.0f} ms per response; "
+          f"batched plan: {rounds} rounds, at most {args.limit} calls at once")
+    
+    server = StubServer(args.latency / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://localhost:{server.server_address[1]}"
+    bundle = ScenarioBundle("shop", scenarios)
+    
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, config in (("sequential", {}), (f"batched, limit {args.limit}", {'max_concurrency': args.limit})):
+            generator = PytestGenerator({'base_url': base_url, 'use_async': True, **config})
+            test = fan_out(bundle, {'pytest': generator})['pytest']
+            test_file = Path(tmp) / ("batched" if config else "sequential") / test.name
+            test.save(test_file)
+            elapsed = run(server, test_file)
+            check_order(server.log)
+            if server.peak > max(1, args.limit):
+                raise SystemExit(f"{label}: {server.peak} calls in flight, limit is {args.limit}")
+            baseline = baseline or elapsed
+            print(f"  {label:<18} {elapsed:6.2f}s  peak {server.peak} in flight  {baseline / elapsed:.1f}x")
+    print("  ordered calls never overlapped")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
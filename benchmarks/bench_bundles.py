@@ -0,0 +1,121 @@
+"""Bundling benchmark: pytest collection and per-spec process startup, one file per scenario vs bundles.
+
+Generates the same scenarios as one pytest module per scenario and as
+bundles of ``--bundle`` scenarios, then times ``pytest --collect-only`` on
+each layout. Per-file pytest modules get a ``.py`` suffix here so pytest
+collects them. Cypress isn't installed here, so the per-spec startup it
+pays (one browser run per spec file) is approximated by starting one
+``node --check`` process per Cypress spec, when node is available.
+
+Usage:
+    python benchmarks/bench_bundles.py [--scenarios 2000] [--steps 10] [--bundle 100 500]
+"""
+
+import argparse
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.generators import CypressGenerator, PytestGenerator, bundle_scenarios, fan_out  # noqa: E402
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+
+ACTIONS = ["이메일 입력", "로그인 버튼 클릭", 'click "Save" button', "JWT 토큰 검증", "메인 페이지로 리다이렉트"]
+
+
+def make_scenarios(count, steps, rng, repeat_every=0):
+    scenarios = []
+    for n in range(count):
+        scenario_steps = []
+        for i in range(steps):
+            step_type = rng.choice([StepType.USER_ACTION, StepType.API_CALL, StepType.ASSERTION, StepType.NOTE])
+            data = {}
+            if step_type == StepType.API_CALL:
+                data = {'method': rng.choice(['GET', 'POST']), 'endpoint': f"/api/items/{i}"}
+            scenario_steps.append(TestStep(step_type, "User", "API", rng.choice(ACTIONS), data))
+        name = f"flow_{n - 1}" if repeat_every and n % repeat_every == repeat_every - 1 else f"flow_{n}"
+        scenarios.append(TestScenario(name, f"Scenario {n}", scenario_steps))
+    return scenarios
+
+
+def write_layout(units, generators, output_dir):
+    start = time.perf_counter()
+    for unit in units:
+        for name, test in fan_out(unit, generators).items():
+            file_name = test.name if test.name.endswith(('.py', '.js')) else f"{test.name}.py"
+            test.save(output_dir / name / file_name)
+    return time.perf_counter() - start
+
+
+def collect(test_dir):
+    """Time pytest collection of a directory; returns (seconds, tests collected)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", "--rootdir", str(test_dir),
+         str(test_dir)], capture_output=True, text=True, cwd=test_dir)
+    elapsed = time.perf_counter() - start
+    match = re.search(r"(\d+) tests? collected", result.stdout)
+    if result.returncode != 0 or match is None:
+        raise SystemExit(f"pytest collection failed in {test_dir}:\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+    return elapsed, int(match.group(1))
+
+
+def spec_startup(spec_dir):
+    """Time starting one node process per spec file (syntax check only)."""
+    start = time.perf_counter()
+    for spec in sorted(spec_dir.iterdir()):
+        subprocess.run(["node", "--check", str(spec)], check=True)
+    return time.perf_counter() - start
+
+
+def check_unique_names(generators):
+    scenarios = make_scenarios(200, 3, random.Random(1), repeat_every=10)
+    with tempfile.TemporaryDirectory() as tmp:
+        write_layout(bundle_scenarios(scenarios, 50), generators, Path(tmp))
+        _, collected = collect(Path(tmp) / "pytest")
+    if collected != len(scenarios):
+        raise SystemExit(f"bundles with repeated names collected {collected} of {len(scenarios)} tests")
+    print(f"repeated scenario names de-duplicated: {collected}/{len(scenarios)} tests collected")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", type=int, default=2000)
+    ap.add_argument("--steps", type=int, default=10)
+    ap.add_argument("--bundle", type=int, nargs="+", default=[100, 500])
+    args = ap.parse_args()
+    
+    generators = {'pytest': PytestGenerator(), 'cypress': CypressGenerator()}
+    check_unique_names(generators)
+    
+    scenarios = make_scenarios(args.scenarios, args.steps, random.Random(0))
+    layouts = [("per scenario", scenarios)] + [
+        (f"bundle {size}", bundle_scenarios(scenarios, size)) for size in args.bundle]
+    node = shutil.which("node")
+    
+    print(f"{len(scenarios)} scenarios x {args.steps} steps")
+    print(f"  {'layout':<14} {'files':>6} {'generate':>9} {'collect':>9} {'spec startup':>13}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, units in layouts:
+            output_dir = Path(tmp) / label.replace(" ", "_")
+            generate = write_layout(units, generators, output_dir)
+            collect_time, collected = collect(output_dir / "pytest")
+            if collected != len(scenarios):
+                raise SystemExit(f"{label}: collected {collected} of {len(scenarios)} tests")
+            startup = f"{spec_startup(output_dir / 'cypress'):12.2f}s" if node else f"{'n/a':>13}"
+            files = len(list((output_dir / "pytest").iterdir()))
+            baseline = baseline or collect_time
+            print(f"  {label:<14} {files:>6} {generate:8.2f}s {collect_time:8.2f}s {startup}"
+                  f"  (collection {baseline / collect_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Step classification benchmark: keyword scans vs the compiled classifier.
+
+Usage:
+    python benchmarks/bench_classifier.py [--messages 1000000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.parsers.base import StepType  # noqa: E402
+from bai_test_mcp.parsers.classifier import DEFAULT_STEP_RULES, StepClassifier  # noqa: E402
+
+
+SAMPLES = [
+    ("User", "Frontend", "->>", "Enter email and password"),
+    ("User", "Frontend", "->>", "Click \"Login\" button"),
+    ("Frontend", "API", "->>", "POST /api/v1/users/login"),
+    ("API", "Frontend", "-->>", "JWT tokens (cookies)"),
+    ("Frontend", "Frontend", "->>", "Redirect to dashboard"),
+    ("User", "Browser", "->>", "Navigate to /signup"),
+    ("User", "Frontend", "->>", "이메일/비밀번호 입력"),
+    ("User", "Frontend", "->>", "접속 (로그인 페이지)"),
+    ("API", "Security", "->>", "사용자 ID 암호화 (AES-256)"),
+    ("DB", "API", "-->>", "사용자 정보"),
+]
+
+
+def keyword_scan(source, target, arrow, message):
+    """The original MermaidInterpreter._determine_step_type."""
+    message_lower = message.lower()
+    if any(method in message_lower for method in ['get ', 'post ', 'put ', 'delete ', 'patch ']):
+        return StepType.API_CALL
+    if source.lower() in ['user', 'client', 'browser']:
+        if any(action in message_lower for action in ['click', 'type', 'enter', 'select', 'submit']):
+            return StepType.USER_ACTION
+        elif any(nav in message_lower for nav in ['navigate', 'go to', 'visit', 'open']):
+            return StepType.NAVIGATION
+    if arrow.startswith('--'):
+        return StepType.ASSERTION
+    return StepType.USER_ACTION
+
+
+def rule_scan(source, target, arrow, message):
+    """any() scans over the same multilingual rule table the classifier compiles."""
+    message_lower = message.lower()
+    source_lower = source.lower()
+    for rule in DEFAULT_STEP_RULES:
+        if rule.get("actors") and source_lower not in rule["actors"]:
+            continue
+        if rule.get("arrows") and not arrow.startswith(tuple(rule["arrows"])):
+            continue
+        keywords = rule.get("keywords")
+        if not keywords or any(k in message_lower for k in keywords):
+            return StepType(rule["type"])
+    return StepType.USER_ACTION
+
+
+def timed(label, fn, corpus):
+    start = time.perf_counter()
+    for source, target, arrow, message in corpus:
+        fn(source, target, arrow, message)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed:6.2f}s  {len(corpus) / elapsed / 1e6:5.2f} M msg/s")
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--messages", type=int, default=1_000_000)
+    args = ap.parse_args()
+    
+    classifier = StepClassifier()
+    corpus = [SAMPLES[i % len(SAMPLES)] for i in range(args.messages)]
+    
+    print("classification (old -> new):")
+    for sample in SAMPLES:
+        print(f"  {sample[3]:<32} {keyword_scan(*sample).value:<12} {classifier.classify(*sample).value}")
+    
+    print(f"{len(corpus)} messages")
+    timed("old English scans", keyword_scan, corpus)
+    timed("any() over rule table", rule_scan, corpus)
+    timed("compiled classifier", classifier.classify, corpus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Multi-framework generation benchmark: one generator at a time vs fan-out from a shared lowering.
+
+Usage:
+    python benchmarks/bench_fanout.py [--scenarios 2000] [--steps 50]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.generators import BUILTIN_GENERATORS, fan_out, lower_scenario  # noqa: E402
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+
+ACTIONS = [
+    "이메일 입력", "비밀번호 입력", "로그인 버튼 클릭", 'click "Save" button', "type email address",
+    "JWT 토큰 검증", "에러 메시지 표시", "메인 페이지로 리다이렉트", "select country", "사이트 접속",
+]
+
+
+def make_scenarios(count, steps, rng):
+    scenarios = []
+    for n in range(count):
+        scenario_steps = []
+        for i in range(steps):
+            step_type = rng.choice(list(StepType))
+            data = {}
+            if step_type == StepType.API_CALL:
+                data = {'method': rng.choice(['GET', 'POST']), 'endpoint': f"/api/items/{i}"}
+            scenario_steps.append(TestStep(step_type, "User", "API", rng.choice(ACTIONS), data))
+        scenarios.append(TestScenario(f"flow_{n}", "Benchmark scenario", scenario_steps))
+    return scenarios
+
+
+def per_framework(generators, scenarios):
+    return [generator.generate(scenario).get_full_code()
+            for scenario in scenarios for generator in generators.values()]
+
+
+def fanned_out(generators, scenarios):
+    return [test.get_full_code()
+            for scenario in scenarios for test in fan_out(scenario, generators).values()]
+
+
+def timed(label, run, generators, scenarios):
+    start = time.perf_counter()
+    output = run(generators, scenarios)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<16} {elapsed:7.2f}s  {len(scenarios) / elapsed:8.0f} scenarios/s")
+    return output, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", type=int, default=2000)
+    ap.add_argument("--steps", type=int, default=50)
+    args = ap.parse_args()
+    
+    scenarios = make_scenarios(args.scenarios, args.steps, random.Random(0))
+    generators = {name: generator_class() for name, generator_class in BUILTIN_GENERATORS.items()}
+    
+    start = time.perf_counter()
+    for scenario in scenarios:
+        lower_scenario(scenario)
+    lowering = time.perf_counter() - start
+    
+    print(f"{len(scenarios)} scenarios x {args.steps} steps, {len(generators)} frameworks")
+    print(f"  lowering alone   {lowering:7.2f}s")
+    before, before_time = timed("per framework", per_framework, generators, scenarios)
+    after, after_time = timed("fan-out", fanned_out, generators, scenarios)
+    if before != after:
+        raise SystemExit("fan-out output differs from per-framework generation")
+    print(f"  output identical, speedup {before_time / after_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
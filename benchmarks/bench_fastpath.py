@@ -0,0 +1,93 @@
+"""Fast-path line parser vs Lark: differential check and benchmark.
+
+Every block is interpreted both ways first; the script aborts if the step
+streams differ or if the fast path accepts a block Lark rejects.
+
+Usage:
+    python benchmarks/bench_fastpath.py [--blocks 3000]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.parsers.mermaid import MermaidParser  # noqa: E402
+
+
+EDGE_CASES = [
+    "sequenceDiagram\n    participant A as \"Quoted\"  \n    A  ->>  B  :   hi  \n",
+    "sequenceDiagram\n    Note overAPI: hi\n    Note over A , B : both\n    Note left of A: x\n",
+    "sequenceDiagram\n    A->>B\n    A-xB: y\n    A->>+B: GET /api/x\n    B-->>A: ok\n",
+    "sequenceDiagram\n    A->>Note: x\n    as->>participant: y\n",
+    "\n\n  sequenceDiagram  \r\n    User->>Frontend: Click \"Login\"\r\n",
+    "sequenceDiagram\n    alt ok\n    A->>B: x\n    opt\n    B-->>A: y\n    end\n    else \"fail\"  \n    end\n",
+    "sequenceDiagram\n    par a\n    A->>B: x\n    and b\n    loop every 5s\n    B->>A: y\n    end\n    end\n",
+    "sequenceDiagram\n    A->>end: x\n    altitude->>B: y\n",
+    # Rejected by the grammar; the fast path must not accept them either
+    "sequenceDiagram\n    Note->>B: x\n",
+    "sequenceDiagram\n    A->>B:\n",
+    "sequenceDiagram\n    Note left  of A: x\n",
+    "sequenceDiagram\n    participant A as\n",
+    "sequenceDiagram\n    alt x\n    A->>B: y\n",
+    "sequenceDiagram\n    par x\n    else y\n    end\n",
+    "sequenceDiagram\n    A->>B: y\n    end\n",
+    # Outside the fast-path subset; handled by Lark
+    "sequenceDiagram\n    participant A asB\n",
+    "sequenceDiagram\n    alt:x\n    end\n",
+]
+
+
+def load_blocks():
+    blocks = []
+    for path in sorted((ROOT / "examples").glob("*.md")):
+        blocks.extend(re.findall(r'```mermaid\s*\n(.*?)\n```', path.read_text(encoding='utf-8'), re.DOTALL))
+    return blocks + EDGE_CASES
+
+
+def check_equivalence(fast: MermaidParser, slow: MermaidParser, blocks) -> None:
+    for block in blocks:
+        a = fast._interpret(block)
+        b = slow._interpret(block)
+        if (a is None) != (b is None):
+            raise SystemExit(f"validity differs for block:\n{block}")
+        if a is not None and (a.steps != b.steps or a.actors != b.actors or a.flow != b.flow):
+            raise SystemExit(f"steps differ for block:\n{block}")
+        if fast.validate(block) != slow.validate(block):
+            raise SystemExit(f"validate() differs for block:\n{block}")
+    print(f"differential check: {len(blocks)} blocks identical")
+
+
+def timed(label: str, parser: MermaidParser, corpus) -> float:
+    start = time.perf_counter()
+    for block in corpus:
+        parser._interpret(block)
+    per_block = (time.perf_counter() - start) / len(corpus) * 1e6
+    print(f"  {label:<12} {per_block:9.1f} us/block")
+    return per_block
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--blocks", type=int, default=3000)
+    args = ap.parse_args()
+    
+    fast = MermaidParser(use_cache=False, fast_path=True)
+    slow = MermaidParser(use_cache=False, fast_path=False)
+    blocks = load_blocks()
+    check_equivalence(fast, slow, blocks)
+    
+    examples = blocks[:-len(EDGE_CASES)]
+    corpus = [f"{examples[i % len(examples)]}\n    Note over User: block {i}" for i in range(args.blocks)]
+    print(f"{len(corpus)} blocks")
+    before = timed("lark", slow, corpus)
+    after = timed("fast path", fast, corpus)
+    print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
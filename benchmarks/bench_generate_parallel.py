@@ -0,0 +1,110 @@
+"""Parallel generation benchmark: serial generate-and-save vs process-pool rendering with threaded writes.
+
+Usage:
+    python benchmarks/bench_generate_parallel.py [--scenarios 10000] [--steps 30] [--jobs 4]
+"""
+
+import argparse
+import filecmp
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.generators import (  # noqa: E402
+    BUILTIN_GENERATORS, CustomGenerator, GenerationStats, PytestGenerator, fan_out, render_tests, save_tests,
+)
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+
+ACTIONS = ["이메일 입력", "로그인 버튼 클릭", 'click "Save" button', "JWT 토큰 검증", "메인 페이지로 리다이렉트"]
+
+
+def make_scenarios(count, steps, rng):
+    scenarios = []
+    for n in range(count):
+        scenario_steps = []
+        for i in range(steps):
+            step_type = rng.choice(list(StepType))
+            data = {}
+            if step_type == StepType.API_CALL:
+                data = {'method': rng.choice(['GET', 'POST']), 'endpoint': f"/api/items/{i}"}
+            scenario_steps.append(TestStep(step_type, "User", "API", rng.choice(ACTIONS), data))
+        # Every 50th name repeats an earlier one, so some files are written twice
+        name = f"flow_{n - 1}" if n % 50 == 49 else f"flow_{n}"
+        scenarios.append(TestScenario(name, f"Scenario {n}", scenario_steps))
+    return scenarios
+
+
+def serial(scenarios, generators, output_dir):
+    stats = GenerationStats()
+    start = time.perf_counter()
+    for scenario in scenarios:
+        step_start = time.perf_counter()
+        for name, test in fan_out(scenario, generators).items():
+            test.save(output_dir / name / test.name)
+            stats.tests += 1
+        stats.stream += time.perf_counter() - step_start
+        stats.scenarios += 1
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def parallel(scenarios, generators, output_dir, jobs):
+    stats = GenerationStats()
+    start = time.perf_counter()
+    outputs = ((output_dir / name / test.name, test)
+               for tests in render_tests(scenarios, generators, jobs=jobs, stats=stats)
+               for name, test in tests.items())
+    for _ in save_tests(outputs, jobs=jobs, stats=stats):
+        pass
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def same_tree(left, right):
+    compare = filecmp.dircmp(left, right)
+    if compare.left_only or compare.right_only or compare.diff_files or compare.funny_files:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(left, right, compare.common_files, shallow=False)
+    return not mismatch and not errors and all(
+        same_tree(os.path.join(left, sub), os.path.join(right, sub)) for sub in compare.common_dirs)
+
+
+def check_generate_multiple(scenarios, jobs):
+    for generator in (PytestGenerator({'use_async': True}), CustomGenerator({'language': 'java', 'framework': 'spring'})):
+        serial_tests = generator.generate_multiple(scenarios)
+        parallel_tests = generator.generate_multiple(scenarios, jobs=jobs)
+        if [t.get_full_code() for t in serial_tests] != [t.get_full_code() for t in parallel_tests]:
+            raise SystemExit(f"{type(generator).__name__}.generate_multiple(jobs={jobs}) differs from serial")
+    print(f"generate_multiple(jobs={jobs}) identical to serial")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", type=int, default=10_000)
+    ap.add_argument("--steps", type=int, default=30)
+    ap.add_argument("--jobs", type=int, default=4)
+    args = ap.parse_args()
+    
+    scenarios = make_scenarios(args.scenarios, args.steps, random.Random(0))
+    generators = {name: generator_class() for name, generator_class in BUILTIN_GENERATORS.items()}
+    check_generate_multiple(scenarios[:200], args.jobs)
+    
+    print(f"{len(scenarios)} scenarios x {args.steps} steps, {len(generators)} frameworks, {os.cpu_count()} CPU(s)")
+    with tempfile.TemporaryDirectory() as tmp:
+        before = serial(scenarios, generators, Path(tmp) / "serial")
+        print(f"  serial      {before.report()}")
+        after = parallel(scenarios, generators, Path(tmp) / "parallel", args.jobs)
+        print(f"  parallel    {after.report()}")
+        if not same_tree(Path(tmp) / "serial", Path(tmp) / "parallel"):
+            raise SystemExit("parallel output differs from the serial run")
+        print(f"  output identical, speedup {before.elapsed / after.elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
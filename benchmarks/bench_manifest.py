@@ -0,0 +1,80 @@
+"""Build manifest benchmark: cold generate vs re-runs that the manifest turns into no-ops.
+
+Usage:
+    python benchmarks/bench_manifest.py [--paths 64] [--runs 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.cli import cli  # noqa: E402
+from bai_test_mcp.generators import MANIFEST_NAME  # noqa: E402
+
+EXAMPLE = ROOT / "examples" / "auth_flow.md"
+
+
+def run(runner, *args):
+    start = time.perf_counter()
+    result = runner.invoke(cli, ["generate", *map(str, args)], catch_exceptions=False)
+    if result.exit_code != 0:
+        raise SystemExit(result.output)
+    return time.perf_counter() - start, result.output
+
+
+def mtimes(output_dir):
+    return {path: path.stat().st_mtime_ns for path in output_dir.rglob("*") if path.is_file() and path.name != MANIFEST_NAME}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--paths", type=int, default=64, help="--max-paths for the parser")
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+    
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp) / "tests"
+        common = [EXAMPLE, "-f", "all", "-o", output_dir, "--max-paths", args.paths, "--no-cache"]
+        
+        cold, _ = run(runner, *common)
+        before = mtimes(output_dir)
+        print(f"{EXAMPLE.name}, {len(before)} test files")
+        print(f"  cold            {cold:6.3f}s")
+        
+        for _ in range(args.runs):
+            warm, out = run(runner, *common)
+            if "Up to date" not in out:
+                raise SystemExit("re-run was not skipped:\n" + out)
+        print(f"  up to date      {warm:6.3f}s")
+        
+        forced, _ = run(runner, *common, "--no-manifest")
+        print(f"  --no-manifest   {forced:6.3f}s")
+        after = mtimes(output_dir)
+        
+        # The files were rewritten behind the manifest's back: tests are re-rendered but not re-written
+        stale, _ = run(runner, *common)
+        print(f"  stale manifest  {stale:6.3f}s")
+        if mtimes(output_dir) != after:
+            raise SystemExit("identical tests were re-written")
+        
+        tampered = next(iter(sorted(after)))
+        tampered.write_text(tampered.read_text() + "\n// edited\n")
+        run(runner, *common)
+        restored = mtimes(output_dir)
+        changed = [path.name for path in restored if restored[path] != after[path]]
+        if changed != [tampered.name]:
+            raise SystemExit(f"expected only {tampered.name} to be rewritten, got {changed}")
+        print(f"  edited output restored, other {len(restored) - 1} file(s) untouched")
+        print(f"  speedup of an up-to-date run: {cold / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Step memory benchmark: the original dataclass TestStep vs the slotted one,
+and parsed scenarios with and without shared steps.
+
+Usage:
+    python benchmarks/bench_memory.py [--steps 200000] [--corpus examples] [--copies 200]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.parsers.base import StepType, TestStep  # noqa: E402
+from bai_test_mcp.parsers.base import StepPool  # noqa: E402
+from bai_test_mcp.parsers.mermaid import MermaidInterpreter, MermaidParser  # noqa: E402
+
+
+LINES = [
+    ("User", "->>", "Frontend", "이메일/비밀번호 입력"),
+    ("Frontend", "->>", "API", "POST /api/v1/users/login"),
+    ("API", "->>", "Security", "사용자 ID 암호화 (AES-256)"),
+    ("API", "->>", "DB", "UserInfo 조회 (암호화된 ID)"),
+    ("DB", "-->>", "API", "사용자 정보"),
+    ("API", "-->>", "Frontend", "JWT 토큰 (쿠키) + 사용자 정보"),
+    ("Frontend", "->>", "Frontend", "메인 페이지로 이동"),
+]
+
+
+@dataclass
+class DataclassTestStep:
+    """The original TestStep."""
+    step_type: StepType
+    actor: str
+    target: Optional[str] = None
+    action: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+    expected: Optional[Any] = None
+    description: str = ""
+    
+    def __post_init__(self):
+        if not self.description:
+            self.description = f"{self.actor} {self.action}"
+            if self.target:
+                self.description += f" to {self.target}"
+
+
+def source_lines(count):
+    # Fresh strings per line, as the parser gets them from the diagram text
+    for i in range(count):
+        source, arrow, target, message = LINES[i % len(LINES)]
+        yield "".join([source]), arrow, "".join([target]), "".join([message])
+
+
+def build(step_class, count):
+    """Build steps the way MermaidInterpreter.add_interaction does."""
+    interpreter = MermaidInterpreter()
+    steps = []
+    for source, arrow, target, message in source_lines(count):
+        step_type = interpreter._determine_step_type(source, target, arrow, message)
+        data = interpreter._extract_api_data(message) if step_type == StepType.API_CALL else {}
+        steps.append(step_class(step_type=step_type, actor=source, target=target, action=message, data=data))
+    return steps
+
+
+def measure(label, step_class, count):
+    gc.collect()
+    tracemalloc.start()
+    steps = build(step_class, count)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_step = size / count
+    print(f"  {label:<12} {size / 1e6:8.1f} MB  {per_step:6.0f} bytes/step")
+    del steps
+    return per_step
+
+
+def parse_corpus(files, copies, share_steps):
+    """Parse every file ``copies`` times, as if the corpus were that many times larger."""
+    parser = MermaidParser(use_cache=False, share_steps=share_steps, step_pool=StepPool())
+    scenarios = []
+    for _ in range(copies):
+        for text in files:
+            scenarios.extend(parser.parse("".join([text])))
+    return scenarios
+
+
+def measure_corpus(label, files, copies, share_steps):
+    gc.collect()
+    tracemalloc.start()
+    scenarios = parse_corpus(files, copies, share_steps)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    steps = sum(len(s.steps) for s in scenarios)
+    distinct = len({id(step) for s in scenarios for step in s.steps})
+    print(f"  {label:<12} {size / 1e6:8.1f} MB  {len(scenarios)} scenarios, {steps} steps, {distinct} step objects")
+    del scenarios
+    return size
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--steps", type=int, default=200_000)
+    ap.add_argument("--corpus", default=str(ROOT / "examples"), help="Directory of diagram files")
+    ap.add_argument("--copies", type=int, default=200)
+    args = ap.parse_args()
+    
+    print(f"{args.steps} steps")
+    before = measure("dataclass", DataclassTestStep, args.steps)
+    after = measure("slotted", TestStep, args.steps)
+    print(f"  reduction: {(1 - after / before) * 100:.0f}%")
+    
+    files = [path.read_text(encoding='utf-8') for path in sorted(Path(args.corpus).glob("**/*.md"))]
+    print(f"{len(files)} corpus files x {args.copies}")
+    before = measure_corpus("per-step", files, args.copies, share_steps=False)
+    after = measure_corpus("shared", files, args.copies, share_steps=True)
+    print(f"  saved: {(before - after) / 1e6:.1f} MB ({(1 - after / before) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Per-block Mermaid parse benchmark.
+
+Compares the old validate-then-parse path (two LALR parses per block) with the
+single-pass ``parse_tree`` path, and tree-building validation with the
+recognizer used by ``validate``.
+
+Usage:
+    python benchmarks/bench_parse.py [--blocks 3000]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.parsers.mermaid import MermaidParser  # noqa: E402
+
+
+def load_corpus(size: int):
+    """Build a corpus of ``size`` blocks from the example diagrams."""
+    blocks = []
+    for path in sorted((ROOT / "examples").glob("*.md")):
+        blocks.extend(re.findall(r'```mermaid\s*\n(.*?)\n```', path.read_text(encoding='utf-8'), re.DOTALL))
+    # Vary the text so nothing downstream can dedupe the corpus
+    return [f"{blocks[i % len(blocks)]}\n    Note over User: block {i}" for i in range(size)]
+
+
+def timed(label: str, fn, corpus) -> float:
+    start = time.perf_counter()
+    for block in corpus:
+        fn(block)
+    per_block = (time.perf_counter() - start) / len(corpus) * 1e6
+    print(f"  {label:<32} {per_block:9.1f} us/block")
+    return per_block
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--blocks", type=int, default=3000)
+    args = ap.parse_args()
+    
+    parser = MermaidParser()
+    corpus = load_corpus(args.blocks)
+    parser.recognizer  # build the lazy recognizer outside the timed region
+    
+    def validate_then_parse(block):
+        # What MermaidParser.parse used to do for every block
+        norm = parser._normalize_block(block)
+        parser.parser.parse(norm)
+        return parser.parser.parse(norm)
+    
+    def validate_with_tree(block):
+        return parser.parser.parse(parser._normalize_block(block))
+    
+    print(f"{len(corpus)} blocks")
+    print("parse:")
+    before = timed("validate + parse (before)", validate_then_parse, corpus)
+    after = timed("parse_tree (after)", parser.parse_tree, corpus)
+    print(f"  speedup: {before / after:.2f}x")
+    print("validate:")
+    before = timed("tree-building parse (before)", validate_with_tree, corpus)
+    after = timed("recognizer (after)", parser.validate, corpus)
+    print(f"  speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
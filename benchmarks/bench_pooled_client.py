@@ -0,0 +1,148 @@
+"""Pooled client benchmark: generated pytest suites against a local stub server, per-test vs pooled client.
+
+Each scenario calls its own endpoints; the stub answers with a cookie
+naming the scenario, so a request carrying another scenario's cookie
+means cookies leaked between tests. Scenarios are bundled into one
+module so the session-scoped client is shared by all of them. The async
+and pytest-xdist runs need aiohttp/pytest-asyncio and pytest-xdist and
+are skipped without them.
+
+Usage:
+    python benchmarks/bench_pooled_client.py [--scenarios 300] [--calls 5]
+"""
+
+import argparse
+import importlib.util
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.generators import PytestGenerator, ScenarioBundle, fan_out  # noqa: E402
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+
+_SCENARIO = re.compile(r"^/s(\d+)/")
+_COOKIE = re.compile(r"scenario=(\d+)")
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self):
+        super().__init__(("localhost", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.leaks = 0
+    
+    def reset(self):
+        self.requests = self.connections = self.leaks = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+    
+    def respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        scenario = _SCENARIO.match(self.path).group(1)
+        cookie = _COOKIE.search(self.headers.get("Cookie", ""))
+        with self.server.lock:
+            self.server.requests += 1
+            if cookie and cookie.group(1) != scenario:
+                self.server.leaks += 1
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"scenario={scenario}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+    
+    do_GET = do_POST = do_PUT = do_DELETE = respond
+    
+    def log_message(self, *args):
+        pass
+
+
+def make_scenarios(count, calls):
+    scenarios = []
+    for n in range(count):
+        steps = [TestStep(StepType.API_CALL, "Frontend", "API", f"GET /s{n}/items/{i}",
+                          {'method': 'GET', 'endpoint': f"/s{n}/items/{i}"}) for i in range(calls)]
+        scenarios.append(TestScenario(f"flow_{n}", f"Scenario {n}", steps))
+    return scenarios
+
+
+def run_suite(server, test_file, extra_args):
+    """Run a generated suite; returns the wall time of the run and of pytest startup and collection alone."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "--collect-only", *extra_args,
+                    str(test_file)], capture_output=True, cwd=test_file.parent, check=True)
+    startup = time.perf_counter() - start
+    
+    server.reset()
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *extra_args, str(test_file)],
+                            capture_output=True, text=True, cwd=test_file.parent)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(f"{test_file.name} failed:\n{result.stdout[-3000:]}{result.stderr[-2000:]}")
+    return elapsed, startup
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", type=int, default=300)
+    ap.add_argument("--calls", type=int, default=5)
+    args = ap.parse_args()
+    
+    has_async = all(importlib.util.find_spec(name) for name in ("aiohttp", "pytest_asyncio"))
+    has_xdist = importlib.util.find_spec("xdist") is not None
+    
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://localhost:{server.server_address[1]}"
+    bundle = ScenarioBundle("stub", make_scenarios(args.scenarios, args.calls))
+    
+    variants = [("per-test client", {}, []), ("pooled", {'pooled_client': True}, [])]
+    if has_xdist:
+        variants.append(("pooled, xdist -n 2", {'pooled_client': True}, ["-n", "2"]))
+    if has_async:
+        variants += [("async per-test", {'use_async': True}, ["-p", "asyncio", "--asyncio-mode=auto"]),
+                     ("async pooled", {'use_async': True, 'pooled_client': True}, ["-p", "asyncio"])]
+    
+    print(f"{args.scenarios} tests x {args.calls} requests against {base_url}"
+          f"{'' if has_xdist else ' (pytest-xdist not installed)'}{'' if has_async else ' (aiohttp/pytest-asyncio not installed)'}")
+    print(f"  {'client':<20} {'time':>7} {'startup':>8} {'requests':>9} {'conns':>6} {'req/s':>8} {'leaks':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, config, extra_args in variants:
+            test = fan_out(bundle, {'pytest': PytestGenerator({'base_url': base_url, **config})})['pytest']
+            test_file = Path(tmp) / label.replace(" ", "_").replace(",", "").replace("-", "_") / test.name
+            test.save(test_file)
+            elapsed, startup = run_suite(server, test_file, extra_args)
+            if server.requests != args.scenarios * args.calls or server.leaks:
+                raise SystemExit(f"{label}: {server.requests} requests, {server.leaks} with another test's cookie")
+            # Requests per second while the tests run, without pytest's own startup
+            rate = server.requests / max(elapsed - startup, 1e-9)
+            print(f"  {label:<20} {elapsed:6.2f}s {startup:7.2f}s {server.requests:>9} {server.connections:>6} "
+                  f"{rate:8.0f} {server.leaks:>6}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Endpoint normalization benchmark: per-route regex scan vs the segment trie.
+
+Usage:
+    python benchmarks/bench_routes.py [--resources 200] [--paths 1000000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.parsers.routes import RouteTrie  # noqa: E402
+
+
+SHAPES = [
+    "/api/v1/{res}",
+    "/api/v1/{res}/{{id}}",
+    "/api/v1/{res}/{{id}}/history",
+    "/api/v1/{res}/{{id}}/items",
+    "/api/v1/{res}/{{id}}/items/{{item_id}}",
+    "/api/v1/{res}/search",
+    "/api/v1/{res}/me",
+    "/api/v2/{res}/:id",
+    "/api/v2/{res}/:id/owners/:owner_id",
+    "/internal/{res}/{{key}}/refresh",
+]
+
+
+def make_routes(resources):
+    return [shape.format(res=f"res{r}") for r in range(resources) for shape in SHAPES]
+
+
+def concrete(route, rng):
+    segments = []
+    for segment in route.split('/'):
+        if segment.startswith('{') or segment.startswith(':'):
+            segment = str(uuid.UUID(int=rng.getrandbits(128))) if rng.random() < 0.3 else str(rng.randrange(10**6))
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+PARAM = re.compile(r'\{[^/]+?\}|:([A-Za-z_]\w*)')
+
+
+def canonical(route):
+    return PARAM.sub(lambda m: '{%s}' % m.group(1) if m.group(1) else m.group(0), route)
+
+
+class RegexScan:
+    """One anchored regex per route, tried in order, routes with fewer parameters first."""
+    
+    def __init__(self, routes):
+        self.patterns = []
+        for route in sorted(routes, key=lambda r: len(PARAM.findall(r))):
+            regex = PARAM.sub('[^/]+', route)
+            self.patterns.append((re.compile(regex + '$'), canonical(route)))
+    
+    def normalize(self, path):
+        path = path.split('?', 1)[0]
+        for pattern, route in self.patterns:
+            if pattern.match(path):
+                return route
+        return path
+
+
+def timed(label, fn, corpus):
+    start = time.perf_counter()
+    for path in corpus:
+        fn(path)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<14} {len(corpus):>8} paths {elapsed:7.2f}s  {len(corpus) / elapsed / 1e3:8.1f} K paths/s")
+    return elapsed / len(corpus)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--resources", type=int, default=200)
+    ap.add_argument("--paths", type=int, default=1_000_000)
+    ap.add_argument("--scan-paths", type=int, default=20_000, help="Paths for the (slow) regex scan")
+    args = ap.parse_args()
+    
+    rng = random.Random(0)
+    routes = make_routes(args.resources)
+    corpus = [concrete(rng.choice(routes), rng) for _ in range(args.paths)]
+    
+    start = time.perf_counter()
+    trie = RouteTrie(routes)
+    print(f"{len(trie)} routes, trie built in {(time.perf_counter() - start) * 1e3:.1f} ms")
+    
+    scan = RegexScan(routes)
+    sample = corpus[:args.scan_paths]
+    mismatches = sum(1 for path in sample if trie.normalize(path) != scan.normalize(path))
+    print(f"agreement on {len(sample)} paths: {len(sample) - mismatches}/{len(sample)}")
+    
+    before = timed("regex scan", scan.normalize, sample)
+    after = timed("segment trie", trie.normalize, corpus)
+    print(f"  speedup: {before / after:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
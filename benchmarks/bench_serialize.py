@@ -0,0 +1,133 @@
+"""Scenario serialization benchmark: pickle vs JSON lines vs the binary codec.
+
+Each codec reports its best of ``--repeat`` runs.
+
+Usage:
+    python benchmarks/bench_serialize.py [--scenarios 20000] [--repeat 3]
+"""
+
+import argparse
+import io
+import pickle
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+from bai_test_mcp.parsers.mermaid import MermaidParser  # noqa: E402
+from bai_test_mcp.parsers.serialize import dump_jsonl, dumps_binary, load_jsonl, loads_binary  # noqa: E402
+
+
+@dataclass
+class DataclassTestStep:
+    """The original TestStep."""
+    step_type: StepType
+    actor: str
+    target: Optional[str] = None
+    action: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+    expected: Optional[Any] = None
+    description: str = ""
+
+
+@dataclass
+class DataclassTestScenario:
+    """The original TestScenario."""
+    name: str
+    description: str
+    steps: List[DataclassTestStep] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_corpus(count):
+    parser = MermaidParser(use_cache=False)
+    examples = []
+    for path in sorted((ROOT / "examples").glob("*.md")):
+        examples.extend(parser.parse_file(str(path)))
+    corpus = []
+    for i in range(count):
+        scenario = examples[i % len(examples)]
+        # Fresh step objects, as parsing separate files would produce
+        steps = [TestStep.from_dict(step.to_dict()) for step in scenario.steps]
+        corpus.append(TestScenario(f"{scenario.name}_{i}", scenario.description, steps, dict(scenario.metadata)))
+    return corpus
+
+
+def as_dataclasses(corpus):
+    return [
+        DataclassTestScenario(s.name, s.description, [
+            DataclassTestStep(step.step_type, step.actor, step.target, step.action, dict(step.data),
+                              step.expected, step.description)
+            for step in s.steps
+        ], s.metadata)
+        for s in corpus
+    ]
+
+
+def jsonl_dumps(corpus):
+    buffer = io.StringIO()
+    dump_jsonl(corpus, buffer)
+    return buffer.getvalue()
+
+
+def jsonl_loads(text):
+    return list(load_jsonl(io.StringIO(text)))
+
+
+def pickle_dumps(corpus):
+    return pickle.dumps(corpus, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def check_round_trip(corpus):
+    for label, dumps, loads in (("jsonl", jsonl_dumps, jsonl_loads), ("binary", dumps_binary, loads_binary)):
+        decoded = loads(dumps(corpus))
+        if decoded != corpus:
+            raise SystemExit(f"{label} round trip changed the scenarios")
+        if [s.get_endpoints() for s in decoded] != [s.get_endpoints() for s in corpus]:
+            raise SystemExit(f"{label} round trip changed the step indexes")
+    print(f"round trip: {len(corpus)} scenarios identical")
+
+
+def best_of(repeat, fn, arg):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - start)
+        del result
+    return best
+
+
+def timed(label, dumps, loads, corpus, steps, repeat):
+    payload = dumps(corpus)
+    encode = best_of(repeat, dumps, corpus)
+    decode = best_of(repeat, loads, payload)
+    size = len(payload.encode('utf-8') if isinstance(payload, str) else payload)
+    print(f"  {label:<20} {size / 1e6:7.1f} MB  encode {steps / encode / 1e6:5.2f} M steps/s"
+          f"  decode {steps / decode / 1e6:5.2f} M steps/s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", type=int, default=20_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    
+    corpus = load_corpus(args.scenarios)
+    steps = sum(len(s.steps) for s in corpus)
+    check_round_trip(corpus[:1000])
+    
+    print(f"{len(corpus)} scenarios, {steps} steps")
+    timed("pickle (dataclass)", pickle_dumps, pickle.loads, as_dataclasses(corpus), steps, args.repeat)
+    timed("pickle (slotted)", pickle_dumps, pickle.loads, corpus, steps, args.repeat)
+    timed("json lines", jsonl_dumps, jsonl_loads, corpus, steps, args.repeat)
+    timed("binary", dumps_binary, loads_binary, corpus, steps, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Test emission benchmark: building the whole file in memory vs streaming it to the sink.
+
+Usage:
+    python benchmarks/bench_streaming.py [--steps 200000]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.generators import (  # noqa: E402
+    CustomGenerator, CypressGenerator, JestRTLGenerator, PlaywrightGenerator, PytestGenerator,
+)
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+
+GENERATORS = [
+    ("pytest", lambda: PytestGenerator()),
+    ("pytest async", lambda: PytestGenerator({'use_async': True})),
+    ("playwright", lambda: PlaywrightGenerator()),
+    ("cypress", lambda: CypressGenerator()),
+    ("jest-rtl", lambda: JestRTLGenerator()),
+    ("java_spring", lambda: CustomGenerator({'language': 'java', 'framework': 'spring'})),
+]
+
+
+def make_scenario(count, rng):
+    actions = ["이메일/비밀번호 입력", "로그인 버튼 클릭", "토큰 검증", "대시보드 표시"]
+    steps = []
+    for i in range(count):
+        step_type = rng.choice(list(StepType))
+        data = {}
+        if step_type == StepType.API_CALL:
+            data = {'method': rng.choice(['GET', 'POST', 'DELETE']), 'endpoint': f"/api/items/{i}"}
+        steps.append(TestStep(step_type, "User", "API", rng.choice(actions), data, expected=rng.choice([None, 200])))
+    return TestScenario("bench_flow", "Benchmark scenario", steps)
+
+
+def check_identical(scenario):
+    for label, factory in GENERATORS:
+        generator = factory()
+        buffer = io.StringIO()
+        generator.write(scenario, buffer)
+        if buffer.getvalue() != generator.generate(scenario).get_full_code():
+            raise SystemExit(f"{label}: streamed output differs")
+    print(f"streamed output identical for {len(GENERATORS)} generators")
+
+
+def measure(emit):
+    tracemalloc.start()
+    start = time.perf_counter()
+    emit()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--steps", type=int, default=200_000)
+    args = ap.parse_args()
+    
+    check_identical(make_scenario(2000, random.Random(1)))
+    
+    scenario = make_scenario(args.steps, random.Random(0))
+    print(f"{args.steps} steps, peak traced memory while writing the file")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, factory in GENERATORS:
+            generator = factory()
+            path = Path(tmp) / "test_out"
+            
+            def in_memory():
+                path.write_text(generator.generate(scenario).get_full_code(), encoding='utf-8')
+            
+            def streamed():
+                generator.stream(scenario).save(path)
+            
+            before_time, before_peak = measure(in_memory)
+            after_time, after_peak = measure(streamed)
+            size = os.path.getsize(path)
+            print(f"  {label:<13} {size / 1e6:6.1f} MB file   in memory {before_peak / 1e6:7.1f} MB {before_time:5.2f}s"
+                  f"   streamed {after_peak / 1e6:6.2f} MB {after_time:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""CustomGenerator template benchmark: string.Template per render vs compiled templates.
+
+Usage:
+    python benchmarks/bench_templates.py [--steps 200000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from string import Template
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bai_test_mcp.generators import CustomGenerator  # noqa: E402
+from bai_test_mcp.generators.template_engine import compile_template  # noqa: E402
+from bai_test_mcp.parsers.base import StepType, TestScenario, TestStep  # noqa: E402
+
+
+class StringTemplates:
+    """What CustomGenerator did before: a new string.Template for every render."""
+    
+    def render(self, template, mapping):
+        return Template(template).safe_substitute(mapping)
+
+
+class StringTemplateGenerator(CustomGenerator):
+    """CustomGenerator as it was before templates were compiled."""
+    
+    def __init__(self, config):
+        super().__init__(config)
+        self.compiled = StringTemplates()
+    
+    def generate_step(self, step):
+        template_key = self._get_template_key(step.step_type)
+        if template_key not in self.templates:
+            return f"        // {step.description}"
+        vars = {
+            'action': step.action,
+            'description': step.description,
+            'actor': step.actor,
+            'target': step.target or '',
+            'method': step.data.get('method', 'GET'),
+            'method_lower': step.data.get('method', 'GET').lower(),
+            'endpoint': step.data.get('endpoint', '/'),
+            'payload': step.data.get('payload', 'null'),
+            'expected': step.expected or ''
+        }
+        return Template(self.templates[template_key]).safe_substitute(vars)
+
+
+TARGETS = [("java", "spring"), ("java", "junit"), ("python", "unittest"), ("ruby", "rspec"),
+           ("go", "testing"), ("php", "phpunit"), ("kotlin", "kotest")]
+
+EDGE_CASES = [
+    "", "plain text", "$$", "$$$", "$", "cost: $5", "${", "${}", "$ {action}", "$$action", "$$$action",
+    "${action}${actor}", "$action$actor", "$actionx", "${missing} $missing", "${ACTION}", "$_x $__",
+    "${action}}", "{$action}", "$1action", "trailing $", "${method_lower}ForEntity", "é $action ü",
+]
+
+
+def make_steps(count, rng):
+    actions = ["이메일/비밀번호 입력", "POST /api/v1/users/login", "GET /api/v1/users/42", "토큰 검증", "$5 결제"]
+    steps = []
+    for i in range(count):
+        step_type = rng.choice(list(StepType))
+        data = {}
+        if step_type == StepType.API_CALL:
+            data = {'method': rng.choice(['GET', 'POST', 'DELETE']), 'endpoint': f"/api/items/{i}"}
+            if rng.random() < 0.3:
+                data['payload'] = '{"id": %d}' % i
+        steps.append(TestStep(step_type, "User", "API", rng.choice(actions), data, expected=rng.choice([None, 200])))
+    return steps
+
+
+def check_identical(steps):
+    mapping = {'action': "a$b", 'actor': "User", 'method_lower': "get", 'ACTION': 1, '_x': None}
+    for template in EDGE_CASES:
+        if compile_template(template)(mapping) != Template(template).safe_substitute(mapping):
+            raise SystemExit(f"compiled template differs for {template!r}")
+    
+    scenario = TestScenario("bench_flow_0", "Benchmark scenario", steps)
+    for language, framework in TARGETS:
+        compiled = CustomGenerator({'language': language, 'framework': framework})
+        legacy = StringTemplateGenerator({'language': language, 'framework': framework})
+        if compiled.generate(scenario).code != legacy.generate(scenario).code:
+            raise SystemExit(f"{language}_{framework} output differs")
+    print(f"output identical for {len(TARGETS)} templates and {len(EDGE_CASES)} edge cases")
+
+
+def timed(label, generator, scenario):
+    start = time.perf_counter()
+    generator.generate(scenario)
+    elapsed = time.perf_counter() - start
+    rate = len(scenario.steps) / elapsed
+    print(f"  {label:<16} {elapsed:7.2f}s  {rate / 1e3:8.1f} K steps/s")
+    return rate
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--steps", type=int, default=200_000)
+    args = ap.parse_args()
+    
+    steps = make_steps(args.steps, random.Random(0))
+    check_identical(steps[:2000])
+    
+    scenario = TestScenario("bench_flow_0", "Benchmark scenario", steps)
+    for language, framework in (("java", "spring"), ("java", "junit")):
+        legacy = StringTemplateGenerator({'language': language, 'framework': framework})
+        compiled = CustomGenerator({'language': language, 'framework': framework})
+        print(f"{language}_{framework}, {len(steps)} steps")
+        before = timed("string.Template", legacy, scenario)
+        after = timed("compiled", compiled, scenario)
+        print(f"  speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,48 @@
 import click
 import asyncio
 import json
+import re
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Union
 
 from .mcp.server import TestAutomationServer
 from .mcp.client import TestAutomationClient
-from .parsers import MermaidParser
-from .generators import PlaywrightGenerator, PytestGenerator, CypressGenerator, JestRTLGenerator, CustomGenerator
+from .parsers import MermaidParser, BatchStats, parse_directory
+from .parsers.cache import get_default_scenario_cache
+from .parsers.classifier import StepClassifier
+from .parsers.routes import RouteTrie
+from .parsers.flow import DEFAULT_MAX_PATHS
+from .parsers.base import TestScenario
+from .parsers.profiling import ParseProfile, cprofile_to
+from .generators import (PlaywrightGenerator, PytestGenerator, CypressGenerator, JestRTLGenerator, CustomGenerator,
+                         GeneratedTest, TestGenerator, BUILTIN_GENERATORS, ScenarioBundle, bundle_scenarios, fan_out)
+from .generators.batch import GenerationStats, render_tests, save_tests
+from .generators.manifest import MANIFEST_NAME, BuildManifest, content_hash, inputs_hash, json_hash, scenario_hash
+
+
+def _make_parser(no_cache: bool = False, clear_cache: bool = False,
+                 step_rules: Optional[str] = None, max_paths: int = DEFAULT_MAX_PATHS,
+                 routes: Optional[str] = None, profile: Optional[ParseProfile] = None) -> MermaidParser:
+    """Create a parser honouring the scenario cache, step rule, path cap, route and profile flags."""
+    if clear_cache:
+        get_default_scenario_cache().clear()
+    classifier = StepClassifier.from_file(step_rules) if step_rules else None
+    route_trie = RouteTrie.from_file(routes) if routes else None
+    return MermaidParser(use_cache=not no_cache, classifier=classifier, max_paths=max_paths or None,
+                         routes=route_trie, profile=profile)
+
+
+def _echo_profile(profile: Optional[ParseProfile], profile_output: Optional[str], no_cache: bool = False) -> None:
+    """Print the phase timings and scenario cache counters of a --profile run."""
+    if profile is not None:
+        click.echo("\nProfile:", err=True)
+        click.echo(profile.report(), err=True)
+        if not no_cache:
+            click.echo(f"Scenario cache: {get_default_scenario_cache().stats.report()}", err=True)
+    if profile_output:
+        click.echo(f"cProfile stats written to {profile_output}", err=True)
 
 
 @click.group()
@@ -17,43 +52,66 @@ def cli():
 
 
 @cli.command()
-def serve():
+@click.option('--no-cache', is_flag=True, help='Disable the parsed scenario cache')
+@click.option('--step-rules', type=click.Path(exists=True), help='YAML/JSON file with project step classification rules')
+@click.option('--routes', type=click.Path(exists=True), help='Route list or OpenAPI file used to normalize API endpoints')
+def serve(no_cache: bool, step_rules: Optional[str], routes: Optional[str]):
     """Start the MCP server."""
     click.echo("Starting bai.ai.kr Test MCP server...")
-    server = TestAutomationServer()
+    server = TestAutomationServer(use_cache=not no_cache, step_rules=step_rules, routes=routes)
     asyncio.run(server.run())
 
 
 @cli.command()
 @click.argument('file_path', type=click.Path(exists=True))
 @click.option('--output', '-o', help='Output directory for generated tests')
-@click.option('--framework', '-f', type=click.Choice(['playwright', 'pytest', 'cypress', 'jest-rtl', 'custom']), default='playwright')
+@click.option('--framework', '-f', type=click.Choice(['playwright', 'pytest', 'cypress', 'jest-rtl', 'custom', 'all']), default='playwright', help='Test framework; "all" writes every built-in framework into its own subdirectory')
 @click.option('--language', '-l', help='Programming language for custom generator')
 @click.option('--template', '-t', help='Template file path for custom generator')
 @click.option('--base-url', help='Base URL for tests')
-def generate(file_path: str, output: Optional[str], framework: str, base_url: Optional[str], language: Optional[str], template: Optional[str]):
+@click.option('--no-cache', is_flag=True, help='Disable the parsed scenario cache')
+@click.option('--clear-cache', is_flag=True, help='Clear the parsed scenario cache before parsing')
+@click.option('--step-rules', type=click.Path(exists=True), help='YAML/JSON file with project step classification rules')
+@click.option('--max-paths', type=int, default=DEFAULT_MAX_PATHS, show_default=True, help='Most alt/opt paths expanded into scenarios per diagram (0 for all)')
+@click.option('--routes', type=click.Path(exists=True), help='Route list or OpenAPI file used to normalize API endpoints')
+@click.option('--profile', 'show_profile', is_flag=True, help='Print per-phase parse/generate timings and counters')
+@click.option('--profile-output', type=click.Path(dir_okay=False), help='Write cProfile stats for this run to a file')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=1, show_default=True, help='Render in this many processes and save in this many threads (0 for CPU count)')
+@click.option('--no-manifest', is_flag=True, help=f'Regenerate and rewrite every test, without reading or updating {MANIFEST_NAME}')
+@click.option('--pooled-client', is_flag=True, help='pytest: share one connection-pooled HTTP client per test session instead of one per test')
+@click.option('--pool-size', type=click.IntRange(min=1), default=10, show_default=True, help='Connections kept by --pooled-client')
+@click.option('--async', 'use_async', is_flag=True, help='pytest: generate async tests with aiohttp')
+@click.option('--max-concurrency', type=click.IntRange(min=1), default=1, show_default=True, help='pytest --async: run up to this many independent API calls of a test at once')
+@click.option('--bundle', '-b', type=click.IntRange(min=0), default=0, show_default=True, help='Pack up to this many scenarios into each test module/spec (0 for one file per scenario)')
+def generate(file_path: str, output: Optional[str], framework: str, base_url: Optional[str], language: Optional[str], template: Optional[str], no_cache: bool, clear_cache: bool, step_rules: Optional[str], max_paths: int, routes: Optional[str], show_profile: bool, profile_output: Optional[str], jobs: int, no_manifest: bool, pooled_client: bool, pool_size: int, use_async: bool, max_concurrency: int, bundle: int):
     """Generate tests from a diagram file."""
-    click.echo(f"Parsing diagram from {file_path}...")
+    # Generator options that are only set when asked for, so other configs (and their manifests) stay as they were
+    options = {}
+    if pooled_client:
+        options.update(pooled_client=True, pool_size=pool_size)
+    if use_async:
+        options['use_async'] = True
+    if max_concurrency > 1:
+        options['max_concurrency'] = max_concurrency
     
-    # Parse diagram
-    parser = MermaidParser()
-    content = Path(file_path).read_text()
-    scenarios = parser.parse(content)
-    
-    if not scenarios:
-        click.echo("No scenarios found in the diagram.")
-        return
-    
-    click.echo(f"Found {len(scenarios)} scenario(s):")
-    for i, scenario in enumerate(scenarios):
-        click.echo(f"  {i+1}. {scenario.name} - {scenario.description}")
-    
-    # Generate tests
+    profile = ParseProfile() if show_profile else None
+    with cprofile_to(profile_output):
+        _generate(file_path, output, framework, base_url, language, template, no_cache, clear_cache,
+                  step_rules, max_paths, routes, profile, jobs, not no_manifest, bundle, options)
+    _echo_profile(profile, profile_output, no_cache)
+
+
+def _generate(file_path: str, output: Optional[str], framework: str, base_url: Optional[str], language: Optional[str], template: Optional[str], no_cache: bool, clear_cache: bool, step_rules: Optional[str], max_paths: int, routes: Optional[str], profile: Optional[ParseProfile], jobs: int = 1, use_manifest: bool = True, bundle: int = 0, options: Optional[Dict[str, Any]] = None):
+    """Body of the generate command, so it can run under cProfile."""
+    # Set up the generators
     config = {}
     if base_url:
         config['base_url'] = base_url
+    config.update(options or {})
     
-    if framework == 'playwright':
+    if framework == 'all':
+        generators = {name: generator_class(config) for name, generator_class in BUILTIN_GENERATORS.items()}
+    elif framework == 'playwright':
         generator = PlaywrightGenerator(config)
     elif framework == 'pytest':
         generator = PytestGenerator(config)
@@ -72,28 +130,165 @@ def generate(file_path: str, output: Optional[str], framework: str, base_url: Op
         generator = CustomGenerator(config)
     else:
         raise ValueError(f"Unknown framework: {framework}")
+    if framework != 'all':
+        generators = {framework: generator}
     
     output_dir = Path(output) if output else Path('tests')
+    parser = _make_parser(no_cache, clear_cache, step_rules, max_paths, routes, profile)
+    content = Path(file_path).read_text()
+    
+    # Nothing to do when the diagram, parser and generators are as they were last time
+    manifest = BuildManifest.load(output_dir) if use_manifest else None
+    fingerprints = {name: generator.fingerprint() for name, generator in generators.items()}
+    source_hash = content_hash(content)
+    source_fingerprint = json_hash([parser.version, fingerprints, bundle])
+    if manifest is not None and manifest.source_unchanged(Path(file_path), source_hash, source_fingerprint):
+        click.echo(f"✓ Up to date: {file_path} (tests in {output_dir} unchanged)")
+        return
+    
+    click.echo(f"Parsing diagram from {file_path}...")
+    
+    # Parse diagram
+    scenarios = parser.parse(content)
+    
+    if not scenarios:
+        click.echo("No scenarios found in the diagram.")
+        return
+    
+    click.echo(f"Found {len(scenarios)} scenario(s):")
+    for i, scenario in enumerate(scenarios):
+        click.echo(f"  {i+1}. {scenario.name} - {scenario.description}")
+    
+    # Generate tests, bundled into one module per framework for every `bundle` scenarios if asked
     output_dir.mkdir(exist_ok=True)
+    if bundle:
+        units = bundle_scenarios(scenarios, bundle, re.sub(r'\W+', '_', Path(file_path).stem))
+    else:
+        units = scenarios
+    
+    plan = _GenerationPlan(generators, output_dir, framework == 'all', manifest, fingerprints)
+    stats = GenerationStats()
+    start = time.perf_counter()
+    with profile.phase('generate') if profile is not None else nullcontext():
+        if jobs == 1:
+            _generate_serial(units, plan, stats)
+        else:
+            # Render in worker processes, write from a thread pool; the files match a serial run
+            stale = units if manifest is None else [unit for unit in units if plan.stale_tests(unit)]
+            rendered = render_tests(stale, generators, jobs=jobs or None, stats=stats)
+            outputs = ((plan.path(name, generated), generated)
+                       for tests in rendered for name, generated in tests.items())
+            for output_file in save_tests(outputs, jobs=jobs or None, stats=stats, write=plan.write):
+                click.echo(f"✓ Generated: {output_file}")
+    stats.elapsed = time.perf_counter() - start
+    
+    if manifest is not None:
+        stats.skipped, stats.unchanged = manifest.skipped, manifest.unchanged
+        manifest.record_source(Path(file_path), source_hash, source_fingerprint, plan.outputs)
+        manifest.save()
+    
+    click.echo(f"\nGenerated {stats.report()}")
+
+
+class _GenerationPlan:
+    """Where a generate run writes each test, and which tests the build manifest says are fresh."""
+    
+    def __init__(self, generators: Dict[str, TestGenerator], output_dir: Path, per_framework: bool,
+                 manifest: Optional[BuildManifest], fingerprints: Dict[str, str]):
+        self.generators = generators
+        self.output_dir = output_dir
+        self.per_framework = per_framework
+        self.manifest = manifest
+        self.fingerprints = fingerprints
+        self.outputs: List[Path] = []
+        self._inputs: Dict[Path, str] = {}
+    
+    def path(self, framework: str, generated: GeneratedTest) -> Path:
+        """File for a generated test, under a subdirectory per framework when generating for all of them."""
+        return (self.output_dir / framework if self.per_framework else self.output_dir) / generated.name
     
+    def stale_tests(self, scenario: Union[TestScenario, ScenarioBundle]) -> Dict[str, GeneratedTest]:
+        """Plan a scenario's outputs; returns its (streamed) tests, or nothing if all of them are fresh."""
+        # Lower the scenario once for every framework
+        tests = fan_out(scenario, self.generators)
+        if self.manifest is None:
+            return tests
+        
+        paths = {name: self.path(name, generated) for name, generated in tests.items()}
+        self.outputs.extend(paths.values())
+        digest = scenario_hash(scenario)
+        for name, file_path in paths.items():
+            self._inputs[file_path] = inputs_hash(digest, self.fingerprints[name])
+        if all(self.manifest.is_fresh(file_path, self._inputs[file_path]) for file_path in paths.values()):
+            self.manifest.skip(len(paths))
+            return {}
+        return tests
+    
+    def write(self, generated: GeneratedTest, file_path: Path) -> bool:
+        """Write a planned test, leaving files that already hold the same code alone."""
+        if self.manifest is None:
+            generated.save(file_path)
+            return True
+        return self.manifest.write(generated, file_path, self._inputs[file_path])
+
+
+def _generate_serial(scenarios: List[Union[TestScenario, ScenarioBundle]], plan: _GenerationPlan,
+                     stats: GenerationStats) -> None:
+    """Generate scenarios (or bundles) one at a time, streaming each test into its file."""
+    label = ", ".join(plan.generators) if plan.per_framework else next(iter(plan.generators))
     for scenario in scenarios:
-        click.echo(f"\nGenerating {framework} test for {scenario.name}...")
+        if isinstance(scenario, ScenarioBundle):
+            count = len(scenario.scenarios)
+            click.echo(f"\nGenerating {label} test for {scenario.name} ({count} scenario(s))...")
+        else:
+            count = 1
+            click.echo(f"\nGenerating {label} test for {scenario.name}...")
         
-        generated = generator.generate(scenario)
-        output_file = output_dir / generated.name
-        generated.save(output_file)
+        start = time.perf_counter()
+        tests = plan.stale_tests(scenario)
+        if not tests:
+            click.echo("✓ Up to date")
+            continue
         
-        click.echo(f"✓ Generated: {output_file}")
+        # Stream each test into its file
+        output_files = []
+        for name, generated in tests.items():
+            output_file = plan.path(name, generated)
+            plan.write(generated, output_file)
+            output_files.append(output_file)
+        stats.stream += time.perf_counter() - start
+        stats.scenarios += count
+        stats.tests += len(output_files)
+        stats.files += len(output_files)
+        
+        for output_file in output_files:
+            click.echo(f"✓ Generated: {output_file}")
 
 
 @cli.command()
 @click.argument('file_path', type=click.Path(exists=True))
-def parse(file_path: str):
+@click.option('--no-cache', is_flag=True, help='Disable the parsed scenario cache')
+@click.option('--clear-cache', is_flag=True, help='Clear the parsed scenario cache before parsing')
+@click.option('--step-rules', type=click.Path(exists=True), help='YAML/JSON file with project step classification rules')
+@click.option('--max-paths', type=int, default=DEFAULT_MAX_PATHS, show_default=True, help='Most alt/opt paths expanded into scenarios per diagram (0 for all)')
+@click.option('--routes', type=click.Path(exists=True), help='Route list or OpenAPI file used to normalize API endpoints')
+@click.option('--profile', 'show_profile', is_flag=True, help='Print per-phase parse timings and counters')
+@click.option('--profile-output', type=click.Path(dir_okay=False), help='Write cProfile stats for this run to a file')
+def parse(file_path: str, no_cache: bool, clear_cache: bool, step_rules: Optional[str], max_paths: int,
+          routes: Optional[str], show_profile: bool, profile_output: Optional[str]):
     """Parse a diagram and show extracted scenarios."""
-    parser = MermaidParser()
-    content = Path(file_path).read_text()
-    scenarios = parser.parse(content)
+    profile = ParseProfile() if show_profile else None
+    with cprofile_to(profile_output):
+        parser = _make_parser(no_cache, clear_cache, step_rules, max_paths, routes, profile)
+        content = Path(file_path).read_text()
+        scenarios = parser.parse(content)
     
+    _show_scenarios(scenarios)
+    _echo_profile(profile, profile_output, no_cache)
+
+
+def _show_scenarios(scenarios) -> None:
+    """Print parsed scenarios and their steps."""
     if not scenarios:
         click.echo("No scenarios found.")
         return
@@ -109,6 +304,36 @@ def parse(file_path: str):
             click.echo(f"  {i}. [{step.step_type.value}] {step.description}")
 
 
+@cli.command('parse-dir')
+@click.argument('target')
+@click.option('--pattern', '-p', default='**/*.md', help='Glob used inside TARGET when it is a directory')
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=0, show_default=True, help='Worker processes (0 for CPU count, 1 to parse in-process)')
+@click.option('--no-cache', is_flag=True, help='Disable the parsed scenario cache')
+@click.option('--step-rules', type=click.Path(exists=True), help='YAML/JSON file with project step classification rules')
+@click.option('--max-paths', type=int, default=DEFAULT_MAX_PATHS, show_default=True, help='Most alt/opt paths expanded into scenarios per diagram (0 for all)')
+@click.option('--routes', type=click.Path(exists=True), help='Route list or OpenAPI file used to normalize API endpoints')
+def parse_dir(target: str, pattern: str, jobs: int, no_cache: bool, step_rules: Optional[str], max_paths: int,
+              routes: Optional[str]):
+    """Parse every diagram file under a directory or glob in parallel."""
+    stats = BatchStats()
+    errors = []
+    
+    for result in parse_directory(target, pattern=pattern, jobs=jobs, use_cache=not no_cache,
+                                  stats=stats, step_rules=step_rules, routes=routes, max_paths=max_paths or None):
+        if result.scenarios:
+            click.echo(f"{result.path}: {len(result.scenarios)} scenario(s)")
+        errors.extend((result.path, error) for error in result.errors)
+    
+    if errors:
+        click.echo(f"\nErrors ({len(errors)}):")
+        for path, error in errors:
+            click.echo(f"  {path}: {error}")
+    
+    click.echo(f"\nParsed {stats.files} file(s), {stats.blocks} block(s), {stats.scenarios} scenario(s) "
+               f"in {stats.elapsed:.2f}s "
+               f"({stats.files_per_sec:.1f} files/s, {stats.blocks_per_sec:.1f} blocks/s)")
+
+
 @cli.command()
 @click.argument('file_path', type=click.Path(exists=True))
 def analyze(file_path: str):
@@ -1,18 +1,43 @@
-from .base import TestGenerator, GeneratedTest
+from .base import TestGenerator, GeneratedTest, StreamedTest, ScenarioBundle, bundle_scenarios, fan_out
 from .playwright import PlaywrightGenerator
 from .pytest import PytestGenerator
 from .cypress import CypressGenerator
 from .jest_rtl import JestRTLGenerator
 from .custom import CustomGenerator
 from .template_loader import TemplateLoader
+from .lowering import LoweredScenario, LoweredStep, RequestSpec, lower_scenario
+from .batch import GenerationStats, render_tests, save_tests
+from .manifest import MANIFEST_NAME, BuildManifest
+
+# Built-in generators by framework name; "all frameworks" modes generate every one
+BUILTIN_GENERATORS = {
+    "playwright": PlaywrightGenerator,
+    "pytest": PytestGenerator,
+    "cypress": CypressGenerator,
+    "jest-rtl": JestRTLGenerator,
+}
 
 __all__ = [
     "TestGenerator", 
     "GeneratedTest", 
+    "StreamedTest",
     "PlaywrightGenerator", 
     "PytestGenerator",
     "CypressGenerator",
     "JestRTLGenerator",
     "CustomGenerator",
-    "TemplateLoader"
+    "TemplateLoader",
+    "BUILTIN_GENERATORS",
+    "fan_out",
+    "ScenarioBundle",
+    "bundle_scenarios",
+    "LoweredScenario",
+    "LoweredStep",
+    "RequestSpec",
+    "lower_scenario",
+    "GenerationStats",
+    "render_tests",
+    "save_tests",
+    "MANIFEST_NAME",
+    "BuildManifest",
 ]
\ No newline at end of file
@@ -1,9 +1,23 @@
+import io
+import json
+import hashlib
+import os
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Callable, Iterable, Iterator, TextIO, Union
 from pathlib import Path
 
+from .. import __version__
 from ..parsers.base import TestScenario, TestStep
+from .lowering import LoweredScenario, lower_scenario, unique_names
+
+if TYPE_CHECKING:
+    from .batch import GenerationStats
+
+# Bump when generators emit different code for the same scenario and config,
+# so build manifests written by older versions are not trusted
+GENERATOR_VERSION = f"{__version__}-2"
 
 
 @dataclass
@@ -19,34 +33,133 @@ class GeneratedTest:
     metadata: Dict[str, Any] = None
     
     def save(self, file_path: Path) -> None:
-        """Save the generated test to a file."""
+        """Save the generated test to a file, streaming it when the test supports that.
+        
+        The code goes to a temporary file next to the target which then
+        replaces it, so nothing ever sees a partially written test.
+        """
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(self.get_full_code())
+        temp = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                self.write_to(f)
+            os.replace(temp, file_path)
+        except BaseException:
+            if temp.exists():
+                temp.unlink()
+            raise
     
-    def get_full_code(self) -> str:
-        """Get the complete test code including imports."""
-        parts = []
+    def iter_code(self) -> Iterator[str]:
+        """The main test code as lines (or larger chunks) to be joined with newlines."""
+        yield self.code
+    
+    def write_to(self, sink: TextIO) -> None:
+        """Write the complete test code, including imports, to a text sink piece by piece."""
+        separator = ""
+        
+        def put(text: str) -> None:
+            nonlocal separator
+            sink.write(separator)
+            sink.write(text)
+            separator = "\n"
         
         # Add imports
         if self.imports:
-            parts.extend(self.imports)
-            parts.append("")  # Empty line after imports
+            for line in self.imports:
+                put(line)
+            put("")  # Empty line after imports
         
         # Add setup code if present
         if self.setup_code:
-            parts.append(self.setup_code)
-            parts.append("")
+            put(self.setup_code)
+            put("")
         
         # Add main test code
-        parts.append(self.code)
+        empty = True
+        for chunk in self.iter_code():
+            put(chunk)
+            empty = False
+        if empty:
+            put("")
         
         # Add teardown code if present
         if self.teardown_code:
-            parts.append("")
-            parts.append(self.teardown_code)
-        
-        return "\n".join(parts)
+            put("")
+            put(self.teardown_code)
+    
+    def get_full_code(self) -> str:
+        """Get the complete test code including imports."""
+        buffer = io.StringIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
+    
+    def materialize(self) -> 'GeneratedTest':
+        """This test with its code built (it already is)."""
+        return self
+
+
+class StreamedTest(GeneratedTest):
+    """A generated test whose main code is produced on demand instead of held as a string.
+    
+    ``write_to`` and ``save`` stream the code from the generator line by
+    line, so memory use doesn't grow with the size of the test. Reading
+    ``code`` builds the whole string, each time it is read.
+    """
+    
+    def __init__(self, name: str, code_lines: Callable[[], Iterable[str]], language: str, framework: str,
+                 imports: List[str], setup_code: Optional[str] = None, teardown_code: Optional[str] = None,
+                 metadata: Dict[str, Any] = None):
+        self.code_lines = code_lines
+        super().__init__(name, None, language, framework, imports, setup_code, teardown_code, metadata)
+    
+    @property
+    def code(self) -> str:
+        return "\n".join(self.code_lines())
+    
+    @code.setter
+    def code(self, value: Optional[str]) -> None:
+        # Assigning a string turns this into an ordinary, fixed test
+        if value is not None:
+            self.code_lines = lambda: [value]
+    
+    def iter_code(self) -> Iterator[str]:
+        return iter(self.code_lines())
+    
+    def materialize(self) -> GeneratedTest:
+        """A plain GeneratedTest with the code built once."""
+        return GeneratedTest(self.name, self.code, self.language, self.framework, self.imports,
+                             self.setup_code, self.teardown_code, self.metadata)
+
+
+@dataclass
+class ScenarioBundle:
+    """Several scenarios generated into one test module (or spec) per framework."""
+    name: str
+    scenarios: List[TestScenario]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'scenarios': [scenario.to_dict() for scenario in self.scenarios]
+        }
+
+
+def bundle_scenarios(scenarios: List[TestScenario], size: int, prefix: str = "bundle") -> List[ScenarioBundle]:
+    """Pack scenarios, in order, into bundles of up to ``size``.
+    
+    Args:
+        scenarios: Scenarios to pack
+        size: Most scenarios per bundle
+        prefix: Bundle names are ``{prefix}_001``, ``{prefix}_002``, ...
+    
+    Returns:
+        The bundles, the last one possibly smaller
+    """
+    if size < 1:
+        raise ValueError(f"Bundle size must be at least 1, got {size}")
+    count = (len(scenarios) + size - 1) // size
+    width = max(3, len(str(count)))
+    return [ScenarioBundle(f"{prefix}_{n + 1:0{width}d}", scenarios[n * size:(n + 1) * size]) for n in range(count)]
 
 
 class TestGenerator(ABC):
@@ -61,34 +174,144 @@ class TestGenerator(ABC):
         
         Args:
             scenario: The test scenario to generate code for
-            
+        
         Returns:
             Generated test code
         """
         pass
     
+    def stream(self, scenario: TestScenario) -> GeneratedTest:
+        """Describe the test for a scenario without building its code yet.
+        
+        Generators that can emit code line by line return a ``StreamedTest``;
+        the default falls back to ``generate``.
+        
+        Args:
+            scenario: The test scenario to generate code for
+        
+        Returns:
+            Generated test whose ``write_to`` streams the code
+        """
+        return self.generate(scenario)
+    
+    def stream_lowered(self, lowered: LoweredScenario) -> GeneratedTest:
+        """Describe the test for an already lowered scenario.
+        
+        Generators built on the lowered step IR override this (and have
+        ``stream`` lower the scenario first), so ``fan_out`` can share one
+        lowering between frameworks. The default streams the source scenario,
+        under the lowered name if it was renamed.
+        
+        Args:
+            lowered: The scenario as returned by ``lower_scenario``
+        
+        Returns:
+            Generated test whose ``write_to`` streams the code
+        """
+        scenario = lowered.scenario
+        if lowered.name != scenario.name:
+            scenario = TestScenario(lowered.name, scenario.description, list(scenario.steps), scenario.metadata)
+        return self.stream(scenario)
+    
+    def stream_bundle(self, name: str, scenarios: List[LoweredScenario]) -> GeneratedTest:
+        """Describe one test module holding the tests of several lowered scenarios.
+        
+        Imports and fixtures are emitted once per module, and repeated
+        scenario names are made unique (see ``lowering.unique_names``).
+        The default concatenates the ``stream_lowered`` code of each
+        scenario, with their imports, setup and teardown code deduplicated;
+        generators with their own module layout override it.
+        
+        Args:
+            name: Name of the bundle, used for the file (and class) name
+            scenarios: The scenarios as returned by ``lower_scenario``
+        
+        Returns:
+            Generated module whose ``write_to`` streams the code
+        """
+        scenarios = unique_names(scenarios)
+        tests = [self.stream_lowered(lowered) for lowered in scenarios]
+        
+        def code_lines() -> Iterator[str]:
+            for i, test in enumerate(tests):
+                if i:
+                    yield ""
+                yield from test.iter_code()
+        
+        def shared(parts: Iterable[Optional[str]]) -> Optional[str]:
+            return "\n\n".join(dict.fromkeys(part for part in parts if part)) or None
+        
+        return StreamedTest(
+            name=name + (os.path.splitext(tests[0].name)[1] if tests else ""),
+            code_lines=code_lines,
+            language=self.get_language(),
+            framework=self.get_framework_name(),
+            imports=list(dict.fromkeys(line for test in tests for line in test.imports)),
+            setup_code=shared(test.setup_code for test in tests),
+            teardown_code=shared(test.teardown_code for test in tests),
+            metadata={
+                'bundle': name,
+                'scenario_names': [lowered.name for lowered in scenarios]
+            }
+        )
+    
+    def write(self, scenario: TestScenario, sink: TextIO) -> GeneratedTest:
+        """Generate the test for a scenario straight into a text sink (file, buffer, socket).
+        
+        Args:
+            scenario: The test scenario to generate code for
+            sink: Any object with a ``write(str)`` method
+        
+        Returns:
+            The generated test, for its name and metadata
+        """
+        test = self.stream(scenario)
+        test.write_to(sink)
+        return test
+    
     @abstractmethod
     def generate_step(self, step: TestStep) -> str:
         """Generate code for a single test step.
         
         Args:
             step: The test step to generate code for
-            
+        
         Returns:
             Generated code for the step
         """
         pass
     
-    def generate_multiple(self, scenarios: List[TestScenario]) -> List[GeneratedTest]:
+    def generate_multiple(self, scenarios: List[TestScenario], jobs: Optional[int] = 1,
+                          stats: Optional['GenerationStats'] = None) -> List[GeneratedTest]:
         """Generate tests for multiple scenarios.
         
+        With more than one job the scenarios are rendered in a process pool;
+        each worker builds its own generator from this one's class and
+        ``config``. The result is the same as generating them one by one.
+        
         Args:
             scenarios: List of test scenarios
-            
+            jobs: Worker processes (None for the CPU count; 1 generates in-process)
+            stats: Filled in with the render timings
+        
         Returns:
-            List of generated tests
+            List of generated tests, in the order of ``scenarios``
         """
-        return [self.generate(scenario) for scenario in scenarios]
+        if jobs == 1 and stats is None:
+            return [self.generate(scenario) for scenario in scenarios]
+        
+        from .batch import render_tests
+        return [tests['test'] for tests in render_tests(scenarios, {'test': self}, jobs=jobs, stats=stats)]
+    
+    def fingerprint(self) -> str:
+        """Hash of everything besides the scenario that decides this generator's output.
+        
+        Covers the generator class, ``GENERATOR_VERSION`` and the config.
+        Generators with other inputs (such as template files) add them.
+        """
+        identity = [type(self).__module__, type(self).__qualname__, GENERATOR_VERSION, self.config]
+        payload = json.dumps(identity, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
     
     def get_framework_name(self) -> str:
         """Get the name of the test framework."""
@@ -96,4 +319,29 @@ class TestGenerator(ABC):
     
     def get_language(self) -> str:
         """Get the programming language for generated tests."""
-        return "python"  # Default to Python, override in subclasses
\ No newline at end of file
+        return "python"  # Default to Python, override in subclasses
+
+
+def fan_out(scenario: Union[TestScenario, ScenarioBundle],
+            generators: Dict[str, TestGenerator]) -> Dict[str, GeneratedTest]:
+    """Describe the tests for one scenario (or bundle of scenarios) in several frameworks.
+    
+    The scenario is lowered once and the lowered form is shared by every
+    generator, so step analysis is paid once per scenario rather than once
+    per framework. The returned tests stream their code on demand.
+    
+    Args:
+        scenario: The test scenario to generate code for, or a bundle to
+            generate one module per framework for
+        generators: Generators keyed by framework name
+    
+    Returns:
+        Generated tests keyed by the same framework names
+    """
+    if isinstance(scenario, ScenarioBundle):
+        lowered = [lower_scenario(member) for member in scenario.scenarios]
+        return {framework: generator.stream_bundle(scenario.name, lowered)
+                for framework, generator in generators.items()}
+    
+    lowered = lower_scenario(scenario)
+    return {framework: generator.stream_lowered(lowered) for framework, generator in generators.items()}
@@ -0,0 +1,189 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple, Type, Union
+
+from .base import GeneratedTest, ScenarioBundle, TestGenerator, fan_out
+from ..parsers.base import TestScenario
+
+
+@dataclass
+class GenerationStats:
+    """Per-stage timings and counters for a batch of generated tests.
+    
+    ``render`` and ``save`` add up the time spent in each stage across all
+    workers, so with several workers they can exceed the wall-clock
+    ``elapsed``. ``stream`` is used instead of both when tests are rendered
+    straight into their files one at a time. With a build manifest,
+    ``skipped`` counts tests not rendered because their inputs were
+    unchanged and ``unchanged`` those rendered but not written because the
+    file already held the same code.
+    """
+    scenarios: int = 0
+    tests: int = 0
+    files: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    jobs: int = 1
+    render: float = 0.0
+    save: float = 0.0
+    stream: float = 0.0
+    elapsed: float = 0.0
+    
+    @property
+    def tests_per_sec(self) -> float:
+        return self.tests / self.elapsed if self.elapsed else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'scenarios': self.scenarios,
+            'tests': self.tests,
+            'files': self.files,
+            'skipped': self.skipped,
+            'unchanged': self.unchanged,
+            'jobs': self.jobs,
+            'render': self.render,
+            'save': self.save,
+            'stream': self.stream,
+            'elapsed': self.elapsed,
+        }
+    
+    def report(self) -> str:
+        """One-line summary of the stages."""
+        if self.stream:
+            stages = f"render+save {self.stream:.2f}s"
+        else:
+            stages = f"render {self.render:.2f}s, save {self.save:.2f}s"
+        if self.skipped or self.unchanged:
+            stages += f", {self.skipped} up to date, {self.unchanged} unchanged"
+        return (f"{self.tests} test(s) for {self.scenarios} scenario(s) in {self.elapsed:.2f}s "
+                f"({stages}, {self.jobs} job(s), {self.tests_per_sec:.1f} tests/s)")
+
+
+# Generators of each worker process, created by the pool initializer
+_worker_generators: Optional[Dict[str, TestGenerator]] = None
+
+
+def _init_worker(specs: Dict[str, Tuple[Type[TestGenerator], Dict[str, Any]]]) -> None:
+    global _worker_generators
+    _worker_generators = {name: generator_class(config) for name, (generator_class, config) in specs.items()}
+
+
+def _render(scenario: Union[TestScenario, ScenarioBundle], generators: Dict[str, TestGenerator]) -> Tuple[Dict[str, GeneratedTest], float]:
+    """Render the tests of one scenario with their code built; returns them and the time taken."""
+    start = time.perf_counter()
+    tests = {name: test.materialize() for name, test in fan_out(scenario, generators).items()}
+    return tests, time.perf_counter() - start
+
+
+def _render_one(scenario: Union[TestScenario, ScenarioBundle]) -> Tuple[Dict[str, GeneratedTest], float]:
+    return _render(scenario, _worker_generators)
+
+
+def render_tests(scenarios: Iterable[Union[TestScenario, ScenarioBundle]], generators: Dict[str, TestGenerator],
+                 jobs: Optional[int] = 1, stats: Optional[GenerationStats] = None) -> Iterator[Dict[str, GeneratedTest]]:
+    """Render the tests of many scenarios across a process pool.
+    
+    Each worker process builds its own copies of the generators from their
+    class and ``config``, and results come back in the order of
+    ``scenarios``, so the output is the same as rendering them one by one.
+    
+    Args:
+        scenarios: Scenarios to render; a ``ScenarioBundle`` renders into one
+            test per framework
+        generators: Generators keyed by framework name
+        jobs: Worker processes (None for the CPU count; 1 renders in-process)
+        stats: Filled in with the render timings as results arrive
+    
+    Yields:
+        For each scenario, its generated tests keyed by framework name
+    """
+    scenarios = list(scenarios)
+    stats = stats if stats is not None else GenerationStats()
+    jobs = jobs or os.cpu_count() or 1
+    stats.jobs = jobs
+    
+    def account(scenario: Union[TestScenario, ScenarioBundle],
+                result: Tuple[Dict[str, GeneratedTest], float]) -> Dict[str, GeneratedTest]:
+        tests, elapsed = result
+        stats.scenarios += len(scenario.scenarios) if isinstance(scenario, ScenarioBundle) else 1
+        stats.tests += len(tests)
+        stats.render += elapsed
+        return tests
+    
+    if jobs == 1 or len(scenarios) <= 1:
+        for scenario in scenarios:
+            yield account(scenario, _render(scenario, generators))
+        return
+    
+    specs = {name: (type(generator), generator.config) for name, generator in generators.items()}
+    # Small chunks keep results flowing while amortizing IPC
+    chunksize = max(1, min(32, len(scenarios) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(specs,)) as executor:
+        for scenario, result in zip(scenarios, executor.map(_render_one, scenarios, chunksize=chunksize)):
+            yield account(scenario, result)
+
+
+def _save_test(test: GeneratedTest, file_path: Path) -> None:
+    test.save(file_path)
+
+
+def _save(write: Callable[[GeneratedTest, Path], Any], test: GeneratedTest, file_path: Path) -> float:
+    start = time.perf_counter()
+    write(test, file_path)
+    return time.perf_counter() - start
+
+
+def save_tests(outputs: Iterable[Tuple[Path, GeneratedTest]], jobs: Optional[int] = 1,
+               stats: Optional[GenerationStats] = None,
+               write: Callable[[GeneratedTest, Path], Any] = _save_test) -> Iterator[Path]:
+    """Write generated tests to their files across a thread pool.
+    
+    Writes start as ``outputs`` produces them. When several tests go to the
+    same path they are written in order, so the last one wins exactly as it
+    would when saving one by one.
+    
+    Args:
+        outputs: (file path, test) pairs
+        jobs: Writer threads (None for the CPU count; 1 writes in the calling thread)
+        stats: Filled in with the save timings as files are written
+        write: Called as ``write(test, file_path)`` to write each file, from the
+            writer threads; defaults to ``test.save(file_path)``
+    
+    Yields:
+        The file paths in the order of ``outputs``, each once it is written
+    """
+    stats = stats if stats is not None else GenerationStats()
+    jobs = jobs or os.cpu_count() or 1
+    
+    def account(elapsed: float) -> None:
+        stats.files += 1
+        stats.save += elapsed
+    
+    if jobs == 1:
+        for file_path, test in outputs:
+            account(_save(write, test, file_path))
+            yield file_path
+        return
+    
+    pending: Deque[Tuple[Path, Future]] = deque()
+    latest: Dict[Path, Future] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for file_path, test in outputs:
+            previous = latest.get(file_path)
+            if previous is not None:
+                # Keep writes to one file in order
+                previous.result()
+            future = latest[file_path] = executor.submit(_save, write, test, file_path)
+            pending.append((file_path, future))
+            # Report finished writes in order without waiting on the rest
+            while pending and pending[0][1].done():
+                path, done = pending.popleft()
+                account(done.result())
+                yield path
+        for path, future in pending:
+            account(future.result())
+            yield path
@@ -1,16 +1,44 @@
-from typing import Dict, Any, List, Optional
+import hashlib
 import json
-import yaml
+from typing import Dict, Any, List, Optional, Iterator
 from pathlib import Path
-from string import Template
 
-from .base import TestGenerator, GeneratedTest
+from .base import TestGenerator, GeneratedTest, StreamedTest
+from .template_engine import TemplateSet
+from .template_loader import get_template_cache
+from .lowering import LoweredScenario, unique_names
 from ..parsers.base import TestScenario, TestStep, StepType
 
 
+_STEP_TEMPLATE_KEYS = {
+    StepType.USER_ACTION: 'user_action',
+    StepType.API_CALL: 'api_call',
+    StepType.ASSERTION: 'assertion',
+    StepType.NAVIGATION: 'navigation',
+    StepType.WAIT: 'wait',
+    StepType.NOTE: 'note'
+}
+
+
+# Template variables available to step templates
+_STEP_VARS = {
+    'action': lambda step: step.action,
+    'description': lambda step: step.description,
+    'actor': lambda step: step.actor,
+    'target': lambda step: step.target or '',
+    'method': lambda step: step.data.get('method', 'GET'),
+    'method_lower': lambda step: step.data.get('method', 'GET').lower(),
+    'endpoint': lambda step: step.data.get('endpoint', '/'),
+    'payload': lambda step: step.data.get('payload', 'null'),
+    'expected': lambda step: step.expected or ''
+}
+
+
 class CustomGenerator(TestGenerator):
     """Customizable test generator using templates for any language/framework."""
     
+    _builtin_templates: Optional[Dict[str, Dict[str, str]]] = None
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
         self.template_path = config.get('template_path') if config else None
@@ -18,11 +46,18 @@ class CustomGenerator(TestGenerator):
         self.framework = config.get('framework', 'custom') if config else 'custom'
         self.file_extension = config.get('file_extension', '.test') if config else '.test'
         self.templates = self._load_templates()
+        # Templates are compiled on first use and reused for every scenario and step
+        self.compiled = TemplateSet()
     
     def get_language(self) -> str:
         """Get the programming language for generated tests."""
         return self.language
     
+    def fingerprint(self) -> str:
+        """Hash of the generator config and the templates it loaded (template files can change)."""
+        payload = json.dumps([super().fingerprint(), self.templates], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
     def get_framework_name(self) -> str:
         """Get the name of the test framework."""
         return self.framework
@@ -34,13 +69,9 @@ class CustomGenerator(TestGenerator):
         # Load from template file if provided
         if self.template_path:
             template_file = Path(self.template_path)
-            if template_file.exists():
-                if template_file.suffix == '.yaml' or template_file.suffix == '.yml':
-                    with open(template_file, 'r', encoding='utf-8') as f:
-                        templates = yaml.safe_load(f)
-                elif template_file.suffix == '.json':
-                    with open(template_file, 'r', encoding='utf-8') as f:
-                        templates = json.load(f)
+            if template_file.exists() and template_file.suffix in ['.yaml', '.yml', '.json']:
+                # Parsed once per process and reloaded when the file changes
+                templates = get_template_cache().load(template_file)
         
         # Use built-in templates if not provided
         if not templates:
@@ -52,7 +83,17 @@ class CustomGenerator(TestGenerator):
         """Get built-in templates for common languages/frameworks."""
         lang_framework = f"{self.language}_{self.framework}".lower()
         
-        templates = {
+        templates = CustomGenerator._builtin_templates
+        if templates is None:
+            templates = CustomGenerator._builtin_templates = self._build_builtin_templates()
+        
+        # Return a copy of the specific template or default
+        return dict(templates.get(lang_framework, templates["default"]))
+    
+    @staticmethod
+    def _build_builtin_templates() -> Dict[str, Dict[str, str]]:
+        """Build the built-in template table; done once, on first use."""
+        return {
             # Java JUnit
             "java_junit": {
                 "imports": """import org.junit.jupiter.api.Test;
@@ -178,72 +219,114 @@ use PHPUnit\Framework\TestCase;""",
                 "file_extension": ".test"
             }
         }
-        
-        # Return specific template or default
-        return templates.get(lang_framework, templates["default"])
     
     def generate(self, scenario: TestScenario) -> GeneratedTest:
         """Generate test from scenario using templates."""
-        # Prepare template variables
-        template_vars = {
-            'test_name': self._to_class_name(scenario.name),
-            'method_name': self._to_method_name(scenario.name),
-            'description': scenario.description,
+        return self.stream(scenario).materialize()
+    
+    def stream(self, scenario: TestScenario) -> StreamedTest:
+        """Describe the test for a scenario; its code is rendered part by part on demand."""
+        # Determine file extension
+        file_ext = self.templates.get('file_extension', self.file_extension)
+        
+        return StreamedTest(
+            name=f"{scenario.name}{file_ext}",
+            code_lines=lambda: self._iter_parts(scenario),
+            language=self.language,
+            framework=self.framework,
+            imports=[],
+            metadata={
+                'scenario_name': scenario.name,
+                'template_used': f"{self.language}_{self.framework}"
+            }
+        )
+    
+    def stream_bundle(self, name: str, scenarios: List[LoweredScenario]) -> StreamedTest:
+        """Describe one test file holding a test per lowered scenario.
+        
+        The imports, class and setup templates are rendered once, for the
+        bundle name; the test templates once per scenario.
+        """
+        scenarios = unique_names(scenarios)
+        file_ext = self.templates.get('file_extension', self.file_extension)
+        
+        return StreamedTest(
+            name=f"{name}{file_ext}",
+            code_lines=lambda: self._iter_bundle_parts(name, scenarios),
+            language=self.language,
+            framework=self.framework,
+            imports=[],
+            metadata={
+                'bundle': name,
+                'scenario_names': [lowered.name for lowered in scenarios],
+                'template_used': f"{self.language}_{self.framework}"
+            }
+        )
+    
+    def _template_vars(self, name: str, description: str) -> Dict[str, Any]:
+        """Variables for the file and test templates."""
+        return {
+            'test_name': self._to_class_name(name),
+            'method_name': self._to_method_name(name),
+            'description': description,
             'base_url': self.config.get('base_url', 'http://localhost:8080'),
             'package_name': self.config.get('package_name', 'tests')
         }
-        
-        # Build test code
-        parts = []
-        
+    
+    def _iter_parts(self, scenario: TestScenario) -> Iterator[str]:
+        """Render the test code from the templates, one part at a time."""
+        template_vars = self._template_vars(scenario.name, scenario.description)
+        yield from self._iter_header(template_vars)
+        yield from self._iter_test(scenario, template_vars)
+        yield from self._iter_footer(template_vars)
+    
+    def _iter_bundle_parts(self, name: str, scenarios: List[LoweredScenario]) -> Iterator[str]:
+        """Render a bundle: the file templates once around the test templates of each scenario."""
+        template_vars = self._template_vars(name, "")
+        yield from self._iter_header(template_vars)
+        for lowered in scenarios:
+            yield from self._iter_test(lowered.scenario, self._template_vars(lowered.name, lowered.description))
+        yield from self._iter_footer(template_vars)
+    
+    def _iter_header(self, template_vars: Dict[str, Any]) -> Iterator[str]:
+        """Render the imports, class start and setup templates."""
         # Add imports
         if 'imports' in self.templates:
-            parts.append(Template(self.templates['imports']).safe_substitute(template_vars))
-            parts.append("")
+            yield self.compiled.render(self.templates['imports'], template_vars)
+            yield ""
         
         # Add class start
         if 'class_start' in self.templates:
-            parts.append(Template(self.templates['class_start']).safe_substitute(template_vars))
-            parts.append("")
+            yield self.compiled.render(self.templates['class_start'], template_vars)
+            yield ""
         
         # Add setup
         if 'setup' in self.templates:
-            parts.append(Template(self.templates['setup']).safe_substitute(template_vars))
-            parts.append("")
-        
+            yield self.compiled.render(self.templates['setup'], template_vars)
+            yield ""
+    
+    def _iter_test(self, scenario: TestScenario, template_vars: Dict[str, Any]) -> Iterator[str]:
+        """Render the test templates around the steps of a scenario."""
         # Add test method
         if 'test_start' in self.templates:
-            parts.append(Template(self.templates['test_start']).safe_substitute(template_vars))
+            yield self.compiled.render(self.templates['test_start'], template_vars)
         
         # Generate steps
         for step in scenario.steps:
             step_code = self.generate_step(step)
             if step_code:
-                parts.append(step_code)
+                yield step_code
         
         # Add test end
         if 'test_end' in self.templates:
-            parts.append(Template(self.templates['test_end']).safe_substitute(template_vars))
-            parts.append("")
-        
+            yield self.compiled.render(self.templates['test_end'], template_vars)
+            yield ""
+    
+    def _iter_footer(self, template_vars: Dict[str, Any]) -> Iterator[str]:
+        """Render the class end template."""
         # Add class end
         if 'class_end' in self.templates:
-            parts.append(Template(self.templates['class_end']).safe_substitute(template_vars))
-        
-        # Determine file extension
-        file_ext = self.templates.get('file_extension', self.file_extension)
-        
-        return GeneratedTest(
-            name=f"{scenario.name}{file_ext}",
-            code="\n".join(parts),
-            language=self.language,
-            framework=self.framework,
-            imports=[],
-            metadata={
-                'scenario_name': scenario.name,
-                'template_used': f"{self.language}_{self.framework}"
-            }
-        )
+            yield self.compiled.render(self.templates['class_end'], template_vars)
     
     def generate_step(self, step: TestStep) -> str:
         """Generate code for a single step using templates."""
@@ -252,34 +335,16 @@ use PHPUnit\Framework\TestCase;""",
         if template_key not in self.templates:
             return f"        // {step.description}"
         
-        template_str = self.templates[template_key]
+        render = self.compiled.get(self.templates[template_key])
         
-        # Prepare variables for template
-        vars = {
-            'action': step.action,
-            'description': step.description,
-            'actor': step.actor,
-            'target': step.target or '',
-            'method': step.data.get('method', 'GET'),
-            'method_lower': step.data.get('method', 'GET').lower(),
-            'endpoint': step.data.get('endpoint', '/'),
-            'payload': step.data.get('payload', 'null'),
-            'expected': step.expected or ''
-        }
+        # Prepare only the variables this template uses
+        vars = {name: _STEP_VARS[name](step) for name in render.names if name in _STEP_VARS}
         
-        return Template(template_str).safe_substitute(vars)
+        return render(vars)
     
     def _get_template_key(self, step_type: StepType) -> str:
         """Map step type to template key."""
-        mapping = {
-            StepType.USER_ACTION: 'user_action',
-            StepType.API_CALL: 'api_call',
-            StepType.ASSERTION: 'assertion',
-            StepType.NAVIGATION: 'navigation',
-            StepType.WAIT: 'wait',
-            StepType.NOTE: 'note'
-        }
-        return mapping.get(step_type, 'default')
+        return _STEP_TEMPLATE_KEYS.get(step_type, 'default')
     
     def _to_class_name(self, name: str) -> str:
         """Convert name to class name (PascalCase)."""
@@ -1,17 +1,33 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 import json
 
-from .base import TestGenerator, GeneratedTest
+from .base import TestGenerator, GeneratedTest, StreamedTest
+from .lowering import LoweredScenario, LoweredStep, lower_scenario, lower_step, unique_names
 from ..parsers.base import TestScenario, TestStep, StepType
 
 
 class CypressGenerator(TestGenerator):
     """Generate Cypress tests for Next.js applications."""
     
+    # Selectors for common elements named in an action, first match wins
+    DEFAULT_SELECTORS = (
+        (('login', '로그인'), 'button[type="submit"]'),
+        (('email', '이메일'), 'input[type="email"]'),
+        (('password', '비밀번호'), 'input[type="password"]'),
+    )
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
         self.base_url = config.get('base_url', 'http://localhost:3000') if config else 'http://localhost:3000'
         self.viewport = config.get('viewport', {'width': 1280, 'height': 720}) if config else {'width': 1280, 'height': 720}
+        # Step code emitters by step kind (StepType value)
+        self._emitters = {
+            StepType.USER_ACTION.value: self._generate_user_action,
+            StepType.API_CALL.value: self._generate_api_call,
+            StepType.ASSERTION.value: self._generate_assertion,
+            StepType.NAVIGATION.value: self._generate_navigation,
+            StepType.WAIT.value: self._generate_wait,
+        }
     
     def get_language(self) -> str:
         """Get the programming language for generated tests."""
@@ -19,12 +35,18 @@ class CypressGenerator(TestGenerator):
     
     def generate(self, scenario: TestScenario) -> GeneratedTest:
         """Generate Cypress test from scenario."""
-        # Generate test code
-        test_code = self._generate_test_function(scenario)
-        
-        return GeneratedTest(
+        return self.stream(scenario).materialize()
+    
+    def stream(self, scenario: TestScenario) -> StreamedTest:
+        """Describe the Cypress test for a scenario; its code is emitted line by line on demand."""
+        return self.stream_lowered(lower_scenario(scenario))
+    
+    def stream_lowered(self, lowered: LoweredScenario) -> StreamedTest:
+        """Describe the Cypress test for a lowered scenario."""
+        scenario = lowered.scenario
+        return StreamedTest(
             name=f"{scenario.name}.cy.js",
-            code=test_code,
+            code_lines=lambda: self._iter_test_function(lowered),
             language="javascript",
             framework="cypress",
             imports=[],  # Cypress doesn't need explicit imports
@@ -35,156 +57,171 @@ class CypressGenerator(TestGenerator):
             }
         )
     
+    def stream_bundle(self, name: str, scenarios: List[LoweredScenario]) -> StreamedTest:
+        """Describe one Cypress spec with a describe block per lowered scenario.
+        
+        The viewport/visit hook is declared once at the top of the spec,
+        where it runs before every test in the file.
+        """
+        scenarios = unique_names(scenarios)
+        return StreamedTest(
+            name=f"{name}.cy.js",
+            code_lines=lambda: self._iter_bundle(scenarios),
+            language="javascript",
+            framework="cypress",
+            imports=[],  # Cypress doesn't need explicit imports
+            metadata={
+                'bundle': name,
+                'scenario_names': [lowered.name for lowered in scenarios],
+                'base_url': self.base_url,
+                'viewport': self.viewport
+            }
+        )
+    
     def generate_step(self, step: TestStep) -> str:
         """Generate Cypress code for a step."""
-        if step.step_type == StepType.USER_ACTION:
-            return self._generate_user_action(step)
-        elif step.step_type == StepType.API_CALL:
-            return self._generate_api_call(step)
-        elif step.step_type == StepType.ASSERTION:
-            return self._generate_assertion(step)
-        elif step.step_type == StepType.NAVIGATION:
-            return self._generate_navigation(step)
-        elif step.step_type == StepType.WAIT:
-            return self._generate_wait(step)
-        else:
+        return self._emit_step(lower_step(step))
+    
+    def _emit_step(self, step: LoweredStep) -> str:
+        """Generate Cypress code for a lowered step."""
+        emit = self._emitters.get(step.kind)
+        if emit is None:
             return f"    // {step.description}"
+        return emit(step)
     
-    def _generate_test_function(self, scenario: TestScenario) -> str:
-        """Generate the main test function."""
-        lines = [
-            f"describe('{scenario.name}', () => {{",
-            f"  beforeEach(() => {{",
-            f"    cy.viewport({self.viewport['width']}, {self.viewport['height']});",
-            f"    cy.visit('{self.base_url}');",
-            f"  }});",
-            "",
-            f"  it('{scenario.description}', () => {{",
+    def _iter_test_function(self, lowered: LoweredScenario) -> Iterator[str]:
+        """Generate the main test function, one line at a time."""
+        yield f"describe('{lowered.name}', () => {{"
+        yield from self._iter_hooks("  ")
+        yield ""
+        yield from self._iter_it(lowered)
+        yield "});"
+    
+    def _iter_bundle(self, scenarios: List[LoweredScenario]) -> Iterator[str]:
+        """Generate a spec's shared hook and then a describe block per scenario."""
+        yield from self._iter_hooks("")
+        for lowered in scenarios:
+            yield ""
+            yield f"describe('{lowered.name}', () => {{"
+            yield from self._iter_it(lowered)
+            yield "});"
+    
+    def _iter_hooks(self, indent: str) -> Iterator[str]:
+        """Generate the beforeEach hook that sets the viewport and opens the app."""
+        yield from [
+            f"{indent}beforeEach(() => {{",
+            f"{indent}  cy.viewport({self.viewport['width']}, {self.viewport['height']});",
+            f"{indent}  cy.visit('{self.base_url}');",
+            f"{indent}}});",
         ]
+    
+    def _iter_it(self, lowered: LoweredScenario) -> Iterator[str]:
+        """Generate the it block of a scenario, one line at a time."""
+        yield f"  it('{lowered.description}', () => {{"
         
         # Generate code for each step
-        for i, step in enumerate(scenario.steps):
-            lines.append(f"    // Step {i+1}: {step.description}")
-            step_code = self.generate_step(step)
+        for step in lowered.steps:
+            yield f"    // Step {step.index}: {step.description}"
+            step_code = self._emit_step(step)
             if step_code:
-                lines.append(step_code)
-            lines.append("")
-        
-        lines.extend([
-            "  });",
-            "});"
-        ])
+                yield step_code
+            yield ""
         
-        return "\n".join(lines)
+        yield "  });"
     
-    def _generate_user_action(self, step: TestStep) -> str:
+    def _generate_user_action(self, step: LoweredStep) -> str:
         """Generate code for user actions."""
-        action = step.action.lower()
-        
-        if 'click' in action:
-            selector = self._extract_selector(step.action)
-            if '로그인' in step.action:
+        if step.has('click'):
+            if step.has('로그인'):
                 return "    cy.contains('로그인').click();"
-            elif 'button' in action:
-                text = self._extract_button_text(step.action)
+            elif step.has('button'):
+                text = self._button_text(step)
                 return f"    cy.contains('button', '{text}').click();"
             else:
+                selector = self._selector(step)
                 return f"    cy.get('{selector}').click();"
         
-        elif 'type' in action or 'enter' in action or '입력' in action:
-            if '이메일' in step.action:
+        elif step.has_any('type', 'enter', '입력'):
+            if step.has('이메일'):
                 text = step.data.get('text', 'user@example.com')
                 return f"    cy.get('input[type=\"email\"]').type('{text}');"
-            elif '비밀번호' in step.action or 'password' in action:
+            elif step.has_any('비밀번호', 'password'):
                 text = step.data.get('text', 'password123')
                 return f"    cy.get('input[type=\"password\"]').type('{text}');"
             else:
-                selector = self._extract_selector(step.action)
+                selector = self._selector(step)
                 text = step.data.get('text', '')
                 return f"    cy.get('{selector}').type('{text}');"
         
-        elif 'select' in action:
-            selector = self._extract_selector(step.action)
+        elif step.has('select'):
+            selector = self._selector(step)
             value = step.data.get('value', '')
             return f"    cy.get('{selector}').select('{value}');"
         
-        elif '접속' in action:
+        elif step.has('접속'):
             return f"    // 사용자가 페이지에 접속"
         
         else:
             return f"    // TODO: Implement {step.action}"
     
-    def _generate_api_call(self, step: TestStep) -> str:
+    def _generate_api_call(self, step: LoweredStep) -> str:
         """Generate code for API calls."""
-        method = step.data.get('method', 'GET')
-        endpoint = step.data.get('endpoint', '/')
+        request = step.request
         
         lines = [
-            f"    // API Call: {method} {endpoint}",
-            f"    cy.intercept('{method}', '{endpoint}', {{ fixture: 'auth-success.json' }}).as('apiCall');",
+            f"    // API Call: {request.method} {request.endpoint}",
+            f"    cy.intercept('{request.method}', '{request.endpoint}', {{ fixture: 'auth-success.json' }}).as('apiCall');",
             f"    cy.wait('@apiCall');"
         ]
         
         return "\n".join(lines)
     
-    def _generate_assertion(self, step: TestStep) -> str:
+    def _generate_assertion(self, step: LoweredStep) -> str:
         """Generate assertion code."""
-        if 'JWT' in step.action and '토큰' in step.action:
+        if step.has('JWT', '토큰'):
             return "    cy.getCookie('access_token').should('exist');"
-        elif '에러' in step.action:
+        elif step.has('에러'):
             return "    cy.contains('에러').should('be.visible');"
         elif step.expected:
             return f"    cy.contains('{step.expected}').should('be.visible');"
         else:
             return f"    // Assertion: {step.description}"
     
-    def _generate_navigation(self, step: TestStep) -> str:
+    def _generate_navigation(self, step: LoweredStep) -> str:
         """Generate navigation code."""
-        if '메인' in step.action and '페이지' in step.action:
+        if step.has('메인', '페이지'):
             return "    cy.url().should('include', '/dashboard');"
-        elif '리다이렉트' in step.action:
+        elif step.has('리다이렉트'):
             url = step.data.get('url', '/dashboard')
             return f"    cy.url().should('include', '{url}');"
         else:
             url = step.data.get('url', '/')
             return f"    cy.visit('{url}');"
     
-    def _generate_wait(self, step: TestStep) -> str:
+    def _generate_wait(self, step: LoweredStep) -> str:
         """Generate wait code."""
         timeout = step.data.get('timeout', 1000)
         return f"    cy.wait({timeout});"
     
-    def _extract_selector(self, action: str) -> str:
-        """Extract selector from action description."""
-        # Simple extraction logic
-        if '"' in action:
-            import re
-            match = re.search(r'"([^"]+)"', action)
-            if match:
-                return match.group(1)
+    def _selector(self, step: LoweredStep) -> str:
+        """Selector quoted in the action, or a default for the element it names."""
+        if step.quoted:
+            return step.quoted
         
-        # Default selectors for common elements
-        action_lower = action.lower()
-        if 'login' in action_lower or '로그인' in action:
-            return 'button[type="submit"]'
-        elif 'email' in action_lower or '이메일' in action:
-            return 'input[type="email"]'
-        elif 'password' in action_lower or '비밀번호' in action:
-            return 'input[type="password"]'
+        for keywords, selector in self.DEFAULT_SELECTORS:
+            if step.has_any(*keywords):
+                return selector
         
         return 'body'
     
-    def _extract_button_text(self, action: str) -> str:
-        """Extract button text from action."""
-        if '"' in action:
-            import re
-            match = re.search(r'"([^"]+)"', action)
-            if match:
-                return match.group(1)
+    def _button_text(self, step: LoweredStep) -> str:
+        """Button label quoted in the action, or a default for the button it names."""
+        if step.quoted:
+            return step.quoted
         
-        if '로그인' in action:
+        if step.has('로그인'):
             return '로그인'
-        elif '제출' in action or 'submit' in action.lower():
+        elif step.has_any('제출', 'submit'):
             return '제출'
         
-        return 'Click'
\ No newline at end of file
+        return 'Click'
@@ -1,7 +1,8 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 import json
 
-from .base import TestGenerator, GeneratedTest
+from .base import TestGenerator, GeneratedTest, StreamedTest
+from .lowering import LoweredScenario, LoweredStep, lower_scenario, lower_step, unique_names
 from ..parsers.base import TestScenario, TestStep, StepType
 
 
@@ -12,6 +13,14 @@ class JestRTLGenerator(TestGenerator):
         super().__init__(config)
         self.component_name = config.get('component_name', 'App') if config else 'App'
         self.use_typescript = config.get('use_typescript', True) if config else True
+        # Step code emitters by step kind (StepType value)
+        self._emitters = {
+            StepType.USER_ACTION.value: self._generate_user_action,
+            StepType.API_CALL.value: self._generate_api_call,
+            StepType.ASSERTION.value: self._generate_assertion,
+            StepType.NAVIGATION.value: self._generate_navigation,
+            StepType.WAIT.value: self._generate_wait,
+        }
     
     def get_language(self) -> str:
         """Get the programming language for generated tests."""
@@ -19,20 +28,25 @@ class JestRTLGenerator(TestGenerator):
     
     def generate(self, scenario: TestScenario) -> GeneratedTest:
         """Generate Jest + RTL test from scenario."""
+        return self.stream(scenario).materialize()
+    
+    def stream(self, scenario: TestScenario) -> StreamedTest:
+        """Describe the Jest + RTL test for a scenario; its code is emitted line by line on demand."""
+        return self.stream_lowered(lower_scenario(scenario))
+    
+    def stream_lowered(self, lowered: LoweredScenario) -> StreamedTest:
+        """Describe the Jest + RTL test for a lowered scenario."""
+        scenario = lowered.scenario
+        
         # Generate imports
         imports = self._generate_imports()
         
-        # Generate test code
-        test_code = self._generate_test_function(scenario)
-        
         # Generate setup code if needed
-        setup_code = self._generate_setup(scenario)
+        setup_code = self._generate_setup(lowered.api_calls)
         
-        file_extension = ".test.tsx" if self.use_typescript else ".test.jsx"
-        
-        return GeneratedTest(
-            name=f"{scenario.name}{file_extension}",
-            code=test_code,
+        return StreamedTest(
+            name=f"{scenario.name}{self._file_extension()}",
+            code_lines=lambda: self._iter_test_function(lowered),
             language=self.get_language(),
             framework="jest-rtl",
             imports=imports,
@@ -44,20 +58,38 @@ class JestRTLGenerator(TestGenerator):
             }
         )
     
+    def stream_bundle(self, name: str, scenarios: List[LoweredScenario]) -> StreamedTest:
+        """Describe one Jest + RTL test file with a describe block per lowered scenario.
+        
+        The mock server and the user-event setup are declared once at the
+        top of the file, where they apply to every test in it.
+        """
+        scenarios = unique_names(scenarios)
+        return StreamedTest(
+            name=f"{name}{self._file_extension()}",
+            code_lines=lambda: self._iter_bundle(scenarios),
+            language=self.get_language(),
+            framework="jest-rtl",
+            imports=self._generate_imports(),
+            setup_code=self._generate_setup(sum(lowered.api_calls for lowered in scenarios)),
+            metadata={
+                'bundle': name,
+                'scenario_names': [lowered.name for lowered in scenarios],
+                'component_name': self.component_name,
+                'use_typescript': self.use_typescript
+            }
+        )
+    
     def generate_step(self, step: TestStep) -> str:
         """Generate Jest/RTL code for a step."""
-        if step.step_type == StepType.USER_ACTION:
-            return self._generate_user_action(step)
-        elif step.step_type == StepType.API_CALL:
-            return self._generate_api_call(step)
-        elif step.step_type == StepType.ASSERTION:
-            return self._generate_assertion(step)
-        elif step.step_type == StepType.NAVIGATION:
-            return self._generate_navigation(step)
-        elif step.step_type == StepType.WAIT:
-            return self._generate_wait(step)
-        else:
+        return self._emit_step(lower_step(step))
+    
+    def _emit_step(self, step: LoweredStep) -> str:
+        """Generate Jest/RTL code for a lowered step."""
+        emit = self._emitters.get(step.kind)
+        if emit is None:
             return f"  // {step.description}"
+        return emit(step)
     
     def _generate_imports(self) -> List[str]:
         """Generate import statements."""
@@ -76,11 +108,12 @@ class JestRTLGenerator(TestGenerator):
         
         return imports
     
-    def _generate_setup(self, scenario: TestScenario) -> str:
+    def _file_extension(self) -> str:
+        return ".test.tsx" if self.use_typescript else ".test.jsx"
+    
+    def _generate_setup(self, api_calls: int) -> str:
         """Generate setup code."""
-        # Check if there are API calls in the scenario
-        api_calls = scenario.get_api_calls()
-        
+        # Mock the API only when the scenario calls it
         if api_calls:
             return """// Mock server setup
 const server = setupServer(
@@ -101,83 +134,96 @@ afterAll(() => server.close());"""
         
         return ""
     
-    def _generate_test_function(self, scenario: TestScenario) -> str:
-        """Generate the main test function."""
-        lines = [
-            f"describe('{scenario.name}', () => {{",
+    def _iter_test_function(self, lowered: LoweredScenario) -> Iterator[str]:
+        """Generate the main test function, one line at a time."""
+        yield from [
+            f"describe('{lowered.name}', () => {{",
             f"  let user: User;",
             "",
             "  beforeEach(() => {",
             "    user = userEvent.setup();",
             "  });",
             "",
-            f"  test('{scenario.description}', async () => {{",
+        ]
+        yield from self._iter_test(lowered)
+        yield "});"
+    
+    def _iter_bundle(self, scenarios: List[LoweredScenario]) -> Iterator[str]:
+        """Generate a file's shared user-event setup and then a describe block per scenario."""
+        yield from [
+            "let user: User;" if self.use_typescript else "let user;",
+            "",
+            "beforeEach(() => {",
+            "  user = userEvent.setup();",
+            "});",
+        ]
+        for lowered in scenarios:
+            yield ""
+            yield f"describe('{lowered.name}', () => {{"
+            yield from self._iter_test(lowered)
+            yield "});"
+    
+    def _iter_test(self, lowered: LoweredScenario) -> Iterator[str]:
+        """Generate the test block of a scenario, one line at a time."""
+        yield from [
+            f"  test('{lowered.description}', async () => {{",
             f"    render(<{self.component_name} />);",
             ""
         ]
         
         # Generate code for each step
-        for i, step in enumerate(scenario.steps):
-            lines.append(f"    // Step {i+1}: {step.description}")
-            step_code = self.generate_step(step)
+        for step in lowered.steps:
+            yield f"    // Step {step.index}: {step.description}"
+            step_code = self._emit_step(step)
             if step_code:
-                lines.append(step_code)
-            lines.append("")
-        
-        lines.extend([
-            "  });",
-            "});"
-        ])
+                yield step_code
+            yield ""
         
-        return "\n".join(lines)
+        yield "  });"
     
-    def _generate_user_action(self, step: TestStep) -> str:
+    def _generate_user_action(self, step: LoweredStep) -> str:
         """Generate code for user actions."""
-        action = step.action.lower()
-        
-        if 'click' in action or '클릭' in action:
-            if '로그인' in step.action:
+        if step.has_any('click', '클릭'):
+            if step.has('로그인'):
                 return "    await user.click(screen.getByRole('button', { name: /로그인/i }));"
-            elif 'button' in action:
-                text = self._extract_button_text(step.action)
+            elif step.has('button'):
+                text = self._button_text(step)
                 return f"    await user.click(screen.getByRole('button', {{ name: /{text}/i }}));"
             else:
                 return "    // Click action - specify the element"
         
-        elif 'type' in action or 'enter' in action or '입력' in action:
-            if '이메일' in step.action:
+        elif step.has_any('type', 'enter', '입력'):
+            if step.has('이메일'):
                 text = step.data.get('text', 'user@example.com')
                 return f"    await user.type(screen.getByLabelText(/이메일/i), '{text}');"
-            elif '비밀번호' in step.action or 'password' in action:
+            elif step.has_any('비밀번호', 'password'):
                 text = step.data.get('text', 'password123')
                 return f"    await user.type(screen.getByLabelText(/비밀번호/i), '{text}');"
             else:
                 return "    // Type action - specify the input"
         
-        elif '접속' in action:
+        elif step.has('접속'):
             return "    // User accesses the page (handled by render)"
         
         else:
             return f"    // TODO: Implement {step.action}"
     
-    def _generate_api_call(self, step: TestStep) -> str:
+    def _generate_api_call(self, step: LoweredStep) -> str:
         """Generate code for API calls."""
-        method = step.data.get('method', 'GET')
-        endpoint = step.data.get('endpoint', '/')
-        
-        return f"    // API Call: {method} {endpoint} (handled by MSW mock)"
+        request = step.request
+        return f"    // API Call: {request.method} {request.endpoint} (handled by MSW mock)"
     
-    def _generate_assertion(self, step: TestStep) -> str:
+    def _generate_assertion(self, step: LoweredStep) -> str:
         """Generate assertion code."""
-        if 'JWT' in step.action and '토큰' in step.action:
+        if step.has('JWT', '토큰'):
             return """    await waitFor(() => {
       expect(document.cookie).toContain('access_token');
     });"""
-        elif '에러' in step.action:
+        elif step.has('에러'):
             return """    await waitFor(() => {
       expect(screen.getByText(/에러/i)).toBeInTheDocument();
     });"""
-        elif '메인' in step.action and '페이지' in step.action:
+        elif step.has('메인', '페이지'):
             return """    await waitFor(() => {
       expect(window.location.pathname).toBe('/dashboard');
     });"""
@@ -188,9 +234,9 @@ afterAll(() => server.close());"""
         else:
             return f"    // Assertion: {step.description}"
     
-    def _generate_navigation(self, step: TestStep) -> str:
+    def _generate_navigation(self, step: LoweredStep) -> str:
         """Generate navigation code."""
-        if '메인' in step.action and '페이지' in step.action:
+        if step.has('메인', '페이지'):
             return """    // Navigation to main page
     await waitFor(() => {
       expect(window.location.pathname).toBe('/dashboard');
@@ -198,24 +244,21 @@ afterAll(() => server.close());"""
         else:
             return f"    // Navigation: {step.description}"
     
-    def _generate_wait(self, step: TestStep) -> str:
+    def _generate_wait(self, step: LoweredStep) -> str:
         """Generate wait code."""
         timeout = step.data.get('timeout', 1000)
         return f"""    await waitFor(() => {{
       // Wait for condition
     }}, {{ timeout: {timeout} }});"""
     
-    def _extract_button_text(self, action: str) -> str:
-        """Extract button text from action."""
-        if '"' in action:
-            import re
-            match = re.search(r'"([^"]+)"', action)
-            if match:
-                return match.group(1)
+    def _button_text(self, step: LoweredStep) -> str:
+        """Button label quoted in the action, or a default for the button it names."""
+        if step.quoted:
+            return step.quoted
         
-        if '로그인' in action:
+        if step.has('로그인'):
             return '로그인'
-        elif '제출' in action or 'submit' in action.lower():
+        elif step.has_any('제출', 'submit'):
             return '제출'
         
-        return 'Click'
\ No newline at end of file
+        return 'Click'
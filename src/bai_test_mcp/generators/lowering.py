@@ -0,0 +1,269 @@
+import re
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+from ..parsers.base import StepType, TestScenario, TestStep
+
+
+# Words in a step action that the generators branch on. They are matched once
+# per step against the lowercased action; lowercasing leaves Korean as is.
+ACTION_KEYWORDS = (
+    'click', '클릭', 'type', 'enter', '입력', 'select', '접속', 'button',
+    'login', '로그인', 'submit', '제출', 'email', '이메일', 'password', '비밀번호',
+    '토큰', '에러', '메인', '페이지', '리다이렉트',
+)
+
+# Keywords matched against the action as written
+CASE_SENSITIVE_KEYWORDS = ('JWT',)
+
+_QUOTED = re.compile(r'"([^"]+)"')
+
+
+@lru_cache(maxsize=8192)
+def analyze_action(action: str) -> Tuple[FrozenSet[str], Optional[str]]:
+    """Keywords in an action and its first double-quoted text.
+    
+    Memoized: the same action text recurs across the paths of a diagram and
+    across diagrams, so most steps are answered from the cache.
+    """
+    lowered = action.lower()
+    keywords = frozenset(
+        [keyword for keyword in ACTION_KEYWORDS if keyword in lowered]
+        + [keyword for keyword in CASE_SENSITIVE_KEYWORDS if keyword in action]
+    )
+    match = _QUOTED.search(action) if '"' in action else None
+    return keywords, match.group(1) if match else None
+
+
+class RequestSpec:
+    """HTTP request of an API call step."""
+    
+    __slots__ = ('method', 'method_lower', 'endpoint', 'payload')
+    
+    def __init__(self, method: str = 'GET', endpoint: str = '/', payload: Any = None):
+        self.method = method
+        self.method_lower = method.lower()
+        self.endpoint = endpoint
+        self.payload = payload
+    
+    def __repr__(self) -> str:
+        return f"RequestSpec({self.method} {self.endpoint})"
+
+
+class LoweredStep:
+    """A test step with the facts generators need worked out once.
+    
+    Attributes:
+        step: The original step
+        index: 1-based position in the scenario
+        kind: ``StepType`` value, a cheap key for dispatching on the step type
+        keywords: ``ACTION_KEYWORDS``/``CASE_SENSITIVE_KEYWORDS`` found in the action
+        quoted: First double-quoted text in the action (a selector or label), if any
+        request: Request of an API call step, None for other steps
+        call_index: 1-based count of API calls up to this one; 0 for other steps
+            and for API calls lowered outside of a scenario
+    """
+    
+    __slots__ = ('step', 'index', 'step_type', 'kind', 'action', 'description', 'data', 'expected',
+                 'keywords', 'quoted', 'request', 'call_index')
+    
+    def __init__(self, step: TestStep, index: int = 1, call_index: int = 0):
+        self.step = step
+        self.index = index
+        self.step_type = step_type = step.step_type
+        self.kind = step_type.value
+        self.action = step.action
+        self.description = step.description
+        self.data = step.data
+        self.expected = step.expected
+        
+        self.keywords, self.quoted = analyze_action(step.action)
+        
+        if step_type is StepType.API_CALL:
+            data = self.data
+            self.request: Optional[RequestSpec] = RequestSpec(
+                data.get('method', 'GET'), data.get('endpoint', '/'), data.get('payload'))
+            self.call_index = call_index
+        else:
+            self.request = None
+            self.call_index = 0
+    
+    def has(self, *keywords: str) -> bool:
+        """Whether the action contains all of the given keywords."""
+        return self.keywords.issuperset(keywords)
+    
+    def has_any(self, *keywords: str) -> bool:
+        """Whether the action contains any of the given keywords."""
+        return not self.keywords.isdisjoint(keywords)
+    
+    def __repr__(self) -> str:
+        return f"LoweredStep({self.index}, {self.step_type.value}, {self.action!r})"
+
+
+class LoweredScenario:
+    """A scenario lowered for code generation; one can feed every generator."""
+    
+    __slots__ = ('scenario', 'name', 'description', 'steps', 'api_calls')
+    
+    def __init__(self, scenario: TestScenario, steps: List[LoweredStep], name: Optional[str] = None):
+        self.scenario = scenario
+        self.name = name or scenario.name
+        self.description = scenario.description
+        self.steps = steps
+        self.api_calls = sum(1 for step in steps if step.request is not None)
+    
+    def renamed(self, name: str) -> 'LoweredScenario':
+        """The same lowered scenario generated under another test name."""
+        return LoweredScenario(self.scenario, self.steps, name)
+    
+    def __repr__(self) -> str:
+        return f"LoweredScenario({self.name!r}, {len(self.steps)} steps)"
+
+
+def lower_step(step: TestStep, index: int = 1, call_index: int = 0) -> LoweredStep:
+    """Lower a single step outside of a scenario."""
+    return LoweredStep(step, index, call_index)
+
+
+def lower_scenario(scenario: TestScenario) -> LoweredScenario:
+    """Analyze a scenario once for all generators.
+    
+    Args:
+        scenario: The scenario to lower
+    
+    Returns:
+        Lowered scenario with one ``LoweredStep`` per step, in order
+    """
+    api_call = StepType.API_CALL
+    steps: List[LoweredStep] = []
+    calls = 0
+    for index, step in enumerate(scenario.steps, 1):
+        if step.step_type is api_call:
+            calls += 1
+        steps.append(LoweredStep(step, index, calls))
+    return LoweredScenario(scenario, steps)
+
+
+def unique_names(scenarios: List[LoweredScenario]) -> List[LoweredScenario]:
+    """Rename scenarios whose name is already taken, so tests sharing a module don't shadow each other.
+    
+    Repeats get ``_2``, ``_3``, ... appended, skipping names used elsewhere
+    in the list; the first occurrence keeps its name.
+    
+    Args:
+        scenarios: Lowered scenarios going into one module
+    
+    Returns:
+        The scenarios in order, repeats replaced by renamed copies
+    """
+    names = {lowered.name for lowered in scenarios}
+    taken = set()
+    unique = []
+    for lowered in scenarios:
+        name = lowered.name
+        if name in taken:
+            suffix = 2
+            while f"{name}_{suffix}" in names or f"{name}_{suffix}" in taken:
+                suffix += 1
+            lowered = lowered.renamed(f"{name}_{suffix}")
+        taken.add(lowered.name)
+        unique.append(lowered)
+    return unique
+
+
+# Endpoint words of calls that set up auth state (cookies, tokens) later calls rely on
+AUTH_ENDPOINT_WORDS = ('login', 'logout', 'signin', 'signup', 'register', 'auth', 'token', 'session')
+
+# Words in an action or payload that say a step carries or uses a credential
+CREDENTIAL_WORDS = ('token', 'jwt', 'cookie', 'session', '토큰', '쿠키', '세션')
+
+# Path parameters (/users/{id}, /users/:id, /users/<id>): a value taken from an earlier response
+_PATH_PARAM = re.compile(r'\{[^/}]+\}|/:[^/]+|<[^/>]+>')
+
+# Path segments that name one item of a collection
+_ITEM_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{16,}|\{[^}]*\}|:.+|<[^>]*>)$')
+
+# Steps that only describe a response or add a note; they don't order the calls around them
+_PASSIVE_KINDS = frozenset({StepType.ASSERTION.value, StepType.NOTE.value})
+
+
+def _resource(endpoint: str) -> Tuple[str, ...]:
+    """Collection path of an endpoint: its segments without the query and trailing item IDs."""
+    segments = [segment for segment in endpoint.split('?', 1)[0].split('/') if segment]
+    while segments and _ITEM_SEGMENT.match(segments[-1]):
+        segments.pop()
+    return tuple(segments)
+
+
+def _mentions_credentials(text: Any) -> bool:
+    lowered = str(text).lower()
+    return any(word in lowered for word in CREDENTIAL_WORDS)
+
+
+def uses_earlier_data(step: LoweredStep) -> bool:
+    """Whether an API call needs something an earlier response produced (an ID or a credential)."""
+    request = step.request
+    return bool(_PATH_PARAM.search(request.endpoint)
+                or _mentions_credentials(step.action)
+                or (request.payload is not None and _mentions_credentials(request.payload)))
+
+
+def depends_on(later: LoweredStep, earlier: LoweredStep) -> bool:
+    """Whether an API call has to wait for an earlier one.
+    
+    It does when the earlier call sets up auth state, when it needs data
+    from an earlier response, or when both touch the same resource and
+    either of them writes to it. Calls that only read, or that write to
+    unrelated resources, are independent.
+    """
+    first, second = earlier.request, later.request
+    if any(word in first.endpoint.lower() for word in AUTH_ENDPOINT_WORDS):
+        return True
+    if uses_earlier_data(later):
+        return True
+    if first.method_lower == 'get' and second.method_lower == 'get':
+        return False
+    resource, other = _resource(first.endpoint), _resource(second.endpoint)
+    common = min(len(resource), len(other))
+    return resource[:common] == other[:common]
+
+
+def plan_call_batches(steps: List[LoweredStep]) -> List[List[LoweredStep]]:
+    """Split a scenario's steps into runs whose API calls can be made concurrently.
+    
+    Each run holds consecutive steps, and the runs keep the scenario's
+    order. A run's API calls don't depend on each other (see
+    ``depends_on``); a call that depends on one in the run starts a new run.
+    Assertions and notes between calls stay in the run, to be checked once
+    its calls are done, unless they mention a credential. Every other step
+    (user actions, navigation, waits) is ordered by the diagram and gets a
+    run of its own.
+    
+    Args:
+        steps: Lowered steps of a scenario, in order
+    
+    Returns:
+        The runs, in order; together they hold every step once
+    """
+    runs: List[List[LoweredStep]] = []
+    run: List[LoweredStep] = []
+    calls: List[LoweredStep] = []
+    
+    for step in steps:
+        if step.request is not None:
+            if any(depends_on(step, earlier) for earlier in calls):
+                runs.append(run)
+                run, calls = [], []
+            run.append(step)
+            calls.append(step)
+        elif calls and step.kind in _PASSIVE_KINDS and not _mentions_credentials(step.action):
+            run.append(step)
+        else:
+            if run:
+                runs.append(run)
+            runs.append([step])
+            run, calls = [], []
+    
+    if run:
+        runs.append(run)
+    return runs
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .base import GeneratedTest
+from ..parsers.base import TestScenario
+
+
+MANIFEST_NAME = ".bai-autotest.lock"
+
+# Bump when the manifest layout changes; other versions are ignored, not migrated
+MANIFEST_VERSION = 1
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of text as UTF-8."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def json_hash(value: Any) -> str:
+    """SHA-256 of a value's canonical JSON form (sorted keys; non-JSON values as ``str``)."""
+    return content_hash(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def scenario_hash(scenario: TestScenario) -> str:
+    """Hash of everything about a scenario that generated code can depend on."""
+    return json_hash(scenario.to_dict())
+
+
+class _HashingWriter:
+    """Text sink that hashes what passes through to the file."""
+    
+    __slots__ = ('file', 'digest')
+    
+    def __init__(self, file):
+        self.file = file
+        self.digest = hashlib.sha256()
+    
+    def write(self, text: str) -> int:
+        self.digest.update(text.encode('utf-8'))
+        return self.file.write(text)
+
+
+class BuildManifest:
+    """Content-hash record of the tests generated into an output directory.
+    
+    Stored as ``.bai-autotest.lock`` in that directory. For each source file
+    it records the file hash, a fingerprint of the parser and generators and
+    the outputs produced; for each output, the hash of the scenario and
+    generator it came from and the hash (plus size and mtime) of the file
+    written. That lets ``generate``:
+    
+    - skip a source entirely when neither it nor the toolchain changed and
+      its outputs are intact on disk,
+    - skip rendering a test whose scenario and generator are unchanged,
+    - skip writing a test whose content is identical to the file on disk,
+      leaving its mtime alone for downstream caches.
+    
+    Every write goes to a temporary file that then replaces the target.
+    Methods may be called from several threads.
+    """
+    
+    def __init__(self, root: Path, data: Optional[Dict[str, Any]] = None):
+        self.root = Path(root)
+        data = data or {}
+        self.sources: Dict[str, Dict[str, Any]] = data.get('sources', {})
+        self.outputs: Dict[str, Dict[str, Any]] = data.get('outputs', {})
+        self.skipped = 0
+        self.unchanged = 0
+        self.written = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def path(self) -> Path:
+        return self.root / MANIFEST_NAME
+    
+    @classmethod
+    def load(cls, root: Path) -> 'BuildManifest':
+        """Read the manifest of an output directory; missing or unreadable ones start empty."""
+        manifest_path = Path(root) / MANIFEST_NAME
+        try:
+            data = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return cls(root)
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            return cls(root)
+        return cls(root, data)
+    
+    def save(self) -> None:
+        """Write the manifest atomically, dropping outputs no source claims anymore."""
+        with self._lock:
+            claimed = {key for source in self.sources.values() for key in source['outputs']}
+            self.outputs = {key: entry for key, entry in self.outputs.items() if key in claimed}
+            text = json.dumps({'version': MANIFEST_VERSION, 'sources': self.sources, 'outputs': self.outputs},
+                              sort_keys=True, indent=2, ensure_ascii=False) + "\n"
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        temp.write_text(text, encoding='utf-8')
+        os.replace(temp, self.path)
+    
+    def key(self, file_path: Path) -> str:
+        """Manifest key of a path: relative to the output directory, with forward slashes."""
+        return Path(os.path.relpath(file_path, self.root)).as_posix()
+    
+    def source_unchanged(self, source: Path, source_hash: str, fingerprint: str) -> bool:
+        """Whether a source was generated from the same content and toolchain, with its outputs intact."""
+        entry = self.sources.get(self.key(source))
+        if entry is None or entry['hash'] != source_hash or entry['fingerprint'] != fingerprint:
+            return False
+        return all(self._intact(key) for key in entry['outputs'])
+    
+    def record_source(self, source: Path, source_hash: str, fingerprint: str, outputs: Iterable[Path]) -> None:
+        """Remember what a source produced, replacing its previous record."""
+        with self._lock:
+            self.sources[self.key(source)] = {
+                'hash': source_hash,
+                'fingerprint': fingerprint,
+                'outputs': sorted({self.key(file_path) for file_path in outputs}),
+            }
+    
+    def is_fresh(self, file_path: Path, inputs: str) -> bool:
+        """Whether a test file was generated from the same inputs and is intact on disk."""
+        key = self.key(file_path)
+        entry = self.outputs.get(key)
+        return entry is not None and entry['inputs'] == inputs and self._intact(key)
+    
+    def write(self, test: GeneratedTest, file_path: Path, inputs: str) -> bool:
+        """Write a test unless the file already holds the same content.
+        
+        Args:
+            test: The test to write
+            file_path: Where to write it
+            inputs: Hash of what the test was generated from (see ``inputs_hash``)
+        
+        Returns:
+            Whether the file was (re)written
+        """
+        key = self.key(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                sink = _HashingWriter(f)
+                test.write_to(sink)
+            digest = sink.digest.hexdigest()
+            
+            written = digest != self._disk_hash(key, file_path)
+            if written:
+                os.replace(temp, file_path)
+            else:
+                temp.unlink()
+        except BaseException:
+            if temp.exists():
+                temp.unlink()
+            raise
+        
+        st = file_path.stat()
+        with self._lock:
+            self.outputs[key] = {'inputs': inputs, 'hash': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+            if written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+        return written
+    
+    def skip(self, count: int = 1) -> None:
+        """Count tests left alone because they were fresh."""
+        with self._lock:
+            self.skipped += count
+    
+    def _disk_hash(self, key: str, file_path: Path) -> Optional[str]:
+        """Hash of the file's current content, None if there is no file."""
+        if self._intact(key):
+            return self.outputs[key]['hash']
+        try:
+            return content_hash(file_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+    
+    def _intact(self, key: str) -> bool:
+        """Whether an output is on disk exactly as recorded (by size and mtime)."""
+        entry = self.outputs.get(key)
+        if entry is None:
+            return False
+        try:
+            st = (self.root / key).stat()
+        except OSError:
+            return False
+        return st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']
+
+
+def inputs_hash(scenario_digest: str, fingerprint: str) -> str:
+    """Combine a scenario hash and a generator fingerprint into one output key."""
+    return content_hash(f"{scenario_digest}\0{fingerprint}")
@@ -1,33 +1,57 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Optional
 import json
 
-from .base import TestGenerator, GeneratedTest
+from .base import TestGenerator, GeneratedTest, StreamedTest
+from .lowering import LoweredScenario, LoweredStep, lower_scenario, lower_step, unique_names
 from ..parsers.base import TestScenario, TestStep, StepType
 
 
 class PlaywrightGenerator(TestGenerator):
     """Generate Playwright tests from test scenarios."""
     
+    # Selectors for common elements named in an action, first match wins
+    DEFAULT_SELECTORS = (
+        ('login', 'button:has-text("Login")'),
+        ('submit', 'button[type="submit"]'),
+        ('email', 'input[type="email"]'),
+        ('password', 'input[type="password"]'),
+    )
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
         self.browser = config.get('browser', 'chromium') if config else 'chromium'
         self.base_url = config.get('base_url', 'http://localhost:3000') if config else 'http://localhost:3000'
         self.headless = config.get('headless', True) if config else True
+        # Step code emitters by step kind (StepType value)
+        self._emitters = {
+            StepType.USER_ACTION.value: self._generate_user_action,
+            StepType.API_CALL.value: self._generate_api_call,
+            StepType.ASSERTION.value: self._generate_assertion,
+            StepType.NAVIGATION.value: self._generate_navigation,
+            StepType.WAIT.value: self._generate_wait,
+        }
     
     def generate(self, scenario: TestScenario) -> GeneratedTest:
         """Generate Playwright test from scenario."""
+        return self.stream(scenario).materialize()
+    
+    def stream(self, scenario: TestScenario) -> StreamedTest:
+        """Describe the Playwright test for a scenario; its code is emitted line by line on demand."""
+        return self.stream_lowered(lower_scenario(scenario))
+    
+    def stream_lowered(self, lowered: LoweredScenario) -> StreamedTest:
+        """Describe the Playwright test for a lowered scenario."""
+        scenario = lowered.scenario
+        
         # Generate imports
         imports = self._generate_imports()
         
-        # Generate test function
-        test_code = self._generate_test_function(scenario)
-        
         # Generate setup/teardown if needed
         setup_code = self._generate_setup(scenario)
         
-        return GeneratedTest(
+        return StreamedTest(
             name=f"test_{scenario.name}",
-            code=test_code,
+            code_lines=lambda: self._iter_test_function(lowered),
             language="python",
             framework="playwright",
             imports=imports,
@@ -39,20 +63,34 @@ class PlaywrightGenerator(TestGenerator):
             }
         )
     
+    def stream_bundle(self, name: str, scenarios: List[LoweredScenario]) -> StreamedTest:
+        """Describe one Playwright module with a test function per lowered scenario, sharing its fixtures."""
+        scenarios = unique_names(scenarios)
+        return StreamedTest(
+            name=f"test_{name}.py",
+            code_lines=lambda: self._iter_bundle(scenarios),
+            language="python",
+            framework="playwright",
+            imports=self._generate_imports(),
+            setup_code=self._generate_setup(),
+            metadata={
+                'bundle': name,
+                'scenario_names': [lowered.name for lowered in scenarios],
+                'browser': self.browser,
+                'base_url': self.base_url
+            }
+        )
+    
     def generate_step(self, step: TestStep) -> str:
         """Generate Playwright code for a step."""
-        if step.step_type == StepType.USER_ACTION:
-            return self._generate_user_action(step)
-        elif step.step_type == StepType.API_CALL:
-            return self._generate_api_call(step)
-        elif step.step_type == StepType.ASSERTION:
-            return self._generate_assertion(step)
-        elif step.step_type == StepType.NAVIGATION:
-            return self._generate_navigation(step)
-        elif step.step_type == StepType.WAIT:
-            return self._generate_wait(step)
-        else:
+        return self._emit_step(lower_step(step))
+    
+    def _emit_step(self, step: LoweredStep) -> str:
+        """Generate Playwright code for a lowered step."""
+        emit = self._emitters.get(step.kind)
+        if emit is None:
             return f"    # {step.description}"
+        return emit(step)
     
     def _generate_imports(self) -> List[str]:
         """Generate import statements."""
@@ -63,28 +101,34 @@ class PlaywrightGenerator(TestGenerator):
             "from typing import Dict, Any"
         ]
     
-    def _generate_test_function(self, scenario: TestScenario) -> str:
-        """Generate the main test function."""
-        lines = [
-            f"def test_{scenario.name}(page: Page):",
-            f'    """Test: {scenario.description}"""',
+    def _iter_bundle(self, scenarios: List[LoweredScenario]) -> Iterator[str]:
+        """Generate the test functions of a bundle, two blank lines apart."""
+        for number, lowered in enumerate(scenarios):
+            if number:
+                # Each function already ends with a blank line
+                yield ""
+            yield from self._iter_test_function(lowered)
+    
+    def _iter_test_function(self, lowered: LoweredScenario) -> Iterator[str]:
+        """Generate the main test function, one line at a time."""
+        yield from [
+            f"def test_{lowered.name}(page: Page):",
+            f'    """Test: {lowered.description}"""',
             f"    # Navigate to base URL",
             f"    page.goto('{self.base_url}')",
             ""
         ]
         
         # Generate code for each step
-        for i, step in enumerate(scenario.steps):
-            lines.append(f"    # Step {i+1}: {step.description}")
-            step_code = self.generate_step(step)
+        for step in lowered.steps:
+            yield f"    # Step {step.index}: {step.description}"
+            step_code = self._emit_step(step)
             if step_code:
-                lines.append(step_code)
-            lines.append("")
-        
-        return "\n".join(lines)
+                yield step_code
+            yield ""
     
-    def _generate_setup(self, scenario: TestScenario) -> str:
-        """Generate setup code if needed."""
+    def _generate_setup(self, scenario: Optional[TestScenario] = None) -> str:
+        """Generate setup code if needed (the same for every scenario, so a module needs it once)."""
         return f"""@pytest.fixture(scope="function")
 def browser_context_args(browser_context_args):
     return {{
@@ -93,81 +137,66 @@ def browser_context_args(browser_context_args):
         "ignore_https_errors": True,
     }}"""
     
-    def _generate_user_action(self, step: TestStep) -> str:
+    def _generate_user_action(self, step: LoweredStep) -> str:
         """Generate code for user actions."""
-        action = step.action.lower()
-        
-        if 'click' in action:
-            # Extract selector from action
-            selector = self._extract_selector(step.action)
+        if step.has('click'):
+            selector = self._selector(step)
             return f"    page.click('{selector}')"
         
-        elif 'type' in action or 'enter' in action:
-            selector = self._extract_selector(step.action)
+        elif step.has_any('type', 'enter'):
+            selector = self._selector(step)
             text = step.data.get('text', '')
             return f"    page.fill('{selector}', '{text}')"
         
-        elif 'select' in action:
-            selector = self._extract_selector(step.action)
+        elif step.has('select'):
+            selector = self._selector(step)
             value = step.data.get('value', '')
             return f"    page.select_option('{selector}', '{value}')"
         
         else:
             return f"    # TODO: Implement {step.action}"
     
-    def _generate_api_call(self, step: TestStep) -> str:
+    def _generate_api_call(self, step: LoweredStep) -> str:
         """Generate code for API calls."""
-        method = step.data.get('method', 'GET')
-        endpoint = step.data.get('endpoint', '/')
+        request = step.request
         
         lines = [
-            f"    # API Call: {method} {endpoint}",
-            f"    response = page.request.{method.lower()}('{endpoint}'"  
+            f"    # API Call: {request.method} {request.endpoint}",
+            f"    response = page.request.{request.method_lower}('{request.endpoint}'"
         ]
         
-        if step.data.get('payload'):
-            lines[1] += f", data={step.data['payload']}"
+        if request.payload:
+            lines[1] += f", data={request.payload}"
         
         lines[1] += ")"
         lines.append("    assert response.ok")
         
         return "\n".join(lines)
     
-    def _generate_assertion(self, step: TestStep) -> str:
+    def _generate_assertion(self, step: LoweredStep) -> str:
         """Generate assertion code."""
         if step.expected:
             return f"    expect(page).to_have_title('{step.expected}')"
         else:
             return f"    # Assertion: {step.description}"
     
-    def _generate_navigation(self, step: TestStep) -> str:
+    def _generate_navigation(self, step: LoweredStep) -> str:
         """Generate navigation code."""
         url = step.data.get('url', '/')
         return f"    page.goto('{url}')"
     
-    def _generate_wait(self, step: TestStep) -> str:
+    def _generate_wait(self, step: LoweredStep) -> str:
         """Generate wait code."""
         timeout = step.data.get('timeout', 1000)
         return f"    page.wait_for_timeout({timeout})"
     
-    def _extract_selector(self, action: str) -> str:
-        """Extract selector from action description."""
-        # Simple extraction logic - can be enhanced
-        if '"' in action:
-            import re
-            match = re.search(r'"([^"]+)"', action)
-            if match:
-                return match.group(1)
+    def _selector(self, step: LoweredStep) -> str:
+        """Selector quoted in the action, or a default for the element it names."""
+        if step.quoted:
+            return step.quoted
         
-        # Default selectors for common elements
-        action_lower = action.lower()
-        if 'login' in action_lower:
-            return 'button:has-text("Login")'
-        elif 'submit' in action_lower:
-            return 'button[type="submit"]'
-        elif 'email' in action_lower:
-            return 'input[type="email"]'
-        elif 'password' in action_lower:
-            return 'input[type="password"]'
+        for keyword, selector in self.DEFAULT_SELECTORS:
+            if keyword in step.keywords:
+                return selector
         
-        return 'body'  # Fallback
\ No newline at end of file
+        return 'body'  # Fallback
@@ -1,32 +1,64 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Optional
 import json
 
-from .base import TestGenerator, GeneratedTest
+from .base import TestGenerator, GeneratedTest, StreamedTest
+from .lowering import LoweredScenario, LoweredStep, lower_scenario, lower_step, plan_call_batches, unique_names
 from ..parsers.base import TestScenario, TestStep, StepType
 
 
 class PytestGenerator(TestGenerator):
-    """Generate Pytest tests from test scenarios."""
+    """Generate Pytest tests from test scenarios.
+    
+    With ``pooled_client`` the ``client`` fixture hands every test the same
+    session-scoped, connection-pooled HTTP client (``pool_size``
+    connections; ``max_retries`` retries of idempotent requests in the sync
+    variant), so a module's tests reuse TCP/TLS connections. Cookies and
+    headers are reset around each test. Session scope is per process, so
+    each pytest-xdist worker gets its own pool.
+    
+    With ``use_async`` and a ``max_concurrency`` above 1, API calls that
+    don't depend on each other (see ``lowering.plan_call_batches``) are
+    awaited together with ``asyncio.gather``, at most ``max_concurrency``
+    at a time. Assertions and notes between those calls are checked once
+    all of them are done, so they move after the later calls of their run.
+    """
     
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
         self.base_url = config.get('base_url', 'http://localhost:8000') if config else 'http://localhost:8000'
         self.use_async = config.get('use_async', False) if config else False
+        self.pooled_client = config.get('pooled_client', False) if config else False
+        self.pool_size = config.get('pool_size', 10) if config else 10
+        self.max_retries = config.get('max_retries', 3) if config else 3
+        self.max_concurrency = config.get('max_concurrency', 1) if config else 1
+        # Step code emitters by step kind (StepType value)
+        self._emitters = {
+            StepType.API_CALL.value: self._generate_api_call,
+            StepType.ASSERTION.value: self._generate_assertion,
+            StepType.USER_ACTION.value: self._generate_user_action,
+        }
     
     def generate(self, scenario: TestScenario) -> GeneratedTest:
         """Generate Pytest test from scenario."""
+        return self.stream(scenario).materialize()
+    
+    def stream(self, scenario: TestScenario) -> StreamedTest:
+        """Describe the Pytest test for a scenario; its code is emitted line by line on demand."""
+        return self.stream_lowered(lower_scenario(scenario))
+    
+    def stream_lowered(self, lowered: LoweredScenario) -> StreamedTest:
+        """Describe the Pytest test for a lowered scenario."""
+        scenario = lowered.scenario
+        
         # Generate imports
         imports = self._generate_imports()
         
-        # Generate test function
-        test_code = self._generate_test_function(scenario)
-        
         # Generate fixtures if needed
         setup_code = self._generate_fixtures(scenario)
         
-        return GeneratedTest(
+        return StreamedTest(
             name=f"test_{scenario.name}",
-            code=test_code,
+            code_lines=lambda: self._iter_test_function(lowered),
             language="python",
             framework="pytest",
             imports=imports,
@@ -38,16 +70,34 @@ class PytestGenerator(TestGenerator):
             }
         )
     
+    def stream_bundle(self, name: str, scenarios: List[LoweredScenario]) -> StreamedTest:
+        """Describe one Pytest module with a test function per lowered scenario, sharing its fixtures."""
+        scenarios = unique_names(scenarios)
+        return StreamedTest(
+            name=f"test_{name}.py",
+            code_lines=lambda: self._iter_bundle(scenarios),
+            language="python",
+            framework="pytest",
+            imports=self._generate_imports(),
+            setup_code=self._generate_fixtures(),
+            metadata={
+                'bundle': name,
+                'scenario_names': [lowered.name for lowered in scenarios],
+                'base_url': self.base_url,
+                'use_async': self.use_async
+            }
+        )
+    
     def generate_step(self, step: TestStep) -> str:
         """Generate Pytest code for a step."""
-        if step.step_type == StepType.API_CALL:
-            return self._generate_api_call(step)
-        elif step.step_type == StepType.ASSERTION:
-            return self._generate_assertion(step)
-        elif step.step_type == StepType.USER_ACTION:
-            return f"    # User action: {step.action}"
-        else:
+        return self._emit_step(lower_step(step))
+    
+    def _emit_step(self, step: LoweredStep) -> str:
+        """Generate Pytest code for a lowered step."""
+        emit = self._emitters.get(step.kind)
+        if emit is None:
             return f"    # {step.description}"
+        return emit(step)
     
     def _generate_imports(self) -> List[str]:
         """Generate import statements."""
@@ -63,44 +113,93 @@ class PytestGenerator(TestGenerator):
                 "import asyncio",
                 "import aiohttp"
             ])
+            if self.pooled_client or self._concurrent_calls():
+                imports.append("import pytest_asyncio")
+        elif self.pooled_client:
+            imports.extend([
+                "from requests.adapters import HTTPAdapter",
+                "from urllib3.util.retry import Retry"
+            ])
         
         return imports
     
-    def _generate_test_function(self, scenario: TestScenario) -> str:
-        """Generate the main test function."""
+    def _iter_bundle(self, scenarios: List[LoweredScenario]) -> Iterator[str]:
+        """Generate the test functions of a bundle, two blank lines apart."""
+        for number, lowered in enumerate(scenarios):
+            if number:
+                # Each function already ends with a blank line
+                yield ""
+            yield from self._iter_test_function(lowered)
+    
+    def _iter_test_function(self, lowered: LoweredScenario) -> Iterator[str]:
+        """Generate the main test function, one line at a time."""
         async_prefix = "async " if self.use_async else ""
         await_prefix = "await " if self.use_async else ""
         
-        lines = [
-            f"{async_prefix}def test_{scenario.name}(client):",
-            f'    """Test: {scenario.description}"""',
+        yield from [
+            f"{async_prefix}def test_{lowered.name}(client, base_url):",
+            f'    """Test: {lowered.description}"""',
             ""
         ]
         
-        # Track response variables
-        response_count = 0
-        
-        # Generate code for each step
-        for i, step in enumerate(scenario.steps):
-            lines.append(f"    # Step {i+1}: {step.description}")
-            
-            if step.step_type == StepType.API_CALL:
-                response_count += 1
-                step.data['response_var'] = f"response_{response_count}"
-            
-            step_code = self.generate_step(step)
+        if self._concurrent_calls():
+            for run in plan_call_batches(lowered.steps):
+                if sum(1 for step in run if step.request is not None) > 1:
+                    yield from self._iter_concurrent_calls(run)
+                else:
+                    yield from self._iter_steps(run)
+        else:
+            yield from self._iter_steps(lowered.steps)
+    
+    def _iter_steps(self, steps: List[LoweredStep]) -> Iterator[str]:
+        """Generate code for each step, in order."""
+        for step in steps:
+            yield f"    # Step {step.index}: {step.description}"
+            step_code = self._emit_step(step)
             if step_code:
-                lines.append(step_code)
-            lines.append("")
+                yield step_code
+            yield ""
+    
+    def _iter_concurrent_calls(self, run: List[LoweredStep]) -> Iterator[str]:
+        """Generate a run of independent API calls awaited together, then the run's other steps."""
+        calls = [step for step in run if step.request is not None]
+        numbers = ", ".join(str(step.index) for step in calls)
+        yield f"    # Steps {numbers}: independent API calls, run concurrently"
+        moved = [step for step in run if step.request is None and step.index < calls[-1].index]
+        if moved:
+            numbers = ", ".join(str(step.index) for step in moved)
+            yield f"    # Steps {numbers} come between these calls and are checked once all of them are done"
         
-        return "\n".join(lines)
+        for step in calls:
+            request = step.request
+            yield f"    async def call_{step.call_index}():"
+            yield f"        # Step {step.index}: {step.description}"
+            yield self._generate_async_api_call(request.method_lower, request.endpoint, f"response_{step.call_index}",
+                                                step.data, indent="        ", result="return ")
+            yield ""
+        
+        results = ", ".join(f"data_{step.call_index}" for step in calls)
+        awaitables = ", ".join(f"call_{step.call_index}()" for step in calls)
+        yield f"    {results} = await gather_limited({awaitables})"
+        yield ""
+        
+        yield from self._iter_steps([step for step in run if step.request is None])
     
-    def _generate_fixtures(self, scenario: TestScenario) -> str:
-        """Generate pytest fixtures."""
-        if self.use_async:
-            return self._generate_async_fixtures()
+    def _concurrent_calls(self) -> bool:
+        return self.use_async and self.max_concurrency > 1
+    
+    def _generate_fixtures(self, scenario: Optional[TestScenario] = None) -> str:
+        """Generate pytest fixtures (the same for every scenario, so a module needs them once)."""
+        if self.pooled_client:
+            fixtures = self._generate_async_pooled_fixtures() if self.use_async else self._generate_sync_pooled_fixtures()
+        elif self.use_async:
+            fixtures = self._generate_async_fixtures()
         else:
-            return self._generate_sync_fixtures()
+            fixtures = self._generate_sync_fixtures()
+        
+        if self._concurrent_calls():
+            fixtures += "\n\n" + self._generate_gather_helper()
+        return fixtures
     
     def _generate_sync_fixtures(self) -> str:
         """Generate synchronous fixtures."""
@@ -122,8 +221,16 @@ def base_url():
 """
     
     def _generate_async_fixtures(self) -> str:
-        """Generate asynchronous fixtures."""
-        return f"""@pytest.fixture
+        """Generate asynchronous fixtures.
+        
+        With concurrent calls the module is marked for pytest-asyncio, which
+        then runs the async tests and the async ``client`` fixture.
+        """
+        if self._concurrent_calls():
+            header = "pytestmark = pytest.mark.asyncio\n\n\n@pytest_asyncio.fixture"
+        else:
+            header = "@pytest.fixture"
+        return f"""{header}
 async def client():
     '''Async HTTP client for API testing.'''
     async with aiohttp.ClientSession() as session:
@@ -140,16 +247,97 @@ def base_url():
     return "{self.base_url}"
 """
     
-    def _generate_api_call(self, step: TestStep) -> str:
+    def _generate_sync_pooled_fixtures(self) -> str:
+        """Generate a session-scoped pooled requests client with per-test cookies and headers."""
+        return f"""@pytest.fixture(scope="session")
+def http_session():
+    '''Connection-pooled HTTP session shared by the tests of this process (one per xdist worker).'''
+    session = requests.Session()
+    retries = Retry(total={self.max_retries}, backoff_factor=0.1, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections={self.pool_size}, pool_maxsize={self.pool_size}, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({{
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    }})
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(http_session):
+    '''HTTP client for API testing: the pooled session, with cookies and headers reset after the test.'''
+    headers = http_session.headers.copy()
+    http_session.cookies.clear()
+    yield http_session
+    http_session.cookies.clear()
+    http_session.headers.clear()
+    http_session.headers.update(headers)
+
+
+@pytest.fixture
+def base_url():
+    '''Base URL for API endpoints.'''
+    return "{self.base_url}"
+"""
+    
+    def _generate_async_pooled_fixtures(self) -> str:
+        """Generate a session-scoped aiohttp connector shared by per-test client sessions."""
+        return f"""pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def http_connector():
+    '''Connection pool shared by the tests of this process (one per xdist worker).'''
+    connector = aiohttp.TCPConnector(limit={self.pool_size}, keepalive_timeout=30)
+    yield connector
+    await connector.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def client(http_connector):
+    '''Async HTTP client for API testing: its own cookies and headers over the shared pool.'''
+    async with aiohttp.ClientSession(connector=http_connector, connector_owner=False) as session:
+        session.headers.update({{
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }})
+        yield session
+
+
+@pytest.fixture
+def base_url():
+    '''Base URL for API endpoints.'''
+    return "{self.base_url}"
+"""
+    
+    def _generate_gather_helper(self) -> str:
+        """Generate the helper that awaits independent calls with a concurrency limit."""
+        return f"""async def gather_limited(*calls, limit={self.max_concurrency}):
+    '''Await calls concurrently, at most `limit` at a time; results come back in order.'''
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def bounded(call):
+        async with semaphore:
+            return await call
+    
+    return await asyncio.gather(*(bounded(call) for call in calls))
+"""
+    
+    def _generate_api_call(self, step: LoweredStep) -> str:
         """Generate code for API calls."""
-        method = step.data.get('method', 'GET').lower()
-        endpoint = step.data.get('endpoint', '/')
-        response_var = step.data.get('response_var', 'response')
+        request = step.request
+        # Number responses in scenario order; a step lowered on its own keeps its given name
+        if step.call_index:
+            response_var = f"response_{step.call_index}"
+        else:
+            response_var = step.data.get('response_var', 'response')
         
         if self.use_async:
-            return self._generate_async_api_call(method, endpoint, response_var, step.data)
+            return self._generate_async_api_call(request.method_lower, request.endpoint, response_var, step.data)
         else:
-            return self._generate_sync_api_call(method, endpoint, response_var, step.data)
+            return self._generate_sync_api_call(request.method_lower, request.endpoint, response_var, step.data)
     
     def _generate_sync_api_call(self, method: str, endpoint: str, response_var: str, data: Dict) -> str:
         """Generate synchronous API call."""
@@ -163,20 +351,25 @@ def base_url():
         
         return "\n".join(lines)
     
-    def _generate_async_api_call(self, method: str, endpoint: str, response_var: str, data: Dict) -> str:
-        """Generate asynchronous API call."""
-        lines = [f"    async with client.{method}(f'{{base_url}}{endpoint}'"]
+    def _generate_async_api_call(self, method: str, endpoint: str, response_var: str, data: Dict,
+                                 indent: str = "    ", result: str = "data = ") -> str:
+        """Generate asynchronous API call; ``result`` is what receives the response JSON."""
+        lines = [f"{indent}async with client.{method}(f'{{base_url}}{endpoint}'"]
         
         if data.get('payload'):
             lines[0] += f", json={data['payload']}"
         
         lines[0] += f") as {response_var}:"
-        lines.append(f"        assert {response_var}.status == 200")
-        lines.append(f"        data = await {response_var}.json()")
+        lines.append(f"{indent}    assert {response_var}.status == 200")
+        lines.append(f"{indent}    {result}await {response_var}.json()")
         
         return "\n".join(lines)
     
-    def _generate_assertion(self, step: TestStep) -> str:
+    def _generate_user_action(self, step: LoweredStep) -> str:
+        """Generate code for user actions."""
+        return f"    # User action: {step.action}"
+    
+    def _generate_assertion(self, step: LoweredStep) -> str:
         """Generate assertion code."""
         if step.expected:
             return f"    assert result == {repr(step.expected)}"
@@ -0,0 +1,93 @@
+from string import Template
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+
+RenderFunction = Callable[[Mapping[str, Any]], str]
+
+
+def compile_template(template: str) -> RenderFunction:
+    """Compile a ``string.Template`` source into a reusable render function.
+    
+    The template is split once into literal text and placeholder slots, so
+    rendering only fills the slots and joins. ``render(mapping)`` returns
+    exactly what ``Template(template).safe_substitute(mapping)`` would:
+    ``$$`` becomes ``$``, placeholders missing from the mapping and stray
+    ``$`` signs are left as written, and values are converted with ``str``.
+    
+    Args:
+        template: Template text using ``$name`` / ``${name}`` placeholders
+    
+    Returns:
+        Function rendering the template with a mapping of values; its
+        ``names`` attribute holds the placeholder names it reads
+    """
+    parts: List[str] = []
+    # (index into parts, placeholder name, placeholder as written)
+    slots: List[Tuple[int, str, str]] = []
+    literal: List[str] = []
+    position = 0
+    
+    for match in Template.pattern.finditer(template):
+        literal.append(template[position:match.start()])
+        position = match.end()
+        name = match.group('named') or match.group('braced')
+        if name is None:
+            # "$$" escapes a dollar sign; an ill-formed "$" is kept as is
+            literal.append('$' if match.group('escaped') is not None else match.group())
+            continue
+        parts.append("".join(literal))
+        literal = []
+        slots.append((len(parts), name, match.group()))
+        parts.append(match.group())
+    literal.append(template[position:])
+    parts.append("".join(literal))
+    
+    if not slots:
+        text = parts[0]
+        
+        def render(mapping: Mapping[str, Any]) -> str:
+            return text
+    
+    elif len(slots) == 1:
+        (_, name, raw), = slots
+        head, tail = parts[0], parts[2]
+        
+        def render(mapping: Mapping[str, Any]) -> str:
+            return head + (str(mapping[name]) if name in mapping else raw) + tail
+    
+    else:
+        def render(mapping: Mapping[str, Any]) -> str:
+            out = parts[:]
+            for index, name, _ in slots:
+                if name in mapping:
+                    out[index] = str(mapping[name])
+            return "".join(out)
+    
+    render.names = frozenset(name for _, name, _ in slots)
+    return render
+
+
+class TemplateSet:
+    """Compiled forms of a generator's templates, built once per template text.
+    
+    Entries are keyed by the template text rather than the template name, so
+    a generator whose ``templates`` dict is edited after construction still
+    renders the current text.
+    """
+    
+    def __init__(self):
+        self._compiled: Dict[str, RenderFunction] = {}
+    
+    def get(self, template: str) -> RenderFunction:
+        """Render function of a template, compiling it on first use."""
+        render = self._compiled.get(template)
+        if render is None:
+            render = self._compiled[template] = compile_template(template)
+        return render
+    
+    def render(self, template: str, mapping: Mapping[str, Any]) -> str:
+        """Render a template, compiling it on first use."""
+        return self.get(template)(mapping)
+    
+    def __len__(self) -> int:
+        return len(self._compiled)
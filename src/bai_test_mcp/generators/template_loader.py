@@ -1,11 +1,162 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+import os
 import json
+import pickle
+import hashlib
+import threading
 import yaml
+from dataclasses import dataclass
 from pathlib import Path
 
+from ..parsers.cache import get_cache_dir
+
+
+# Bump when the on-disk compiled template layout changes
+_COMPILED_VERSION = 1
+
+
+@dataclass
+class TemplateCacheStats:
+    """Counters for a TemplateCache."""
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    disk_hits: int = 0
+    
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'reloads': self.reloads,
+            'disk_hits': self.disk_hits
+        }
+
+
+class TemplateCache:
+    """Process-wide cache of parsed template files, keyed by resolved path.
+    
+    An entry is reused while the file's mtime and size are unchanged and
+    reloaded otherwise. Parsed templates are also written to a compiled
+    (pickled) form in the cache directory, so a new process skips YAML
+    parsing for files it has seen before. Like ``ScenarioCache``, entries
+    are kept pickled so every load returns a fresh dict callers may change.
+    """
+    
+    DIR_NAME = "templates"
+    
+    def __init__(self, persistent: bool = True, cache_dir: Optional[Path] = None):
+        self.stats = TemplateCacheStats()
+        # resolved path -> (mtime_ns, size, pickled templates)
+        self._entries: Dict[str, Tuple[int, int, bytes]] = {}
+        self._lock = threading.Lock()
+        self._dir: Optional[Path] = None
+        if persistent:
+            base = cache_dir or get_cache_dir()
+            if base is not None:
+                self._dir = Path(base) / self.DIR_NAME
+    
+    def load(self, path: Path) -> Dict[str, Any]:
+        """Load a YAML or JSON template file through the cache.
+        
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is neither YAML nor JSON
+        """
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = str(resolved)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[:2] == signature:
+                self.stats.hits += 1
+                return pickle.loads(entry[2])
+            if entry is not None:
+                self.stats.reloads += 1
+            else:
+                self.stats.misses += 1
+        
+        payload = self._read_compiled(key, signature)
+        if payload is None:
+            payload = pickle.dumps(self._parse(resolved), protocol=pickle.HIGHEST_PROTOCOL)
+            self._write_compiled(key, signature, payload)
+        else:
+            with self._lock:
+                self.stats.disk_hits += 1
+        
+        with self._lock:
+            self._entries[key] = signature + (payload,)
+        return pickle.loads(payload)
+    
+    @staticmethod
+    def _parse(path: Path) -> Dict[str, Any]:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix in ['.yaml', '.yml']:
+                return yaml.safe_load(f)
+            elif path.suffix == '.json':
+                return json.load(f)
+        raise ValueError(f"Unsupported template format: {path.suffix}")
+    
+    def _compiled_path(self, key: str) -> Optional[Path]:
+        if self._dir is None:
+            return None
+        return self._dir / (hashlib.sha256(key.encode('utf-8')).hexdigest() + ".pickle")
+    
+    def _read_compiled(self, key: str, signature: Tuple[int, int]) -> Optional[bytes]:
+        """Pickled templates from the on-disk form, if it matches the file's signature."""
+        compiled = self._compiled_path(key)
+        if compiled is None:
+            return None
+        try:
+            with open(compiled, 'rb') as f:
+                version, path, mtime_ns, size, payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return None
+        if (version, path, mtime_ns, size) != (_COMPILED_VERSION, key) + signature:
+            return None
+        return payload
+    
+    def _write_compiled(self, key: str, signature: Tuple[int, int], payload: bytes) -> None:
+        compiled = self._compiled_path(key)
+        if compiled is None:
+            return
+        try:
+            compiled.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial file
+            temp = compiled.with_name(f"{compiled.name}.{os.getpid()}.tmp")
+            with open(temp, 'wb') as f:
+                pickle.dump((_COMPILED_VERSION, key) + signature + (payload,), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, compiled)
+        except OSError:
+            pass
+    
+    def clear(self) -> None:
+        """Forget every entry held in memory."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[TemplateCache] = None
+
+
+def get_template_cache() -> TemplateCache:
+    """Get the process-wide template cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TemplateCache()
+    return _default_cache
+
 
 class TemplateLoader:
-    """Load and manage test templates for various languages and frameworks."""
+    """Load and manage test templates for various languages and frameworks.
+    
+    Template files are parsed once per process (see ``TemplateCache``);
+    built-in templates are only read when first asked for.
+    """
     
     BUILTIN_TEMPLATES_DIR = Path(__file__).parent / "templates"
     
@@ -20,8 +171,7 @@ class TemplateLoader:
         template_path = cls.BUILTIN_TEMPLATES_DIR / template_name
         
         if template_path.exists():
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return get_template_cache().load(template_path)
         
         # Return default template if not found
         return cls._get_default_template()
@@ -34,14 +184,7 @@ class TemplateLoader:
         if not template_path.exists():
             raise FileNotFoundError(f"Template file not found: {path}")
         
-        if template_path.suffix in ['.yaml', '.yml']:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        elif template_path.suffix == '.json':
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            raise ValueError(f"Unsupported template format: {template_path.suffix}")
+        return get_template_cache().load(template_path)
     
     @classmethod
     def _get_default_template(cls) -> Dict[str, Any]:
@@ -58,6 +201,11 @@ class TemplateLoader:
             "note": "// Note: ${description}"
         }
     
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """Hit/miss counters of the process-wide template cache."""
+        return get_template_cache().stats.to_dict()
+    
     @classmethod
     def list_available_templates(cls) -> Dict[str, list]:
         """List all available built-in templates."""
@@ -9,23 +9,26 @@ import mcp.server.stdio
 import mcp.types as types
 
 from ..parsers import MermaidParser
-from ..generators import PlaywrightGenerator, PytestGenerator, CypressGenerator, JestRTLGenerator
-from ..parsers.base import TestScenario
+from ..generators import BUILTIN_GENERATORS, GeneratedTest, fan_out
+from ..parsers.base import TestScenario, StepType
+from ..parsers.incremental import ParsedDocument
+from ..parsers.classifier import StepClassifier
+from ..parsers.endpoints import EndpointIndex
+from ..parsers.routes import RouteTrie
 
 
 class TestAutomationServer:
     """MCP server for test automation."""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, step_rules: Optional[str] = None, routes: Optional[str] = None):
         self.server = Server("bai-test-automation")
-        self.parser = MermaidParser()
-        self.generators = {
-            "playwright": PlaywrightGenerator(),
-            "pytest": PytestGenerator(),
-            "cypress": CypressGenerator(),
-            "jest-rtl": JestRTLGenerator()
-        }
+        classifier = StepClassifier.from_file(step_rules) if step_rules else None
+        route_trie = RouteTrie.from_file(routes) if routes else None
+        self.parser = MermaidParser(use_cache=use_cache, classifier=classifier, routes=route_trie)
+        self.generators = {name: generator_class() for name, generator_class in BUILTIN_GENERATORS.items()}
         self.scenarios: Dict[str, TestScenario] = {}
+        self.documents: Dict[str, ParsedDocument] = {}
+        self.endpoints = EndpointIndex(routes=self.parser.routes)
         
         # Register handlers
         self._register_handlers()
@@ -66,12 +69,12 @@ class TestAutomationServer:
                             },
                             "framework": {
                                 "type": "string",
-                                "enum": ["playwright", "pytest", "cypress", "jest-rtl"],
-                                "description": "Test framework to use"
+                                "enum": ["playwright", "pytest", "cypress", "jest-rtl", "all"],
+                                "description": "Test framework to use, or \"all\" for every framework from one analysis of the scenario"
                             },
                             "output_path": {
                                 "type": "string",
-                                "description": "Path to save generated test file"
+                                "description": "Path to save generated test file (a directory with one subdirectory per framework for \"all\")"
                             },
                             "config": {
                                 "type": "object",
@@ -81,6 +84,28 @@ class TestAutomationServer:
                         "required": ["scenario_name", "framework"]
                     }
                 ),
+                types.Tool(
+                    name="update_diagram",
+                    description="Re-parse only the changed diagrams of an edited document and update stored scenarios",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "content": {
+                                "type": "string",
+                                "description": "New document content"
+                            },
+                            "file_path": {
+                                "type": "string",
+                                "description": "Path to the edited file (alternative to content)"
+                            },
+                            "document_id": {
+                                "type": "string",
+                                "description": "Key for tracking the document between updates (defaults to file_path)"
+                            }
+                        },
+                        "required": []
+                    }
+                ),
                 types.Tool(
                     name="list_scenarios",
                     description="List all parsed test scenarios",
@@ -90,6 +115,42 @@ class TestAutomationServer:
                         "required": []
                     }
                 ),
+                types.Tool(
+                    name="find_by_endpoint",
+                    description="Find stored scenarios and steps that call an API endpoint",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "endpoint": {
+                                "type": "string",
+                                "description": "Endpoint path, e.g. /api/v1/users/login"
+                            },
+                            "method": {
+                                "type": "string",
+                                "description": "HTTP method (default: any)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of steps to return (default: 100)"
+                            }
+                        },
+                        "required": ["endpoint"]
+                    }
+                ),
+                types.Tool(
+                    name="endpoint_stats",
+                    description="Show which API endpoints the stored scenarios call most",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of endpoints to return (default: 20)"
+                            }
+                        },
+                        "required": []
+                    }
+                ),
                 types.Tool(
                     name="analyze_diagram",
                     description="Analyze a diagram and provide insights",
@@ -114,8 +175,14 @@ class TestAutomationServer:
                 return await self._parse_diagram(arguments)
             elif name == "generate_test":
                 return await self._generate_test(arguments)
+            elif name == "update_diagram":
+                return await self._update_diagram(arguments)
             elif name == "list_scenarios":
                 return await self._list_scenarios()
+            elif name == "find_by_endpoint":
+                return await self._find_by_endpoint(arguments)
+            elif name == "endpoint_stats":
+                return await self._endpoint_stats(arguments or {})
             elif name == "analyze_diagram":
                 return await self._analyze_diagram(arguments)
             else:
@@ -142,11 +209,12 @@ class TestAutomationServer:
                 )]
         
         try:
-            scenarios = self.parser.parse(content)
+            errors: List[str] = []
+            scenarios = self.parser.parse(content, errors)
             
             # Store scenarios
             for scenario in scenarios:
-                self.scenarios[scenario.name] = scenario
+                self._store_scenario(scenario)
             
             # Format response
             result = {
@@ -159,7 +227,8 @@ class TestAutomationServer:
                         "actors": s.get_actors()
                     }
                     for s in scenarios
-                ]
+                ],
+                "errors": errors
             }
             
             return [types.TextContent(
@@ -173,6 +242,81 @@ class TestAutomationServer:
                 text=f"Error parsing diagram: {e}"
             )]
     
+    def _store_scenario(self, scenario: TestScenario) -> None:
+        """Store a scenario and index its endpoints, replacing one of the same name."""
+        if self.scenarios.get(scenario.name) is scenario:
+            return
+        self.scenarios[scenario.name] = scenario
+        self.endpoints.add(scenario)
+    
+    def _evict_scenario(self, scenario: TestScenario) -> None:
+        """Forget a stored scenario, unless its name now belongs to another scenario."""
+        if self.scenarios.get(scenario.name) is not scenario:
+            return
+        del self.scenarios[scenario.name]
+        self.endpoints.remove(scenario.name)
+    
+    async def _update_diagram(self, args: Dict[str, Any]) -> list[types.TextContent]:
+        """Incrementally re-parse an edited document."""
+        content = args.get("content")
+        file_path = args.get("file_path")
+        document_id = args.get("document_id") or file_path or "default"
+        
+        if not content and not file_path:
+            return [types.TextContent(
+                type="text",
+                text="Error: Either 'content' or 'file_path' must be provided"
+            )]
+        
+        if file_path and not content:
+            try:
+                content = Path(file_path).read_text(encoding='utf-8')
+            except Exception as e:
+                return [types.TextContent(
+                    type="text",
+                    text=f"Error reading file: {e}"
+                )]
+        
+        try:
+            errors: List[str] = []
+            previous = self.documents.get(document_id)
+            document, diff = self.parser.parse_incremental(content, previous, errors)
+            self.documents[document_id] = document
+            
+            # Update the scenarios this document stored; names are shared with
+            # other documents, so only evict what is still this document's
+            if previous is not None:
+                owned = {scenario.name: scenario for scenario in previous.scenarios}
+                for name in diff.removed:
+                    if name in owned:
+                        self._evict_scenario(owned[name])
+            updated = set(diff.added) | set(diff.changed)
+            for scenario in document.scenarios:
+                if scenario.name in updated:
+                    self._store_scenario(scenario)
+            
+            result = {
+                "document_id": document_id,
+                "reparsed_blocks": diff.reparsed_blocks,
+                "added": diff.added,
+                "changed": diff.changed,
+                "removed": diff.removed,
+                "unchanged": len(diff.unchanged),
+                "total_scenarios": len(document.scenarios),
+                "errors": errors
+            }
+            
+            return [types.TextContent(
+                type="text",
+                text=json.dumps(result, indent=2)
+            )]
+        
+        except Exception as e:
+            return [types.TextContent(
+                type="text",
+                text=f"Error updating diagram: {e}"
+            )]
+    
     async def _generate_test(self, args: Dict[str, Any]) -> list[types.TextContent]:
         """Generate test code from scenario."""
         scenario_name = args.get("scenario_name")
@@ -186,6 +330,9 @@ class TestAutomationServer:
                 text=f"Error: Scenario '{scenario_name}' not found. Available: {list(self.scenarios.keys())}"
             )]
         
+        if framework == "all":
+            return self._generate_all_tests(scenario_name, output_path, config)
+        
         if framework not in self.generators:
             return [types.TextContent(
                 type="text",
@@ -214,7 +361,7 @@ class TestAutomationServer:
                 "message": message,
                 "test_name": generated.name,
                 "framework": generated.framework,
-                "code_preview": generated.code[:500] + "..." if len(generated.code) > 500 else generated.code
+                "code_preview": self._code_preview(generated)
             }
             
             return [types.TextContent(
@@ -228,6 +375,51 @@ class TestAutomationServer:
                 text=f"Error generating test: {e}"
             )]
     
+    def _generate_all_tests(self, scenario_name: str, output_path: Optional[str],
+                            config: Dict[str, Any]) -> list[types.TextContent]:
+        """Generate a scenario's tests for every framework, lowering the scenario once."""
+        try:
+            scenario = self.scenarios[scenario_name]
+            
+            # Update generator config
+            if config:
+                for generator in self.generators.values():
+                    generator.config.update(config)
+            
+            tests = fan_out(scenario, self.generators)
+            
+            results = []
+            for framework, generated in tests.items():
+                entry = {"framework": framework, "test_name": generated.name}
+                if output_path:
+                    file_path = Path(output_path) / framework / generated.name
+                    generated.save(file_path)
+                    entry["saved_to"] = str(file_path)
+                entry["code_preview"] = self._code_preview(generated)
+                results.append(entry)
+            
+            if output_path:
+                message = f"Tests for {len(results)} frameworks generated and saved under: {output_path}"
+            else:
+                message = f"Tests for {len(results)} frameworks generated successfully"
+            
+            return [types.TextContent(
+                type="text",
+                text=json.dumps({"message": message, "tests": results}, indent=2)
+            )]
+        
+        except Exception as e:
+            return [types.TextContent(
+                type="text",
+                text=f"Error generating tests: {e}"
+            )]
+    
+    @staticmethod
+    def _code_preview(generated: GeneratedTest) -> str:
+        """First 500 characters of a generated test's code."""
+        code = generated.code
+        return code[:500] + "..." if len(code) > 500 else code
+    
     async def _list_scenarios(self) -> list[types.TextContent]:
         """List all available scenarios."""
         if not self.scenarios:
@@ -250,6 +442,62 @@ class TestAutomationServer:
                 for name, scenario in self.scenarios.items()
             ]
         }
+        if self.parser.cache is not None:
+            result["cache"] = self.parser.cache.stats.to_dict()
+        
+        return [types.TextContent(
+            type="text",
+            text=json.dumps(result, indent=2)
+        )]
+    
+    async def _find_by_endpoint(self, args: Dict[str, Any]) -> list[types.TextContent]:
+        """Find stored scenarios calling an endpoint."""
+        endpoint = args.get("endpoint")
+        method = args.get("method")
+        limit = args.get("limit", 100)
+        
+        if not endpoint:
+            return [types.TextContent(
+                type="text",
+                text="Error: 'endpoint' is required"
+            )]
+        
+        scenario_count, step_count = self.endpoints.count(endpoint, method)
+        matches: Dict[str, List[Dict[str, Any]]] = {}
+        for ref in self.endpoints.find(endpoint, method, limit=limit):
+            step = self.scenarios[ref.scenario].steps[ref.step]
+            matches.setdefault(ref.scenario, []).append({
+                "step": ref.step + 1,
+                "actor": step.actor,
+                "target": step.target,
+                "action": step.action
+            })
+        
+        result = {
+            "endpoint": endpoint,
+            "method": method.upper() if method else "*",
+            "total_scenarios": scenario_count,
+            "total_steps": step_count,
+            "scenarios": [
+                {"name": name, "steps": steps}
+                for name, steps in matches.items()
+            ]
+        }
+        
+        return [types.TextContent(
+            type="text",
+            text=json.dumps(result, indent=2)
+        )]
+    
+    async def _endpoint_stats(self, args: Dict[str, Any]) -> list[types.TextContent]:
+        """Summarize endpoint usage across stored scenarios."""
+        limit = args.get("limit", 20)
+        
+        result = {
+            "total_endpoints": len(self.endpoints),
+            "total_scenarios": len(self.scenarios),
+            "endpoints": [stats.to_dict() for stats in self.endpoints.stats(limit=limit)]
+        }
         
         return [types.TextContent(
             type="text",
@@ -267,7 +515,8 @@ class TestAutomationServer:
             )]
         
         try:
-            scenarios = self.parser.parse(content)
+            errors: List[str] = []
+            scenarios = self.parser.parse(content, errors)
             
             # Analyze the scenarios
             total_steps = sum(len(s.steps) for s in scenarios)
@@ -278,9 +527,7 @@ class TestAutomationServer:
             for scenario in scenarios:
                 all_actors.update(scenario.get_actors())
                 
-                for step in scenario.get_api_calls():
-                    if 'endpoint' in step.data:
-                        api_endpoints.add(f"{step.data['method']} {step.data['endpoint']}")
+                api_endpoints.update(scenario.get_endpoints())
                 
                 for step in scenario.get_user_actions():
                     user_actions.append(step.action)
@@ -297,7 +544,8 @@ class TestAutomationServer:
                     "has_api_calls": bool(api_endpoints),
                     "has_user_interactions": bool(user_actions)
                 },
-                "recommendations": self._get_recommendations(scenarios)
+                "recommendations": self._get_recommendations(scenarios),
+                "errors": errors
             }
             
             return [types.TextContent(
@@ -320,7 +568,7 @@ class TestAutomationServer:
                 recommendations.append(f"Scenario '{scenario.name}' has {len(scenario.steps)} steps. Consider breaking it down.")
             
             api_calls = scenario.get_api_calls()
-            if api_calls and not any('assertion' in str(s.step_type).lower() for s in scenario.steps):
+            if api_calls and not scenario.get_steps(StepType.ASSERTION):
                 recommendations.append(f"Scenario '{scenario.name}' has API calls but no assertions.")
             
             if not scenario.get_user_actions() and not api_calls:
@@ -1,4 +1,38 @@
-from .base import DiagramParser, TestScenario, TestStep
+from .base import DiagramParser, TestScenario, TestStep, SharedStep, StepPool
 from .mermaid import MermaidParser
+from .cache import ScenarioCache
+from .batch import parse_directory, parse_files, FileResult, BatchStats
+from .incremental import ParsedDocument, DocumentDiff
+from .classifier import StepClassifier
+from .flow import FlowPath, iter_paths
+from .endpoints import EndpointIndex, EndpointRef
+from .routes import RouteTrie
+from .profiling import ParseProfile
+from .serialize import dump_jsonl, load_jsonl, dumps_binary, loads_binary
 
-__all__ = ["DiagramParser", "TestScenario", "TestStep", "MermaidParser"]
\ No newline at end of file
+__all__ = [
+    "DiagramParser",
+    "TestScenario",
+    "TestStep",
+    "SharedStep",
+    "StepPool",
+    "MermaidParser",
+    "ScenarioCache",
+    "parse_directory",
+    "parse_files",
+    "FileResult",
+    "BatchStats",
+    "ParsedDocument",
+    "DocumentDiff",
+    "StepClassifier",
+    "FlowPath",
+    "iter_paths",
+    "EndpointIndex",
+    "EndpointRef",
+    "RouteTrie",
+    "ParseProfile",
+    "dump_jsonl",
+    "load_jsonl",
+    "dumps_binary",
+    "loads_binary",
+]
\ No newline at end of file
@@ -1,6 +1,9 @@
+import sys
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict, abc
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, KeysView
 from enum import Enum
 
 
@@ -14,47 +17,608 @@ class StepType(Enum):
     NOTE = "note"
 
 
-@dataclass
+class _ReadOnlyData(dict):
+    """Step data dict that can't be changed in place."""
+    
+    __slots__ = ()
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("shared step data is read-only; use TestStep.with_data() or TestScenario.edit_step()")
+    
+    __setitem__ = __delitem__ = setdefault = update = pop = popitem = clear = __ior__ = _readonly
+    
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class _EmptyData(_ReadOnlyData):
+    """Read-only empty dict shared by every step without data."""
+    
+    __slots__ = ()
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("shared empty step data is read-only; use TestStep.set_data() or assign step.data")
+    
+    __setitem__ = __delitem__ = setdefault = update = pop = popitem = clear = __ior__ = _readonly
+    
+    def __reduce__(self):
+        # Unpickle and copy back to the singleton
+        return 'EMPTY_DATA'
+
+
+EMPTY_DATA: Dict[str, Any] = _EmptyData()
+
+
+class _StepData(dict):
+    """Data dict handed out for a step that has none; it joins the step on its first change.
+    
+    This keeps ``step.data['key'] = value`` working while steps without data
+    share ``EMPTY_DATA``: reading ``data`` costs an empty dict, and only a
+    change gives the step a dict of its own.
+    """
+    
+    __slots__ = ('_step',)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._step = None
+    
+    def _target(self) -> Dict[str, Any]:
+        step = self._step
+        if step is None:
+            return self
+        if step._data is EMPTY_DATA:
+            step._data = self
+            self._step = None
+            return self
+        # Another handle changed the step first; write through to its dict
+        return step._data
+    
+    def _writer(method):
+        def write(self, *args, **kwargs):
+            return method(self._target(), *args, **kwargs)
+        write.__name__ = method.__name__
+        return write
+    
+    __setitem__ = _writer(dict.__setitem__)
+    __delitem__ = _writer(dict.__delitem__)
+    setdefault = _writer(dict.setdefault)
+    update = _writer(dict.update)
+    pop = _writer(dict.pop)
+    popitem = _writer(dict.popitem)
+    clear = _writer(dict.clear)
+    del _writer
+    
+    def __ior__(self, other):
+        target = self._target()
+        dict.update(target, other)
+        return target
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(init=False, repr=False, eq=False)
 class TestStep:
-    """Represents a single test step."""
+    """Represents a single test step.
+    
+    Steps are slotted to keep large scenario sets small: actor and target
+    names are interned, steps without data share ``EMPTY_DATA`` until their
+    data is first changed, and the default description is only built when
+    read. ``dataclasses.fields``, ``asdict`` and ``replace`` still work;
+    ``replace`` keeps the description as read, default or not.
+    """
+    
     step_type: StepType
     actor: str
-    target: Optional[str] = None
-    action: str = ""
-    data: Dict[str, Any] = field(default_factory=dict)
-    expected: Optional[Any] = None
-    description: str = ""
+    target: Optional[str]
+    action: str
+    data: Dict[str, Any]
+    expected: Optional[Any]
+    description: str
+    
+    __slots__ = ('step_type', 'actor', 'target', 'action', '_data', 'expected', '_description')
+    
+    def __init__(self, step_type: StepType, actor: str, target: Optional[str] = None, action: str = "",
+                 data: Optional[Dict[str, Any]] = None, expected: Optional[Any] = None, description: str = ""):
+        self.step_type = step_type
+        self.actor = _intern(actor)
+        self.target = _intern(target)
+        self.action = action
+        self._data = data if data else EMPTY_DATA
+        self.expected = expected
+        self._description = description or None
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Step data such as the HTTP method and endpoint of an API call."""
+        data = self._data
+        if data is EMPTY_DATA:
+            data = _StepData()
+            data._step = self
+        return data
+    
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        self._data = value if value else EMPTY_DATA
+    
+    def set_data(self, key: str, value: Any) -> None:
+        """Set one data entry, giving the step its own dict if it has none yet."""
+        if self._data is EMPTY_DATA:
+            self._data = {}
+        self._data[key] = value
+    
+    @property
+    def description(self) -> str:
+        """Given description, or "<actor> <action> to <target>" by default."""
+        if self._description is not None:
+            return self._description
+        description = f"{self.actor} {self.action}"
+        if self.target:
+            description += f" to {self.target}"
+        return description
+    
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value or None
+    
+    def copy(self) -> "TestStep":
+        """Independent, mutable copy of the step (the data dict is copied too)."""
+        return self.with_data()
+    
+    def with_data(self, **entries: Any) -> "TestStep":
+        """Mutable copy of the step with some data entries added or replaced.
+        
+        Use this to annotate a step without changing it, e.g. when the step
+        is shared between scenarios (see ``StepPool``).
+        """
+        data = dict(self._data)
+        data.update(entries)
+        return TestStep(self.step_type, self.actor, self.target, self.action, data,
+                        self.expected, self._description)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form of the step; defaults are left out."""
+        result: Dict[str, Any] = {'type': self.step_type.value, 'actor': self.actor}
+        if self.target is not None:
+            result['target'] = self.target
+        if self.action:
+            result['action'] = self.action
+        if self._data:
+            result['data'] = self._data
+        if self.expected is not None:
+            result['expected'] = self.expected
+        if self._description is not None:
+            result['description'] = self._description
+        return result
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestStep":
+        """Rebuild a step from ``to_dict`` output."""
+        return cls(
+            step_type=StepType(data['type']),
+            actor=data['actor'],
+            target=data.get('target'),
+            action=data.get('action', ""),
+            data=data.get('data'),
+            expected=data.get('expected'),
+            description=data.get('description', "")
+        )
+    
+    def _fields(self) -> tuple:
+        return (self.step_type, self.actor, self.target, self.action, self._data, self.expected, self.description)
+    
+    def __eq__(self, other):
+        if not isinstance(other, TestStep):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return (f"TestStep(step_type={self.step_type!r}, actor={self.actor!r}, target={self.target!r}, "
+                f"action={self.action!r}, data={self._data!r}, expected={self.expected!r}, "
+                f"description={self.description!r})")
+
+
+class SharedStep(TestStep):
+    """Immutable step that several scenarios may hold at once.
+    
+    Created by ``StepPool``. Its attributes and top-level data can't be
+    changed; ``with_data()`` and ``copy()`` return ordinary mutable steps,
+    and ``TestScenario.edit_step()`` swaps one into a scenario.
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, *args, **kwargs):
+        step = TestStep(*args, **kwargs)
+        for name in TestStep.__slots__:
+            value = getattr(step, name)
+            if name == '_data' and value is not EMPTY_DATA:
+                value = _ReadOnlyData(value)
+            object.__setattr__(self, name, value)
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Read-only step data."""
+        return self._data
+    
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("shared steps are immutable; use with_data(), copy() or TestScenario.edit_step()")
+    
+    __setattr__ = __delattr__ = set_data = _immutable
+    
+    def __reduce__(self):
+        return (self.__class__, (self.step_type, self.actor, self.target, self.action, self._data,
+                                 self.expected, self._description))
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable, type-exact form of plain step data; raises TypeError for anything else."""
+    if isinstance(value, dict):
+        return dict, tuple((key, _freeze(item)) for key, item in value.items())
+    cls = value.__class__
+    if cls in (list, tuple):
+        return cls, tuple(_freeze(item) for item in value)
+    # The class keeps 1, 1.0 and True apart
+    hash(value)
+    return cls, value
+
+
+class StepPool:
+    """Interning table that makes structurally equal steps one ``SharedStep``.
+    
+    Most diagrams repeat the same steps (a login handshake, say), so sharing
+    them across scenarios saves a ``TestStep`` and its data dict per repeat.
+    The pool is a bounded LRU; evicting an entry only stops new steps from
+    sharing it. Steps whose data or expected value isn't plain, hashable
+    Python data are returned unchanged.
+    """
+    
+    def __init__(self, max_entries: int = 65536):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._steps: "OrderedDict[tuple, SharedStep]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._steps)
+    
+    def intern(self, step: TestStep) -> TestStep:
+        """The pooled step equal to ``step``, adding it to the pool if needed."""
+        try:
+            key = (step.step_type, step.actor, step.target, step.action, _freeze(step._data),
+                   _freeze(step.expected), step._description)
+        except TypeError:
+            return step
+        
+        with self._lock:
+            shared = self._steps.get(key)
+            if shared is not None:
+                self._steps.move_to_end(key)
+                self.hits += 1
+                return shared
+            
+            self.misses += 1
+            if step.__class__ is not SharedStep:
+                step = SharedStep(step.step_type, step.actor, step.target, step.action, step._data,
+                                  step.expected, step._description)
+            self._steps[key] = step
+            if len(self._steps) > self.max_entries:
+                self._steps.popitem(last=False)
+            return step
+    
+    def intern_scenario(self, scenario: "TestScenario") -> None:
+        """Replace the steps of a scenario with their pooled versions."""
+        scenario.steps = [self.intern(step) for step in scenario.steps]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._steps.clear()
+
+
+_default_step_pool: Optional[StepPool] = None
+
+
+def get_default_step_pool() -> StepPool:
+    """Get the process-wide step pool shared by parsers."""
+    global _default_step_pool
+    if _default_step_pool is None:
+        _default_step_pool = StepPool()
+    return _default_step_pool
+
+
+class StepView(abc.Sequence):
+    """Read-only view of a list of steps; reflects later changes to the list."""
+    
+    __slots__ = ('_steps',)
+    
+    def __init__(self, steps: Sequence[TestStep]):
+        self._steps = steps
+    
+    def __getitem__(self, index):
+        return self._steps[index]
+    
+    def __len__(self) -> int:
+        return len(self._steps)
+    
+    def __iter__(self) -> Iterator[TestStep]:
+        return iter(self._steps)
+    
+    def __eq__(self, other):
+        if isinstance(other, StepView):
+            other = other._steps
+        if isinstance(other, (list, tuple)):
+            return list(self._steps) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"StepView({list(self._steps)!r})"
+
+
+class _StepIndex:
+    """Steps by type, actors and API endpoints of one step list, with use counts."""
+    
+    __slots__ = ('by_type', 'actors', 'endpoints')
+    
+    def __init__(self):
+        self.by_type: Dict[StepType, List[TestStep]] = {}
+        self.actors: Dict[str, int] = {}
+        self.endpoints: Dict[str, int] = {}
+    
+    @staticmethod
+    def endpoint(step: TestStep) -> Optional[str]:
+        if step.step_type == StepType.API_CALL and 'endpoint' in step.data:
+            return f"{step.data.get('method', 'GET')} {step.data.get('template', step.data['endpoint'])}"
+        return None
+    
+    def add(self, step: TestStep) -> None:
+        self.by_type.setdefault(step.step_type, []).append(step)
+        if step.actor:
+            self.actors[step.actor] = self.actors.get(step.actor, 0) + 1
+        endpoint = self.endpoint(step)
+        if endpoint is not None:
+            self.endpoints[endpoint] = self.endpoints.get(endpoint, 0) + 1
+    
+    def discard(self, step: TestStep) -> None:
+        steps = self.by_type[step.step_type]
+        # Remove this very step, searching from the end where pops happen
+        for i in range(len(steps) - 1, -1, -1):
+            if steps[i] is step:
+                del steps[i]
+                break
+        if step.actor:
+            self._release(self.actors, step.actor)
+        endpoint = self.endpoint(step)
+        if endpoint is not None:
+            self._release(self.endpoints, endpoint)
+    
+    @staticmethod
+    def _release(counts: Dict[str, int], key: str) -> None:
+        if counts[key] == 1:
+            del counts[key]
+        else:
+            counts[key] -= 1
+    
+    def rebuild(self, steps: Iterable[TestStep]) -> None:
+        # add() inlined: this runs for every scenario built or decoded
+        by_type, actors, endpoints = self.by_type, self.actors, self.endpoints
+        by_type.clear()
+        actors.clear()
+        endpoints.clear()
+        # Grouped by type identity first; StepType hashes in Python code
+        groups: Dict[int, List[TestStep]] = {}
+        api_call = StepType.API_CALL
+        for step in steps:
+            step_type = step.step_type
+            group = groups.get(id(step_type))
+            if group is None:
+                groups[id(step_type)] = [step]
+            else:
+                group.append(step)
+            actor = step.actor
+            if actor:
+                actors[actor] = actors.get(actor, 0) + 1
+            if step_type is api_call and 'endpoint' in step._data:
+                endpoint = self.endpoint(step)
+                endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
+        for group in groups.values():
+            by_type[group[0].step_type] = group
+
+
+class StepList(list):
+    """The steps of a scenario, keeping the scenario's indexes up to date.
+    
+    Appending and removing from the end update the indexes incrementally;
+    changes in the middle of the list rebuild them.
+    """
+    
+    __slots__ = ('_index',)
+    
+    def __init__(self, steps: Iterable[TestStep] = ()):
+        super().__init__(steps)
+        self._index = _StepIndex()
+        self._index.rebuild(self)
+    
+    def __reduce__(self):
+        # The index is rebuilt rather than pickled
+        return (self.__class__, (list(self),))
+    
+    def append(self, step: TestStep) -> None:
+        super().append(step)
+        self._index.add(step)
+    
+    def extend(self, steps: Iterable[TestStep]) -> None:
+        start = len(self)
+        super().extend(steps)
+        for step in self[start:]:
+            self._index.add(step)
+    
+    def __iadd__(self, steps):
+        self.extend(steps)
+        return self
+    
+    def pop(self, index: int = -1) -> TestStep:
+        if index in (-1, len(self) - 1):
+            step = super().pop()
+            self._index.discard(step)
+            return step
+        step = super().pop(index)
+        self._index.rebuild(self)
+        return step
+    
+    def remove(self, step: TestStep) -> None:
+        super().remove(step)
+        self._index.rebuild(self)
+    
+    def clear(self) -> None:
+        super().clear()
+        self._index.rebuild(())
     
-    def __post_init__(self):
-        if not self.description:
-            self.description = f"{self.actor} {self.action}"
-            if self.target:
-                self.description += f" to {self.target}"
+    def _swap(self, index: int, step: TestStep) -> None:
+        """Replace a step with an equal one; the counts stay valid, only identities change."""
+        index = range(len(self))[index]
+        old = self[index]
+        super().__setitem__(index, step)
+        steps = self._index.by_type[old.step_type]
+        occurrence = sum(1 for each in self[:index] if each is old)
+        for i, each in enumerate(steps):
+            if each is old:
+                if occurrence == 0:
+                    steps[i] = step
+                    break
+                occurrence -= 1
+    
+    def _reindexing(method):
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self._index.rebuild(self)
+            return result
+        wrapper.__name__ = method.__name__
+        return wrapper
+    
+    insert = _reindexing(list.insert)
+    sort = _reindexing(list.sort)
+    reverse = _reindexing(list.reverse)
+    __setitem__ = _reindexing(list.__setitem__)
+    __delitem__ = _reindexing(list.__delitem__)
+    __imul__ = _reindexing(list.__imul__)
+    del _reindexing
+
+
+_NO_STEPS = StepView(())
 
 
-@dataclass
 class TestScenario:
-    """Represents a complete test scenario."""
-    name: str
-    description: str
-    steps: List[TestStep] = field(default_factory=list)
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    """Represents a complete test scenario.
+    
+    Steps are indexed by type, actor and endpoint as they are added, so the
+    ``get_*`` lookups are O(1). ``get_actors`` still returns a list; the
+    others return read-only views. Changes to ``steps`` through list methods
+    keep the indexes in sync; changing the type, actor or data of a step
+    already in the scenario does not.
+    """
+    
+    __slots__ = ('name', 'description', '_steps', 'metadata')
+    
+    def __init__(self, name: str, description: str, steps: Optional[List[TestStep]] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.description = description
+        self.steps = steps if steps is not None else []
+        self.metadata = metadata if metadata is not None else {}
+    
+    @property
+    def steps(self) -> StepList:
+        return self._steps
+    
+    @steps.setter
+    def steps(self, steps: Iterable[TestStep]) -> None:
+        self._steps = steps if isinstance(steps, StepList) else StepList(steps)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.name, self.description, self.steps, self.metadata) ==
+                (other.name, other.description, other.steps, other.metadata))
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return (f"TestScenario(name={self.name!r}, description={self.description!r}, "
+                f"steps={list(self.steps)!r}, metadata={self.metadata!r})")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form of the scenario and its steps."""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'steps': [step.to_dict() for step in self._steps],
+            'metadata': self.metadata
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestScenario":
+        """Rebuild a scenario from ``to_dict`` output."""
+        return cls(
+            name=data['name'],
+            description=data['description'],
+            steps=[TestStep.from_dict(step) for step in data.get('steps', ())],
+            metadata=data.get('metadata', {})
+        )
     
     def add_step(self, step: TestStep) -> None:
         """Add a step to the scenario."""
         self.steps.append(step)
     
+    def remove_step(self, step: TestStep) -> None:
+        """Remove a step from the scenario."""
+        self.steps.remove(step)
+    
+    def edit_step(self, index: int) -> TestStep:
+        """Get a step that may be changed in place, copying it first if it is shared.
+        
+        Changes that affect the indexes (type, actor, endpoint) still need
+        the step to be re-added; see the class docstring.
+        """
+        step = self._steps[index]
+        if isinstance(step, SharedStep):
+            step = step.copy()
+            self._steps._swap(index, step)
+        return step
+    
+    def get_steps(self, step_type: StepType) -> Sequence[TestStep]:
+        """Get all steps of one type."""
+        steps = self._steps._index.by_type.get(step_type)
+        return StepView(steps) if steps is not None else _NO_STEPS
+    
     def get_actors(self) -> List[str]:
-        """Get unique actors in the scenario."""
-        return list(set(step.actor for step in self.steps if step.actor))
+        """Get unique actors in the scenario, in order of first appearance."""
+        return list(self._steps._index.actors)
+    
+    def actors_view(self) -> KeysView:
+        """Live, read-only view of the actors, without copying them."""
+        return self._steps._index.actors.keys()
+    
+    def get_endpoints(self) -> KeysView:
+        """Get unique API endpoints in the scenario, as "METHOD /path"."""
+        return self._steps._index.endpoints.keys()
     
-    def get_api_calls(self) -> List[TestStep]:
+    def get_api_calls(self) -> Sequence[TestStep]:
         """Get all API call steps."""
-        return [step for step in self.steps if step.step_type == StepType.API_CALL]
+        return self.get_steps(StepType.API_CALL)
     
-    def get_user_actions(self) -> List[TestStep]:
+    def get_user_actions(self) -> Sequence[TestStep]:
         """Get all user action steps."""
-        return [step for step in self.steps if step.step_type == StepType.USER_ACTION]
+        return self.get_steps(StepType.USER_ACTION)
 
 
 class DiagramParser(ABC):
@@ -66,7 +630,7 @@ class DiagramParser(ABC):
         
         Args:
             content: The diagram content as string
-            
+        
         Returns:
             List of test scenarios extracted from the diagram
         """
@@ -78,21 +642,34 @@ class DiagramParser(ABC):
         
         Args:
             content: The diagram content to validate
-            
+        
         Returns:
             True if content is valid, False otherwise
         """
         pass
     
+    def parse_iter(self, stream: Iterable[str]) -> Iterator[TestScenario]:
+        """Parse diagrams from a stream, yielding scenarios as they are found.
+        
+        The default implementation reads the whole stream; parsers that can
+        scan incrementally should override it.
+        
+        Args:
+            stream: Text stream or any iterable of lines
+        
+        Yields:
+            Test scenarios in document order
+        """
+        yield from self.parse("".join(stream))
+    
     def parse_file(self, file_path: str) -> List[TestScenario]:
         """Parse diagram from file.
         
         Args:
             file_path: Path to the diagram file
-            
+        
         Returns:
             List of test scenarios
         """
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return self.parse(content)
\ No newline at end of file
+            return list(self.parse_iter(f))
\ No newline at end of file
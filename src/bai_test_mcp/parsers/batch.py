@@ -0,0 +1,168 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Iterable, Iterator, Optional
+
+from .base import TestScenario, get_default_step_pool
+from .mermaid import MermaidParser
+from .classifier import StepClassifier
+from .routes import RouteTrie
+from .flow import DEFAULT_MAX_PATHS
+
+
+@dataclass
+class FileResult:
+    """Scenarios and errors for one parsed file."""
+    path: str
+    scenarios: List[TestScenario] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    # Diagram blocks found; one alt/opt block can yield several scenarios
+    blocks: int = 0
+
+
+@dataclass
+class BatchStats:
+    """Throughput counters for a batch parse."""
+    files: int = 0
+    blocks: int = 0
+    scenarios: int = 0
+    failed_files: int = 0
+    elapsed: float = 0.0
+    
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+    
+    @property
+    def blocks_per_sec(self) -> float:
+        return self.blocks / self.elapsed if self.elapsed else 0.0
+
+
+# One warm parser per worker process, created by the pool initializer. Forked
+# workers don't reuse the parent's scenario cache connection (see cache.py).
+_worker_parser: Optional[MermaidParser] = None
+
+
+def _init_worker(use_cache: bool, step_rules: Optional[str] = None, routes: Optional[str] = None,
+                 max_paths: Optional[int] = DEFAULT_MAX_PATHS) -> None:
+    global _worker_parser
+    classifier = StepClassifier.from_file(step_rules) if step_rules else None
+    route_trie = RouteTrie.from_file(routes) if routes else None
+    _worker_parser = MermaidParser(use_cache=use_cache, classifier=classifier, routes=route_trie,
+                                   max_paths=max_paths)
+
+
+def _parse_one(path: str) -> FileResult:
+    """Parse a single file in a worker; never raises."""
+    result = FileResult(path=path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            blocks = _count_blocks(_worker_parser.iter_blocks(f), result)
+            result.scenarios = list(_worker_parser.parse_blocks(blocks, errors=result.errors))
+    except Exception as e:
+        result.errors.append(f"Error reading file: {e}")
+    return result
+
+
+def _count_blocks(blocks: Iterator[str], result: FileResult) -> Iterator[str]:
+    for block in blocks:
+        result.blocks += 1
+        yield block
+
+
+def find_diagram_files(target: str, pattern: str = "**/*.md") -> List[str]:
+    """Resolve a directory, file or glob into a sorted list of files.
+    
+    Args:
+        target: Directory to walk, a single file, or a glob expression
+        pattern: Glob applied inside ``target`` when it is a directory
+    
+    Returns:
+        Sorted file paths
+    """
+    path = Path(target)
+    if path.is_dir():
+        files = (str(p) for p in path.glob(pattern) if p.is_file())
+    elif path.is_file():
+        files = [str(path)]
+    else:
+        files = (p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+    return sorted(files)
+
+
+def parse_files(files: Iterable[str], jobs: Optional[int] = None, use_cache: bool = True,
+                stats: Optional[BatchStats] = None, step_rules: Optional[str] = None,
+                routes: Optional[str] = None, max_paths: Optional[int] = DEFAULT_MAX_PATHS) -> Iterator[FileResult]:
+    """Parse many files across a process pool.
+    
+    Results stream back in the order of ``files`` regardless of which worker
+    finishes first. Errors are collected on each ``FileResult``.
+    
+    Args:
+        files: Files to parse
+        jobs: Worker processes (None or 0 for the CPU count; 1 parses in-process)
+        use_cache: Use the parsed scenario cache in each worker
+        stats: Filled in with throughput counters as results arrive
+        step_rules: Project step classification rule file
+        routes: Project route list used to normalize endpoints
+        max_paths: Most alt/opt paths expanded into scenarios per diagram (None for all)
+    
+    Yields:
+        One FileResult per file
+    """
+    files = list(files)
+    stats = stats if stats is not None else BatchStats()
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    
+    def account(result: FileResult) -> FileResult:
+        stats.files += 1
+        stats.blocks += result.blocks
+        stats.scenarios += len(result.scenarios)
+        if result.errors:
+            stats.failed_files += 1
+        stats.elapsed = time.perf_counter() - start
+        return result
+    
+    if jobs == 1 or len(files) <= 1:
+        _init_worker(use_cache, step_rules, routes, max_paths)
+        for path in files:
+            yield account(_parse_one(path))
+        return
+    
+    # Small chunks keep results flowing while amortizing IPC
+    chunksize = max(1, min(32, len(files) // (jobs * 4)))
+    # Steps come back from the workers as separate copies; share them again here
+    pool = get_default_step_pool()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(use_cache, step_rules, routes, max_paths)) as executor:
+        for result in executor.map(_parse_one, files, chunksize=chunksize):
+            for scenario in result.scenarios:
+                pool.intern_scenario(scenario)
+            yield account(result)
+
+
+def parse_directory(target: str, pattern: str = "**/*.md", jobs: Optional[int] = None,
+                    use_cache: bool = True, stats: Optional[BatchStats] = None,
+                    step_rules: Optional[str] = None, routes: Optional[str] = None,
+                    max_paths: Optional[int] = DEFAULT_MAX_PATHS) -> Iterator[FileResult]:
+    """Parse every matching file under a directory or glob in parallel.
+    
+    Args:
+        target: Directory to walk, a single file, or a glob expression
+        pattern: Glob applied inside ``target`` when it is a directory
+        jobs: Worker processes (None or 0 for the CPU count)
+        use_cache: Use the parsed scenario cache in each worker
+        stats: Filled in with throughput counters as results arrive
+        step_rules: Project step classification rule file
+        routes: Project route list used to normalize endpoints
+        max_paths: Most alt/opt paths expanded into scenarios per diagram (None for all)
+    
+    Yields:
+        One FileResult per file, in sorted path order
+    """
+    return parse_files(find_diagram_files(target, pattern), jobs=jobs, use_cache=use_cache,
+                       stats=stats, step_rules=step_rules, routes=routes, max_paths=max_paths)
@@ -0,0 +1,250 @@
+import os
+import pickle
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+CACHE_DIR_ENV = "BAI_AUTOTEST_CACHE_DIR"
+
+
+def get_cache_dir(create: bool = True) -> Optional[Path]:
+    """Get the directory for on-disk caches.
+    
+    Resolution order: ``$BAI_AUTOTEST_CACHE_DIR``, ``$XDG_CACHE_HOME/bai-autotest``,
+    then ``~/.cache/bai-autotest``.
+    
+    Args:
+        create: Create the directory if it does not exist
+    
+    Returns:
+        The cache directory, or None if it can't be created
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        path = Path(override)
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        path = Path(base) / "bai-autotest"
+    
+    if create:
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+    
+    return path
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a ScenarioCache."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+    
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'stores': self.stores
+        }
+    
+    def report(self) -> str:
+        """One-line summary of the counters."""
+        return (f"{self.memory_hits} memory hit(s), {self.disk_hits} disk hit(s), "
+                f"{self.misses} miss(es), {self.stores} store(s)")
+
+
+class ScenarioCache:
+    """Content-addressed cache of parsed diagram blocks.
+    
+    Keys are a hash of the block text plus the parser version; values are the
+    pickled ``TestScenario`` (or None for blocks that failed to parse). Entries
+    live in a bounded in-memory LRU in front of a SQLite store. Values are kept
+    pickled in both tiers so every hit returns fresh objects that callers may
+    mutate freely.
+    
+    The SQLite store is trimmed back to ``max_disk_entries`` rows, oldest
+    writes first, on open and every ``PRUNE_INTERVAL`` stores. Rows that no
+    longer unpickle (written by an older class layout) are deleted and count
+    as misses.
+    
+    Rows are unpickled, and unpickling can run arbitrary code, so the cache
+    directory (see ``get_cache_dir``) must only be writable by users you
+    trust. Point ``$BAI_AUTOTEST_CACHE_DIR`` elsewhere or disable the cache
+    when it isn't.
+    """
+    
+    DB_NAME = "scenarios.sqlite3"
+    
+    # Stores between two size checks of the SQLite store
+    PRUNE_INTERVAL = 256
+    
+    def __init__(self, max_entries: int = 1024, path: Optional[Path] = None, persistent: bool = True,
+                 max_disk_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_stores = 0
+        
+        if persistent:
+            if path is None:
+                cache_dir = get_cache_dir()
+                path = cache_dir / self.DB_NAME if cache_dir else None
+            if path is not None:
+                self._db = self._open_db(path)
+            if self._db is not None:
+                self._prune()
+    
+    @staticmethod
+    def _open_db(path: Path) -> Optional[sqlite3.Connection]:
+        """Open the on-disk tier, or return None if it is unavailable."""
+        try:
+            db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS scenarios (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+            db.commit()
+            return db
+        except sqlite3.Error:
+            return None
+    
+    @staticmethod
+    def make_key(block: str, version: str) -> str:
+        """Build the cache key for a diagram block."""
+        digest = hashlib.sha256(version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(block.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Look up a cached value.
+        
+        Returns:
+            Tuple of (hit, value); value is None on a miss
+        """
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                hit, value = self._load(key, payload)
+                if hit:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return True, value
+            
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT value FROM scenarios WHERE key = ?", (key,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row is not None:
+                    payload = bytes(row[0])
+                    hit, value = self._load(key, payload)
+                    if hit:
+                        self._remember(key, payload)
+                        self.stats.disk_hits += 1
+                        return True, value
+            
+            self.stats.misses += 1
+            return False, None
+    
+    def _load(self, key: str, payload: bytes) -> Tuple[bool, Any]:
+        """Unpickle a stored value; an entry that no longer loads is dropped from both tiers."""
+        try:
+            return True, pickle.loads(payload)
+        except (pickle.UnpicklingError, AttributeError, TypeError, ImportError, EOFError, ValueError):
+            self._memory.pop(key, None)
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM scenarios WHERE key = ?", (key,))
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+            return False, None
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a value in both tiers."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, payload)
+            self.stats.stores += 1
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO scenarios (key, value) VALUES (?, ?)", (key, payload))
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+                self._disk_stores += 1
+                if self._disk_stores % self.PRUNE_INTERVAL == 0:
+                    self._prune()
+    
+    def _prune(self) -> None:
+        """Delete the oldest rows of the SQLite store beyond ``max_disk_entries``.
+        
+        Rows are replaced on every store, so rowid order is write order.
+        """
+        try:
+            self._db.execute(
+                "DELETE FROM scenarios WHERE rowid <= "
+                "(SELECT rowid FROM scenarios ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                (self.max_disk_entries,))
+            self._db.commit()
+        except sqlite3.Error:
+            pass
+    
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM scenarios")
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+    
+    def _remember(self, key: str, payload: bytes) -> None:
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+_default_cache: Optional[ScenarioCache] = None
+# The parent's cache in a forked child; kept alive so its connection is never closed there
+_inherited_cache: Optional[ScenarioCache] = None
+
+
+def get_default_scenario_cache() -> ScenarioCache:
+    """Get the process-wide scenario cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ScenarioCache()
+    return _default_cache
+
+
+def _forget_default_cache() -> None:
+    """Give a forked child its own default cache; SQLite connections must not cross a fork."""
+    global _default_cache, _inherited_cache
+    if _default_cache is not None:
+        _inherited_cache, _default_cache = _default_cache, None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_default_cache)
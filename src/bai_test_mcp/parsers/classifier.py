@@ -0,0 +1,223 @@
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+import yaml
+
+from .base import StepType
+
+
+# Rules are tried in order; the first rule that applies and matches wins.
+# ``keywords`` are literal, case-insensitive substrings; ``patterns`` are
+# regular expressions; ``actors`` restricts a rule to those source actors and
+# ``arrows`` to arrows starting with one of the prefixes. A rule without
+# keywords or patterns matches whenever its conditions hold.
+DEFAULT_STEP_RULES: List[Dict[str, Any]] = [
+    {
+        "type": "api_call",
+        "keywords": ["get ", "post ", "put ", "delete ", "patch "],
+    },
+    {
+        "type": "user_action",
+        "actors": ["user", "client", "browser", "사용자", "ユーザー", "用户"],
+        "keywords": [
+            "click", "type", "enter", "select", "submit", "fill", "press", "tap",
+            "클릭", "입력", "선택", "제출", "누름", "누른다",
+            "クリック", "入力", "選択", "送信",
+            "点击", "输入", "选择", "提交",
+        ],
+    },
+    {
+        "type": "navigation",
+        "actors": ["user", "client", "browser", "사용자", "ユーザー", "用户"],
+        "keywords": [
+            "navigate", "go to", "visit", "open",
+            "접속", "이동", "방문", "열기",
+            "アクセス", "移動", "開く",
+            "访问", "打开", "跳转",
+        ],
+    },
+    {
+        # Return arrows carry responses to check. Words such as "verify" or
+        # "검증" don't make an assertion on their own: on a request arrow they
+        # name the work being requested ("API->>Security: 비밀번호 검증").
+        "type": "assertion",
+        "arrows": ["--"],
+    },
+]
+
+
+class _Rule:
+    __slots__ = ("step_type", "keywords", "patterns", "actors", "arrows")
+    
+    def __init__(self, spec: Dict[str, Any]):
+        self.step_type = StepType(spec["type"])
+        self.keywords = [k.lower() for k in spec.get("keywords", [])]
+        self.patterns = list(spec.get("patterns", []))
+        self.actors = frozenset(a.lower() for a in spec["actors"]) if spec.get("actors") else None
+        self.arrows = tuple(spec["arrows"]) if spec.get("arrows") else None
+    
+    @property
+    def unconditional(self) -> bool:
+        return not self.keywords and not self.patterns
+    
+    def applies(self, source: str, arrow: str) -> bool:
+        if self.actors is not None and source not in self.actors:
+            return False
+        if self.arrows is not None and not arrow.startswith(self.arrows):
+            return False
+        return True
+
+
+def _trie_regex(words: List[str]) -> str:
+    """Build a regex alternation shaped as a trie of literal words.
+    
+    Branches share prefixes and all start with a literal, so ``re`` can skip
+    ahead on the first character instead of trying every word at every
+    position.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+    
+    return emit(trie)
+
+
+class StepClassifier:
+    """Classify sequence diagram messages into step types.
+    
+    Every literal keyword of every rule is compiled into a single trie-shaped
+    regex matched against the lowercased message, so a message is scanned once
+    regardless of how many rules or languages the table covers. Regex
+    ``patterns`` from project rules get one combined regex of their own. The
+    rules applicable to a (source actor, arrow) pair are cached.
+    """
+    
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None,
+                 default: StepType = StepType.USER_ACTION):
+        self.rule_specs = list(DEFAULT_STEP_RULES if rules is None else rules)
+        self.default = default
+        self._rules = [_Rule(spec) for spec in self.rule_specs]
+        self._contexts: Dict[Tuple[str, str], Tuple[FrozenSet[int], int, int]] = {}
+        
+        # keyword -> rules it (or a keyword that is a prefix of it) belongs to,
+        # since the trie reports only the longest keyword at each position
+        owners: Dict[str, List[int]] = {}
+        for idx, rule in enumerate(self._rules):
+            for keyword in rule.keywords:
+                owners.setdefault(keyword, []).append(idx)
+        self._keyword_rules: Dict[str, Tuple[int, ...]] = {
+            keyword: tuple(sorted({idx for prefix, rules in owners.items()
+                                   if keyword.startswith(prefix) for idx in rules}))
+            for keyword in owners
+        }
+        self._keyword_regex: Optional[Pattern] = re.compile(_trie_regex(list(owners))) if owners else None
+        
+        groups = [f"(?P<r{idx}>{'|'.join(rule.patterns)})" for idx, rule in enumerate(self._rules) if rule.patterns]
+        self._pattern_regex: Optional[Pattern] = re.compile("|".join(groups), re.IGNORECASE) if groups else None
+        
+        self.fingerprint = hashlib.sha256(
+            json.dumps([self.rule_specs, default.value], sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()[:16]
+    
+    @classmethod
+    def from_file(cls, path: str) -> "StepClassifier":
+        """Load a project rule file (YAML or JSON).
+        
+        The file holds ``rules`` (same shape as DEFAULT_STEP_RULES), an optional
+        ``default`` step type, and ``extend`` (default true) to try the project
+        rules before the built-in ones rather than replacing them.
+        """
+        rule_path = Path(path)
+        if not rule_path.exists():
+            raise FileNotFoundError(f"Step rule file not found: {path}")
+        
+        with open(rule_path, 'r', encoding='utf-8') as f:
+            if rule_path.suffix in ['.yaml', '.yml']:
+                config = yaml.safe_load(f) or {}
+            elif rule_path.suffix == '.json':
+                config = json.load(f)
+            else:
+                raise ValueError(f"Unsupported rule file format: {rule_path.suffix}")
+        
+        rules = list(config.get("rules", []))
+        if config.get("extend", True):
+            rules.extend(DEFAULT_STEP_RULES)
+        default = StepType(config.get("default", StepType.USER_ACTION.value))
+        return cls(rules, default)
+    
+    def classify(self, source: str, target: str, arrow: str, message: str) -> StepType:
+        """Determine the type of step based on actors, arrow and message."""
+        context = self._contexts.get((source, arrow))
+        if context is None:
+            context = self._contexts[(source, arrow)] = self._context(source, arrow)
+        applicable, top, best = context
+        
+        if self._keyword_regex is not None:
+            best = self._best_match(self._keyword_regex, message.lower(), applicable, top, best, True)
+        if self._pattern_regex is not None and best != top:
+            best = self._best_match(self._pattern_regex, message, applicable, top, best, False)
+        
+        if best < len(self._rules):
+            return self._rules[best].step_type
+        return self.default
+    
+    def _context(self, source: str, arrow: str) -> Tuple[FrozenSet[int], int, int]:
+        """Rules that apply to a source/arrow pair, the best of them, and the first unconditional one."""
+        source = source.lower()
+        applicable = set()
+        fallback = len(self._rules)
+        for idx, rule in enumerate(self._rules):
+            if rule.applies(source, arrow):
+                if rule.unconditional:
+                    # Nothing after an unconditional rule can win
+                    fallback = idx
+                    break
+                applicable.add(idx)
+        top = min(applicable) if applicable else fallback
+        return frozenset(applicable), top, fallback
+    
+    def _best_match(self, regex: Pattern, text: str, applicable: FrozenSet[int], top: int, best: int,
+                    keywords: bool) -> int:
+        """Scan text once, keeping the highest-priority applicable rule that matches."""
+        pos = 0
+        while best != top:
+            match = regex.search(text, pos)
+            if match is None:
+                break
+            if keywords:
+                candidates = self._keyword_rules[match.group()]
+            else:
+                candidates = (int(match.lastgroup[1:]),)
+            for idx in candidates:
+                if idx < best and idx in applicable:
+                    best = idx
+                    break
+            # Resume right after the match start so overlapping words are seen
+            pos = match.start() + 1
+        return best
+
+
+_default_classifier: Optional[StepClassifier] = None
+
+
+def get_default_classifier() -> StepClassifier:
+    """Get the shared classifier built from DEFAULT_STEP_RULES."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = StepClassifier()
+    return _default_classifier
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Iterable
+
+from .base import TestScenario, TestStep, StepType
+from .routes import RouteTrie, get_default_routes
+
+
+@dataclass(frozen=True)
+class EndpointRef:
+    """A step of a stored scenario that calls an endpoint."""
+    scenario: str
+    step: int
+
+
+@dataclass
+class EndpointStats:
+    """How often one endpoint is called across the indexed scenarios."""
+    method: str
+    endpoint: str
+    scenarios: int
+    steps: int
+    
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'method': self.method,
+            'endpoint': self.endpoint,
+            'scenarios': self.scenarios,
+            'steps': self.steps,
+        }
+
+
+class EndpointIndex:
+    """Inverted index from (method, endpoint template) to the scenario steps calling it.
+    
+    Endpoints are keyed by their normalized template, so ``/api/users/1``,
+    ``/api/users/42`` and ``/api/users/{id}`` are one endpoint. Scenarios
+    are indexed by name; adding a scenario under a name that is already
+    indexed replaces it. Lookups and removals only touch the endpoints
+    involved, never the whole corpus.
+    """
+    
+    def __init__(self, scenarios: Iterable[TestScenario] = (), routes: Optional[RouteTrie] = None):
+        self.routes = routes or get_default_routes()
+        # key -> scenario name -> step indexes, in insertion order
+        self._refs: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+        self._step_counts: Dict[Tuple[str, str], int] = {}
+        self._methods: Dict[str, Dict[str, None]] = {}
+        self._by_scenario: Dict[str, List[Tuple[str, str]]] = {}
+        for scenario in scenarios:
+            self.add(scenario)
+    
+    def __len__(self) -> int:
+        """Number of distinct endpoints."""
+        return len(self._refs)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_scenario
+    
+    def add(self, scenario: TestScenario) -> None:
+        """Index the API calls of a scenario, replacing any scenario of the same name."""
+        self.remove(scenario.name)
+        
+        steps: Dict[Tuple[str, str], List[int]] = {}
+        if scenario.get_api_calls():
+            for idx, step in enumerate(scenario.steps):
+                key = self.step_endpoint(step)
+                if key is not None:
+                    steps.setdefault(key, []).append(idx)
+        
+        for key, indexes in steps.items():
+            self._refs.setdefault(key, {})[scenario.name] = indexes
+            self._step_counts[key] = self._step_counts.get(key, 0) + len(indexes)
+            self._methods.setdefault(key[1], {})[key[0]] = None
+        self._by_scenario[scenario.name] = list(steps)
+    
+    def step_endpoint(self, step: TestStep) -> Optional[Tuple[str, str]]:
+        """(method, endpoint template) of an API call step, or None for other steps."""
+        if step.step_type != StepType.API_CALL or 'endpoint' not in step.data:
+            return None
+        template = step.data.get('template') or self.routes.normalize(step.data['endpoint'])
+        return step.data.get('method', 'GET').upper(), template
+    
+    def remove(self, name: str) -> None:
+        """Drop a scenario from the index, if it is indexed."""
+        keys = self._by_scenario.pop(name, None)
+        if not keys:
+            return
+        
+        for key in keys:
+            refs = self._refs[key]
+            self._step_counts[key] -= len(refs.pop(name))
+            if not refs:
+                del self._refs[key]
+                del self._step_counts[key]
+                methods = self._methods[key[1]]
+                del methods[key[0]]
+                if not methods:
+                    del self._methods[key[1]]
+    
+    def clear(self) -> None:
+        self._refs.clear()
+        self._step_counts.clear()
+        self._methods.clear()
+        self._by_scenario.clear()
+    
+    def find(self, endpoint: str, method: Optional[str] = None, limit: Optional[int] = None) -> List[EndpointRef]:
+        """Find the steps that call an endpoint.
+        
+        Args:
+            endpoint: Endpoint path or template; it is normalized like indexed endpoints
+            method: HTTP method, or None for any method
+            limit: Return at most this many references
+        
+        Returns:
+            References to the calling steps, grouped by scenario in indexing order
+        """
+        refs = []
+        for refs_by_scenario in self._lookup(endpoint, method):
+            for scenario, indexes in refs_by_scenario.items():
+                refs.extend(EndpointRef(scenario, idx) for idx in indexes)
+                if limit is not None and len(refs) >= limit:
+                    return refs[:limit]
+        return refs
+    
+    def scenarios_for(self, endpoint: str, method: Optional[str] = None) -> List[str]:
+        """Names of the scenarios that call an endpoint."""
+        names: Dict[str, None] = {}
+        for refs_by_scenario in self._lookup(endpoint, method):
+            names.update(dict.fromkeys(refs_by_scenario))
+        return list(names)
+    
+    def count(self, endpoint: str, method: Optional[str] = None) -> Tuple[int, int]:
+        """Number of (scenarios, steps) that call an endpoint, without listing them."""
+        template = self.routes.normalize(endpoint)
+        keys = [(each, template) for each in self._lookup_methods(template, method)
+                if (each, template) in self._refs]
+        steps = sum(self._step_counts[key] for key in keys)
+        if len(keys) == 1:
+            return len(self._refs[keys[0]]), steps
+        # A scenario may call the path with several methods
+        return len(set().union(*(self._refs[key] for key in keys))), steps
+    
+    def _lookup_methods(self, template: str, method: Optional[str]) -> List[str]:
+        if method is not None:
+            return [method.upper()]
+        return list(self._methods.get(template, ()))
+    
+    def _lookup(self, endpoint: str, method: Optional[str]) -> List[Dict[str, List[int]]]:
+        template = self.routes.normalize(endpoint)
+        return [self._refs[(each, template)] for each in self._lookup_methods(template, method)
+                if (each, template) in self._refs]
+    
+    def stats(self, limit: Optional[int] = None) -> List[EndpointStats]:
+        """Per-endpoint usage, most widely used first.
+        
+        Args:
+            limit: Return only this many endpoints
+        
+        Returns:
+            Endpoint statistics sorted by scenario count, then step count
+        """
+        ranked = sorted(
+            self._refs.items(),
+            key=lambda item: (-len(item[1]), -self._step_counts[item[0]], item[0][1], item[0][0])
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [
+            EndpointStats(method=key[0], endpoint=key[1], scenarios=len(refs), steps=self._step_counts[key])
+            for key, refs in ranked
+        ]
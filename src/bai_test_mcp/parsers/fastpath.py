@@ -0,0 +1,104 @@
+import re
+
+from .flow import ARM_KEYWORDS
+
+
+# Token patterns mirror MERMAID_GRAMMAR; anything they don't cover exactly is
+# left to the Lark parser.
+_WS = r'[ \t]*'
+_WORD = r'[a-zA-Z_][a-zA-Z0-9_]*'
+_ARROW = r'-->>\+|->>\+|-->>|->>|<<--|<<-|--x|-x'
+
+_HEADER_RE = re.compile(rf'{_WS}sequenceDiagram{_WS}$')
+_DECLARATION_RE = re.compile(rf'{_WS}participant[ \t]+({_WORD})(?:[ \t]+as[ \t]+(\S.*))?{_WS}$')
+_NOTE_RE = re.compile(
+    rf'{_WS}Note[ \t]+(over|left of|right of){_WS}({_WORD}){_WS}(?:,{_WS}{_WORD}{_WS})?:{_WS}(\S.*)$'
+)
+_INTERACTION_RE = re.compile(rf'{_WS}({_WORD}){_WS}({_ARROW}){_WS}({_WORD}){_WS}(?::{_WS}(\S.*))?$')
+# Keyword lines that open, continue and close alt/opt/loop/par blocks
+_BLOCK_RE = re.compile(rf'{_WS}(alt|opt|loop|par|else|and)(?:[ \t]+(\S.*))?{_WS}$')
+_END_RE = re.compile(rf'{_WS}end{_WS}$')
+
+# Keywords the grammar lexes as such at the start of a statement
+_RESERVED_SOURCES = frozenset([
+    'Note', 'participant', 'sequenceDiagram', 'alt', 'else', 'opt', 'loop', 'par', 'and', 'end'
+])
+
+
+def scan_sequence(block: str, interpreter) -> bool:
+    """Single-pass line parser for the common sequenceDiagram subset.
+    
+    Feeds participants, interactions, notes and alt/opt/loop/par blocks
+    straight into ``interpreter`` (a ``MermaidInterpreter``), producing the
+    same steps as visiting the Lark tree. Returns False as soon as a line falls outside the supported subset;
+    the interpreter is then partially filled and must be discarded.
+    
+    Args:
+        block: A single diagram block, newline terminated
+        interpreter: Receives add_participant/add_interaction/add_note and
+            open_block/add_arm/close_block calls
+        
+    Returns:
+        True if every line was recognized
+    """
+    lines = iter(block.split('\n'))
+    
+    # The header must be the first non-blank line
+    for line in lines:
+        if line.endswith('\r'):
+            line = line[:-1]
+        if not line.strip(' \t'):
+            continue
+        if not _HEADER_RE.match(line):
+            return False
+        break
+    else:
+        return False
+    
+    # Kinds of the blocks currently open, innermost last
+    open_blocks = []
+    
+    for line in lines:
+        if line.endswith('\r'):
+            line = line[:-1]
+        if not line.strip(' \t'):
+            continue
+        
+        match = _INTERACTION_RE.match(line)
+        if match:
+            source, arrow, target, message = match.groups()
+            if source in _RESERVED_SOURCES:
+                return False
+            interpreter.add_interaction(source, arrow, target, message or "")
+            continue
+        
+        match = _DECLARATION_RE.match(line)
+        if match:
+            interpreter.add_participant(match.group(1), match.group(2))
+            continue
+        
+        match = _NOTE_RE.match(line)
+        if match:
+            interpreter.add_note(match.group(1), match.group(2), match.group(3))
+            continue
+        
+        match = _BLOCK_RE.match(line)
+        if match:
+            keyword, label = match.group(1), match.group(2) or ""
+            if keyword in ('else', 'and'):
+                if not open_blocks or ARM_KEYWORDS.get(open_blocks[-1]) != keyword:
+                    return False
+                interpreter.add_arm(label)
+            else:
+                open_blocks.append(keyword)
+                interpreter.open_block(keyword, label)
+            continue
+        
+        if _END_RE.match(line) and open_blocks:
+            open_blocks.pop()
+            interpreter.close_block()
+            continue
+        
+        return False
+    
+    return not open_blocks
@@ -0,0 +1,165 @@
+from dataclasses import dataclass, field
+from typing import List, Union, Optional, Callable, Iterator, Tuple
+
+from .base import TestStep
+
+
+# Default cap on the scenarios expanded from a single diagram block
+DEFAULT_MAX_PATHS = 64
+
+# Blocks whose arms are alternatives, so each arm starts a separate path
+BRANCHING_BLOCKS = frozenset(['alt', 'opt'])
+
+# Keyword that introduces each additional arm of a block
+ARM_KEYWORDS = {'alt': 'else', 'par': 'and'}
+
+
+@dataclass
+class FlowArm:
+    """One arm of a control-flow block (the body of ``alt``, each ``else``, ...)."""
+    label: str = ""
+    nodes: List[Union[TestStep, 'FlowBlock']] = field(default_factory=list)
+
+
+@dataclass
+class FlowBlock:
+    """An ``alt``/``opt``/``loop``/``par`` block of a sequence diagram."""
+    kind: str
+    arms: List[FlowArm] = field(default_factory=list)
+    
+    def choices(self) -> List[Tuple[List[List[Union[TestStep, 'FlowBlock']]], Optional[str]]]:
+        """Ways through this block, as (arm bodies run in order, condition taken).
+        
+        ``alt`` takes exactly one arm and ``opt`` runs its body or skips it.
+        ``loop`` runs its body once and ``par`` runs every arm in order; neither
+        branches, so they record no condition.
+        """
+        if self.kind == 'alt':
+            return [
+                ([arm.nodes], self._condition('alt' if i == 0 else 'else', arm.label))
+                for i, arm in enumerate(self.arms)
+            ]
+        if self.kind == 'opt':
+            label = self.arms[0].label
+            return [([self.arms[0].nodes], self._condition('opt', label)),
+                    ([], self._condition('skip opt', label))]
+        return [([arm.nodes for arm in self.arms], None)]
+    
+    @staticmethod
+    def _condition(keyword: str, label: str) -> str:
+        return f"{keyword} {label}" if label else keyword
+
+
+class FlowPath:
+    """One execution path through a diagram.
+    
+    Paths from the same diagram share their common prefix: steps and
+    conditions are kept as linked cells pointing back at the path they
+    branched from, and only copied into lists when accessed.
+    """
+    
+    __slots__ = ('_steps', '_conditions')
+    
+    def __init__(self, steps: Optional[tuple] = None, conditions: Optional[tuple] = None):
+        self._steps = steps
+        self._conditions = conditions
+    
+    @property
+    def steps(self) -> List[TestStep]:
+        """Steps of the path in execution order."""
+        return _unwind(self._steps)
+    
+    @property
+    def conditions(self) -> List[str]:
+        """Branch conditions taken, e.g. ``["alt 로그인 성공", "skip opt 캐시"]``."""
+        return _unwind(self._conditions)
+
+
+def _unwind(cell: Optional[tuple]) -> list:
+    items = []
+    while cell is not None:
+        items.append(cell[0])
+        cell = cell[1]
+    items.reverse()
+    return items
+
+
+def count_paths(nodes: List[Union[TestStep, FlowBlock]]) -> int:
+    """Number of execution paths through ``nodes``, without enumerating them."""
+    total = 1
+    for node in nodes:
+        if isinstance(node, FlowBlock):
+            ways = 0
+            for bodies, _ in node.choices():
+                way = 1
+                for body in bodies:
+                    way *= count_paths(body)
+                ways += way
+            total *= ways
+    return total
+
+
+def iter_paths(nodes: List[Union[TestStep, FlowBlock]], limit: Optional[int] = None,
+               prune: Optional[Callable[[FlowPath], bool]] = None) -> Iterator[FlowPath]:
+    """Lazily enumerate the execution paths through a control-flow structure.
+    
+    Paths are produced depth-first, first arms first, so the first path takes
+    the first arm of every ``alt`` and the body of every ``opt``. Only the
+    branch points still to be explored are held in memory, never the full
+    set of paths.
+    
+    Args:
+        nodes: Top-level steps and blocks
+        limit: Stop after this many paths
+        prune: Called with the partial path each time a branch is taken;
+            returning True drops every path that continues from it
+    
+    Yields:
+        Execution paths
+    """
+    if limit is not None and limit <= 0:
+        return
+    
+    produced = 0
+    # Each pending state is (continuation, steps so far, conditions so far).
+    # The continuation is a linked stack of (nodes, next index, parent) frames.
+    pending = [((nodes, 0, None), None, None)]
+    
+    while pending:
+        frame, steps, conditions = pending.pop()
+        
+        while frame is not None:
+            body, idx, parent = frame
+            if idx == len(body):
+                frame = parent
+                continue
+            
+            node = body[idx]
+            frame = (body, idx + 1, parent)
+            if not isinstance(node, FlowBlock):
+                steps = (node, steps)
+                continue
+            
+            ways = []
+            for bodies, condition in node.choices():
+                way_frame = frame
+                for arm_body in reversed(bodies):
+                    way_frame = (arm_body, 0, way_frame)
+                way_conditions = conditions
+                if condition is not None:
+                    way_conditions = (condition, conditions)
+                    if prune is not None and prune(FlowPath(steps, way_conditions)):
+                        continue
+                ways.append((way_frame, steps, way_conditions))
+            
+            if not ways:
+                break
+            
+            # Continue with the first way now, explore the others later
+            pending.extend(reversed(ways[1:]))
+            frame, steps, conditions = ways[0]
+        else:
+            yield FlowPath(steps, conditions)
+            produced += 1
+            if limit is not None and produced >= limit:
+                return
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import List, Optional, Iterator, Tuple
+
+from .base import TestScenario
+
+
+@dataclass
+class BlockRecord:
+    """A diagram block and the scenarios parsed from it (one per alt/opt path)."""
+    key: str
+    scenarios: List[TestScenario] = field(default_factory=list)
+    name: Optional[str] = None
+
+
+@dataclass
+class ParsedDocument:
+    """Parse state of one document, kept between incremental updates."""
+    blocks: List[BlockRecord] = field(default_factory=list)
+    
+    @property
+    def scenarios(self) -> List[TestScenario]:
+        """Scenarios in document order."""
+        return [scenario for block in self.blocks for scenario in block.scenarios]
+    
+    def scenario_names(self) -> List[str]:
+        return [scenario.name for scenario in self.scenarios]
+
+
+@dataclass
+class DocumentDiff:
+    """What an incremental update changed, by scenario name."""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    reparsed_blocks: int = 0
+
+
+def match_blocks(old_keys: List[str], new_keys: List[str]) -> Iterator[Tuple[range, range, bool]]:
+    """Align old and new block keys.
+    
+    Yields ``(old_range, new_range, same)`` regions in document order. ``same``
+    regions hold unchanged blocks pairwise; other regions hold blocks that
+    were removed, added or edited in between.
+    """
+    matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        yield range(i1, i2), range(j1, j2), tag == 'equal'
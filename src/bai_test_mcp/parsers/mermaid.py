@@ -1,60 +1,193 @@
+import io
 import re
-from typing import List, Dict, Tuple, Optional
+import sys
+import hashlib
+import threading
+from contextlib import nullcontext
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Callable
+import lark
 from lark import Lark, Tree, Token
+from lark.exceptions import LarkError
 from lark.visitors import Interpreter
 
-from .base import DiagramParser, TestScenario, TestStep, StepType
+from .base import DiagramParser, TestScenario, TestStep, StepType, StepPool, get_default_step_pool
+from .cache import ScenarioCache, get_cache_dir, get_default_scenario_cache
+from .incremental import BlockRecord, DocumentDiff, ParsedDocument, match_blocks
+from .fastpath import scan_sequence
+from .classifier import StepClassifier, get_default_classifier
+from .routes import RouteTrie, get_default_routes
+from .profiling import ParseProfile, TimedClassifier
+from .flow import DEFAULT_MAX_PATHS, BRANCHING_BLOCKS, FlowArm, FlowBlock, FlowPath, iter_paths
 
 
 MERMAID_GRAMMAR = r"""
-    ?start: "sequenceDiagram" _NL+ sequence
+    ?start: _NL* "sequenceDiagram" _NL+ sequence
     
-    sequence: (declaration | interaction | note)*
+    sequence: (declaration | interaction | note | alt | opt | loop | par)*
     
     declaration: "participant" actor ("as" alias)? _NL+
     
-    interaction: actor arrow actor ":" message _NL+
-               | actor arrow actor _NL+
+    interaction: actor ARROW actor ":" message _NL+
+               | actor ARROW actor _NL+
     
-    note: "Note" position actor ":" message _NL+
+    note: "Note" POSITION actor ("," actor)? ":" message _NL+
     
-    arrow: "->>" | "-->>" | "->>+" | "-->>+" | "<<-" | "<<--" | "-x" | "--x"
+    alt: "alt" arm ("else" arm)* "end" _NL+
+    opt: "opt" arm "end" _NL+
+    loop: "loop" arm "end" _NL+
+    par: "par" arm ("and" arm)* "end" _NL+
     
-    position: "over" | "left of" | "right of"
+    arm: label? _NL+ sequence
     
-    actor: WORD
-    alias: STRING | PHRASE
-    message: STRING | PHRASE | REST_OF_LINE
+    ARROW: "-->>+" | "->>+" | "-->>" | "->>" | "<<--" | "<<-" | "--x" | "-x"
+    
+    POSITION: "over" | "left of" | "right of"
+    
+    ?actor: WORD
+    ?alias: STRING | PHRASE
+    ?message: STRING | PHRASE
+    ?label: STRING | PHRASE
     
     WORD: /[a-zA-Z_][a-zA-Z0-9_]*/
     STRING: /"[^"]*"/
-    PHRASE: /[^\n]+/
-    REST_OF_LINE: /[^\n]+/
+    PHRASE: /[^\s][^\n]*/
     
     _NL: /\r?\n/
     
-    %import common.WS
-    %ignore WS
+    %import common.WS_INLINE
+    %ignore WS_INLINE
 """
 
 
+def _discard(children):
+    return None
+
+
+def _make_recognizer(parser: Lark) -> Lark:
+    """Turn a compiled LALR parser into a pure recognizer.
+    
+    Every rule's reduction callback is replaced with one that returns None,
+    so the grammar is still fully checked but no tree nodes (not even empty
+    ones) are built and ``parse()`` returns None.
+    """
+    lalr = parser.parser.parser.parser
+    lalr.callbacks = dict.fromkeys(lalr.callbacks, _discard)
+    return parser
+
+
+_GRAMMAR_DIGEST = hashlib.sha256(MERMAID_GRAMMAR.encode('utf-8')).hexdigest()[:16]
+
+# Bump when interpretation changes in a way the grammar digest doesn't capture
+PARSER_VERSION = f"mermaid-6-{_GRAMMAR_DIGEST}"
+
+# Compiled parsers shared by every MermaidParser in the process
+_COMPILED_PARSERS: Dict[bool, Lark] = {}
+_COMPILED_LOCK = threading.Lock()
+
+
+def _grammar_cache_file() -> Optional[str]:
+    """Path of the serialized LALR tables for the current grammar and Lark version."""
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    
+    py_version = "%d%d" % sys.version_info[:2]
+    return str(cache_dir / f"mermaid_grammar_{_GRAMMAR_DIGEST}_lark{lark.__version__}_py{py_version}.lark")
+
+
+def get_compiled_parser(recognizer: bool = False) -> Lark:
+    """Get the process-wide compiled Mermaid parser.
+    
+    The LALR tables are built once per process and persisted with Lark's
+    serialized-parser cache, so later processes skip grammar compilation.
+    The cache file name embeds a hash of the grammar text and the Lark and
+    Python versions, so a change to any of them compiles a fresh table.
+    
+    Args:
+        recognizer: Return the tree-less recognizer instead of the tree builder
+    
+    Returns:
+        Shared Lark parser instance
+    """
+    parser = _COMPILED_PARSERS.get(recognizer)
+    if parser is not None:
+        return parser
+    
+    with _COMPILED_LOCK:
+        if recognizer not in _COMPILED_PARSERS:
+            options = {'start': 'start', 'parser': 'lalr'}
+            cache_file = _grammar_cache_file()
+            if cache_file:
+                options['cache'] = cache_file
+            parser = Lark(MERMAID_GRAMMAR, **options)
+            _COMPILED_PARSERS[recognizer] = _make_recognizer(parser) if recognizer else parser
+    
+    return _COMPILED_PARSERS[recognizer]
+
+
 class MermaidInterpreter(Interpreter):
     """Interpreter for Mermaid sequence diagrams."""
     
-    def __init__(self):
+    def __init__(self, classifier: Optional[StepClassifier] = None, routes: Optional[RouteTrie] = None,
+                 step_pool: Optional[StepPool] = None):
         self.actors = {}
         self.steps = []
+        self.classifier = classifier or get_default_classifier()
+        self.routes = routes or get_default_routes()
+        self.step_pool = step_pool
+        # Control-flow structure; steps inside blocks are also in self.steps
+        self.flow = []
+        self.branch_points = 0
+        self._nodes = self.flow
+        self._open_blocks = []
     
     def declaration(self, tree):
         actor = str(tree.children[0])
-        alias = str(tree.children[1]) if len(tree.children) > 1 else actor
-        self.actors[actor] = alias
+        alias = str(tree.children[1]) if len(tree.children) > 1 else None
+        self.add_participant(actor, alias)
     
     def interaction(self, tree):
         source = str(tree.children[0])
         arrow = str(tree.children[1])
         target = str(tree.children[2])
-        message = str(tree.children[3]).strip('"') if len(tree.children) > 3 else ""
+        message = str(tree.children[3]) if len(tree.children) > 3 else ""
+        self.add_interaction(source, arrow, target, message)
+    
+    def note(self, tree):
+        position = str(tree.children[0])
+        actor = str(tree.children[1])
+        message = str(tree.children[-1])
+        self.add_note(position, actor, message)
+    
+    def alt(self, tree):
+        self._visit_block('alt', tree)
+    
+    def opt(self, tree):
+        self._visit_block('opt', tree)
+    
+    def loop(self, tree):
+        self._visit_block('loop', tree)
+    
+    def par(self, tree):
+        self._visit_block('par', tree)
+    
+    def _visit_block(self, kind: str, tree):
+        for i, arm in enumerate(tree.children):
+            label = str(arm.children[0]) if len(arm.children) > 1 else ""
+            if i == 0:
+                self.open_block(kind, label)
+            else:
+                self.add_arm(label)
+            self.visit(arm.children[-1])
+        self.close_block()
+    
+    def add_participant(self, actor: str, alias: Optional[str] = None) -> None:
+        """Record a participant declaration."""
+        self.actors[actor] = alias.strip().strip('"') if alias is not None else actor
+    
+    def add_interaction(self, source: str, arrow: str, target: str, message: str = "") -> None:
+        """Record a message between two actors as a test step."""
+        message = message.strip().strip('"')
         
         # Determine step type based on arrow and message
         step_type = self._determine_step_type(source, target, arrow, message)
@@ -72,12 +205,11 @@ class MermaidInterpreter(Interpreter):
             data=data
         )
         
-        self.steps.append(step)
+        self._add_step(step)
     
-    def note(self, tree):
-        position = str(tree.children[0])
-        actor = str(tree.children[1])
-        message = str(tree.children[2]).strip('"')
+    def add_note(self, position: str, actor: str, message: str) -> None:
+        """Record a note as a test step."""
+        message = message.strip().strip('"')
         
         step = TestStep(
             step_type=StepType.NOTE,
@@ -86,29 +218,36 @@ class MermaidInterpreter(Interpreter):
             description=message
         )
         
+        self._add_step(step)
+    
+    def open_block(self, kind: str, label: str = "") -> None:
+        """Start an ``alt``/``opt``/``loop``/``par`` block; following steps go into its first arm."""
+        block = FlowBlock(kind=kind, arms=[FlowArm(label=label.strip().strip('"'))])
+        self._nodes.append(block)
+        self._open_blocks.append((block, self._nodes))
+        self._nodes = block.arms[0].nodes
+        if kind in BRANCHING_BLOCKS:
+            self.branch_points += 1
+    
+    def add_arm(self, label: str = "") -> None:
+        """Start the next arm (``else``/``and``) of the innermost open block."""
+        block = self._open_blocks[-1][0]
+        block.arms.append(FlowArm(label=label.strip().strip('"')))
+        self._nodes = block.arms[-1].nodes
+    
+    def close_block(self) -> None:
+        """Close the innermost open block (``end``)."""
+        self._nodes = self._open_blocks.pop()[1]
+    
+    def _add_step(self, step: TestStep) -> None:
+        if self.step_pool is not None:
+            step = self.step_pool.intern(step)
         self.steps.append(step)
+        self._nodes.append(step)
     
     def _determine_step_type(self, source: str, target: str, arrow: str, message: str) -> StepType:
         """Determine the type of step based on actors and message."""
-        message_lower = message.lower()
-        
-        # Check for API calls
-        if any(method in message_lower for method in ['get ', 'post ', 'put ', 'delete ', 'patch ']):
-            return StepType.API_CALL
-        
-        # Check for user actions
-        if source.lower() in ['user', 'client', 'browser']:
-            if any(action in message_lower for action in ['click', 'type', 'enter', 'select', 'submit']):
-                return StepType.USER_ACTION
-            elif any(nav in message_lower for nav in ['navigate', 'go to', 'visit', 'open']):
-                return StepType.NAVIGATION
-        
-        # Check for assertions (return arrows)
-        if arrow.startswith('--'):
-            return StepType.ASSERTION
-        
-        # Default to user action for other cases
-        return StepType.USER_ACTION
+        return self.classifier.classify(source, target, arrow, message)
     
     def _extract_api_data(self, message: str) -> Dict:
         """Extract API method and endpoint from message."""
@@ -119,6 +258,7 @@ class MermaidInterpreter(Interpreter):
         if match:
             data['method'] = match.group(1).upper()
             data['endpoint'] = match.group(2)
+            data['template'] = self.routes.normalize(data['endpoint'])
         
         # Extract JSON payload if present
         json_match = re.search(r'\{.*\}', message)
@@ -131,38 +271,292 @@ class MermaidInterpreter(Interpreter):
 class MermaidParser(DiagramParser):
     """Parser for Mermaid sequence diagrams."""
     
-    def __init__(self):
-        self.parser = Lark(MERMAID_GRAMMAR, start='start', parser='lalr')
+    def __init__(self, cache: Optional[ScenarioCache] = None, use_cache: bool = True, fast_path: bool = True,
+                 classifier: Optional[StepClassifier] = None, max_paths: Optional[int] = DEFAULT_MAX_PATHS,
+                 prune: Optional[Callable[[FlowPath], bool]] = None, routes: Optional[RouteTrie] = None,
+                 share_steps: bool = True, step_pool: Optional[StepPool] = None,
+                 profile: Optional[ParseProfile] = None):
+        """Initialize the parser.
+        
+        Args:
+            cache: Scenario cache to use instead of the default one
+            use_cache: Cache parsed scenarios by block content
+            fast_path: Try the line parser before the Lark grammar
+            classifier: Step classifier (defaults to the built-in rules)
+            max_paths: Most scenarios expanded from one block's alt/opt paths (None for all)
+            prune: Drop alt/opt paths for which this returns True (see ``iter_paths``)
+            routes: Known route templates for normalizing API endpoints
+            share_steps: Make equal steps one immutable ``SharedStep`` across scenarios
+            step_pool: Pool to share steps through instead of the default one
+            profile: Collect per-phase timings and counters here (off when None)
+        """
+        self.parser = get_compiled_parser()
+        self.fast_path = fast_path
+        self.classifier = classifier or get_default_classifier()
+        self.max_paths = max_paths
+        self.prune = prune
+        self.routes = routes or get_default_routes()
+        self.step_pool = (step_pool or get_default_step_pool()) if share_steps else None
+        self.profile = profile
+        # Cached scenarios depend on the step rules, routes, path cap and step sharing as well
+        # as the parser: shared steps are pickled as immutable SharedSteps
+        self.version = (f"{PARSER_VERSION}-{self.classifier.fingerprint}-{self.routes.fingerprint}-p{max_paths}"
+                        f"-s{int(share_steps)}")
+        # A prune callback can't be part of the cache key
+        use_cache = use_cache and prune is None
+        if cache is None and use_cache:
+            cache = get_default_scenario_cache()
+        self.cache = cache if use_cache else None
+    
+    @property
+    def recognizer(self) -> Lark:
+        """LALR parser that only checks the grammar, without building a tree."""
+        return get_compiled_parser(recognizer=True)
     
-    def parse(self, content: str) -> List[TestScenario]:
-        """Parse Mermaid sequence diagram and extract test scenarios."""
-        scenarios = []
+    def parse(self, content: str, errors: Optional[List[str]] = None) -> List[TestScenario]:
+        """Parse Mermaid sequence diagram and extract test scenarios.
+        
+        Args:
+            content: Markdown or bare diagram text
+            errors: Collect block errors here instead of printing them to stderr
+        """
+        return list(self.parse_iter(io.StringIO(content), errors))
+    
+    def parse_iter(self, stream: Iterable[str], errors: Optional[List[str]] = None) -> Iterator[TestScenario]:
+        """Parse Mermaid blocks from a stream, yielding each scenario as soon as its block is parsed.
         
-        # Extract all Mermaid blocks from content
-        mermaid_blocks = self._extract_mermaid_blocks(content)
+        The stream is scanned line by line, so only the block being collected
+        is held in memory.
         
-        for idx, block in enumerate(mermaid_blocks):
-            if not self.validate(block):
-                continue
-            
+        Args:
+            stream: Text stream or any iterable of lines
+            errors: Collect block errors here instead of printing them to stderr
+        
+        Yields:
+            Test scenarios in document order
+        """
+        blocks = self.iter_blocks(stream)
+        if self.profile is not None:
+            blocks = self.profile.timed_iter('extract', blocks)
+        return self.parse_blocks(blocks, errors)
+    
+    def iter_blocks(self, stream: Iterable[str]) -> Iterator[str]:
+        """Yield the diagram blocks of a markdown stream without parsing them."""
+        return self._iter_mermaid_blocks(stream)
+    
+    def parse_blocks(self, blocks: Iterable[str], errors: Optional[List[str]] = None) -> Iterator[TestScenario]:
+        """Parse already extracted diagram blocks, yielding scenarios as in ``parse_iter``.
+        
+        Args:
+            blocks: Diagram block bodies in document order
+            errors: Collect block errors here instead of printing them to stderr
+        
+        Yields:
+            Test scenarios in block order
+        """
+        profile = self.profile
+        for idx, block in enumerate(blocks):
             try:
-                # Parse the diagram
-                tree = self.parser.parse(block)
-                
-                # Interpret the tree
-                interpreter = MermaidInterpreter()
-                interpreter.visit(tree)
-                
-                # Create scenario from interpreted steps
-                scenario = self._create_scenario(interpreter, idx)
-                scenarios.append(scenario)
-                
+                # Scenarios of a block's alt/opt paths are produced lazily too
+                if profile is None:
+                    yield from self._parse_block(block, idx)
+                else:
+                    profile.blocks += 1
+                    profile.bytes += len(block.encode('utf-8'))
+                    for scenario in self._parse_block(block, idx):
+                        profile.scenarios += 1
+                        yield scenario
+            
             except Exception as e:
+                if profile is not None:
+                    profile.failed_blocks += 1
                 # Log error but continue with other blocks
-                print(f"Error parsing block {idx}: {e}")
-                continue
+                self._report(f"Error parsing block {idx}: {e}", errors)
+    
+    def parse_incremental(self, content: str, previous: Optional[ParsedDocument] = None,
+                          errors: Optional[List[str]] = None) -> Tuple[ParsedDocument, DocumentDiff]:
+        """Re-parse only the blocks of a document that were added or changed.
+        
+        Blocks are matched against ``previous`` by content hash. Unchanged
+        blocks keep their scenario object and name even if they moved. An
+        edited block keeps the name of a block it replaced in the same place
+        if both start with the same actor.
+        
+        Args:
+            content: The new document content
+            previous: State returned by the last call for this document
+            errors: Collect block errors here instead of printing them to stderr
+        
+        Returns:
+            Tuple of the new document state and what changed
+        """
+        old_blocks = previous.blocks if previous else []
+        new_texts = self._extract_mermaid_blocks(content)
+        new_keys = [ScenarioCache.make_key(block, self.version) for block in new_texts]
+        
+        records: List[Optional[BlockRecord]] = [None] * len(new_texts)
+        edits: List[Tuple[List[BlockRecord], range]] = []
+        diff = DocumentDiff()
+        
+        for old_range, new_range, same in match_blocks([b.key for b in old_blocks], new_keys):
+            if same:
+                for old_idx, new_idx in zip(old_range, new_range):
+                    records[new_idx] = old_blocks[old_idx]
+                    diff.unchanged.extend(scenario.name for scenario in old_blocks[old_idx].scenarios)
+            else:
+                replaced = [old_blocks[i] for i in old_range if old_blocks[i].scenarios]
+                edits.append((replaced, new_range))
+        
+        taken = set(record.name for record in records if record is not None and record.name)
+        for replaced, new_range in edits:
+            for new_idx in new_range:
+                try:
+                    scenarios = list(self._parse_block(new_texts[new_idx], new_idx))
+                except Exception as e:
+                    self._report(f"Error parsing block {new_idx}: {e}", errors)
+                    scenarios = []
+                diff.reparsed_blocks += 1
+                
+                name = None
+                if scenarios:
+                    old = self._take_replaced(scenarios[0], replaced, taken)
+                    if old is not None:
+                        name = old.name
+                        self._name_block(scenarios, name)
+                        # Paths present before count as changed, new ones as added
+                        old_names = [scenario.name for scenario in old.scenarios]
+                        for scenario in scenarios:
+                            (diff.changed if scenario.name in old_names else diff.added).append(scenario.name)
+                        new_names = set(scenario.name for scenario in scenarios)
+                        diff.removed.extend(n for n in old_names if n not in new_names)
+                    else:
+                        name = self._free_name(scenarios[0], new_idx, len(new_texts), taken)
+                        self._name_block(scenarios, name)
+                        diff.added.extend(scenario.name for scenario in scenarios)
+                    taken.add(name)
+                
+                records[new_idx] = BlockRecord(key=new_keys[new_idx], scenarios=scenarios, name=name)
+            
+            for old in replaced:
+                diff.removed.extend(scenario.name for scenario in old.scenarios)
+        
+        return ParsedDocument(blocks=records), diff
+    
+    @staticmethod
+    def _report(message: str, errors: Optional[List[str]]) -> None:
+        """Collect a block error, or print it to stderr (stdout may be a protocol channel)."""
+        if errors is None:
+            print(message, file=sys.stderr)
+        else:
+            errors.append(message)
+    
+    @staticmethod
+    def _take_replaced(scenario: TestScenario, replaced: List[BlockRecord], taken: set) -> Optional[BlockRecord]:
+        """Pop the first replaced block whose scenarios start with the same actor."""
+        lead = list(scenario.metadata['actors'])[:1]
+        for i, old in enumerate(replaced):
+            if list(old.scenarios[0].metadata['actors'])[:1] == lead and old.name not in taken:
+                return replaced.pop(i)
+        return None
+    
+    def _free_name(self, scenario: TestScenario, idx: int, count: int, taken: set) -> str:
+        """Index-based name for a new scenario that doesn't clash with kept ones."""
+        actors = list(scenario.metadata['actors'])
+        name = self._scenario_name(actors, idx)
+        while name in taken:
+            name = self._scenario_name(actors, count)
+            count += 1
+        return name
+    
+    def _parse_block(self, block: str, idx: int) -> Iterator[TestScenario]:
+        """Turn one diagram block into scenarios, going through the cache if enabled.
+        
+        A block yields one scenario per alt/opt path. Without a cache they are
+        created lazily as the caller consumes them.
+        """
+        if self.cache is None:
+            interpreter = self._interpret(block)
+            if interpreter is not None:
+                yield from self._timed('scenarios', self._create_scenarios(interpreter, idx))
+            return
         
-        return scenarios
+        key = ScenarioCache.make_key(block, self.version)
+        with self._phase('cache'):
+            hit, scenarios = self.cache.get(key)
+        if hit:
+            if self.profile is not None:
+                self.profile.cache_hits += 1
+            # Cached scenarios were named after the index they were first seen at
+            if scenarios:
+                if self.step_pool is not None:
+                    for scenario in scenarios:
+                        self.step_pool.intern_scenario(scenario)
+                self._name_block(scenarios, self._scenario_name(list(scenarios[0].metadata['actors']), idx))
+            yield from scenarios
+            return
+        
+        scenarios = []
+        interpreter = self._interpret(block)
+        if interpreter is not None:
+            scenarios = list(self._timed('scenarios', self._create_scenarios(interpreter, idx)))
+        
+        with self._phase('cache'):
+            self.cache.put(key, scenarios)
+        yield from scenarios
+    
+    def _phase(self, name: str):
+        """Context manager timing a phase, or a no-op when not profiling."""
+        return self.profile.phase(name) if self.profile is not None else nullcontext()
+    
+    def _timed(self, phase: str, iterator: Iterator[TestScenario]) -> Iterator[TestScenario]:
+        return self.profile.timed_iter(phase, iterator) if self.profile is not None else iterator
+    
+    def _interpret(self, block: str) -> Optional[MermaidInterpreter]:
+        """Interpret a block, or return None if it is not a valid diagram."""
+        profile = self.profile
+        classifier = self.classifier if profile is None else TimedClassifier(self.classifier, profile)
+        
+        if self.fast_path and 'sequenceDiagram' in block:
+            interpreter = MermaidInterpreter(classifier, self.routes, self.step_pool)
+            with self._phase('fastpath'):
+                scanned = scan_sequence(self._normalize_block(block), interpreter)
+            if scanned:
+                if profile is not None:
+                    profile.steps += len(interpreter.steps)
+                return interpreter
+        
+        # Parse the diagram once; invalid blocks come back without a tree
+        with self._phase('lark'):
+            valid, tree = self.parse_tree(block)
+        if not valid:
+            if profile is not None:
+                profile.failed_blocks += 1
+            return None
+        
+        # Interpret the tree
+        interpreter = MermaidInterpreter(classifier, self.routes, self.step_pool)
+        with self._phase('interpret'):
+            interpreter.visit(tree)
+        if profile is not None:
+            profile.steps += len(interpreter.steps)
+        return interpreter
+    
+    def parse_tree(self, content: str) -> Tuple[bool, Optional[Tree]]:
+        """Parse a single diagram block once.
+        
+        Args:
+            content: The diagram block to parse
+        
+        Returns:
+            Tuple of the validity verdict and the parse tree (None if invalid)
+        """
+        if 'sequenceDiagram' not in content:
+            return False, None
+        
+        try:
+            return True, self.parser.parse(self._normalize_block(content))
+        except LarkError:
+            return False, None
     
     def validate(self, content: str) -> bool:
         """Validate if content is a valid Mermaid sequence diagram."""
@@ -170,39 +564,87 @@ class MermaidParser(DiagramParser):
         if 'sequenceDiagram' not in content:
             return False
         
+        # The recognizer checks the grammar without building steps or a tree;
+        # the fast path would classify every message just to throw them away
         try:
-            self.parser.parse(content)
+            self.recognizer.parse(self._normalize_block(content))
             return True
-        except:
+        except LarkError:
             return False
     
+    @staticmethod
+    def _normalize_block(block: str) -> str:
+        """Terminate the last statement, since every statement ends with a newline."""
+        return block if block.endswith('\n') else block + '\n'
+    
     def _extract_mermaid_blocks(self, content: str) -> List[str]:
         """Extract Mermaid code blocks from markdown content."""
-        blocks = []
+        return list(self._iter_mermaid_blocks(io.StringIO(content)))
+    
+    def _iter_mermaid_blocks(self, stream: Iterable[str]) -> Iterator[str]:
+        """Scan markdown line by line and yield the body of each ```mermaid block.
+        
+        Lines outside fenced blocks are dropped as they are read. A document
+        without any fence is one bare diagram, which only parses if its first
+        non-blank line is ``sequenceDiagram``; only such a document is kept
+        until a fence shows up or the stream ends.
+        """
+        block: Optional[List[str]] = None
+        bare: Optional[List[str]] = None
+        leading = True
+        found = False
         
-        # Pattern for code blocks with mermaid language
-        pattern = r'```mermaid\s*\n(.*?)\n```'
-        matches = re.findall(pattern, content, re.DOTALL)
-        blocks.extend(matches)
+        for line in stream:
+            if block is None:
+                head, fence, tail = line.partition('```mermaid')
+                if fence and not tail.strip():
+                    block = []
+                    found = True
+                    bare = None
+                    leading = False
+                elif bare is not None:
+                    bare.append(line)
+                elif leading and line.strip():
+                    leading = False
+                    if line.lstrip().startswith('sequenceDiagram'):
+                        bare = [line]
+            elif line.startswith('```'):
+                yield "".join(block).rstrip('\r\n')
+                block = None
+            elif block or line.strip():
+                # Blank lines right after the opening fence are skipped
+                block.append(line)
         
-        # If no code blocks found, try to parse the entire content
-        if not blocks and 'sequenceDiagram' in content:
-            blocks.append(content)
+        if not found and bare is not None:
+            yield "".join(bare)
+    
+    def _create_scenarios(self, interpreter: MermaidInterpreter, idx: int) -> Iterator[TestScenario]:
+        """Create one test scenario per execution path through the diagram."""
+        if not interpreter.branch_points:
+            # loop and par blocks don't branch, so their steps run in document order
+            yield self._create_scenario(interpreter, idx)
+            return
         
-        return blocks
+        paths = iter_paths(interpreter.flow, limit=self.max_paths, prune=self.prune)
+        for path_index, path in enumerate(paths):
+            yield self._create_scenario(interpreter, idx, path, path_index)
     
-    def _create_scenario(self, interpreter: MermaidInterpreter, idx: int) -> TestScenario:
+    def _create_scenario(self, interpreter: MermaidInterpreter, idx: int,
+                         path: Optional[FlowPath] = None, path_index: int = 0) -> TestScenario:
         """Create test scenario from interpreted data."""
-        # Generate scenario name based on actors or index
-        actors = list(interpreter.actors.keys())
-        if actors:
-            name = f"{actors[0]}_flow_{idx}"
-        else:
-            name = f"scenario_{idx}"
+        name = self._scenario_name(list(interpreter.actors.keys()), idx)
+        steps = interpreter.steps
+        metadata = {'actors': interpreter.actors}
+        if path is not None:
+            name = self._path_name(name, path_index)
+            steps = path.steps
+            metadata['path_index'] = path_index
+            metadata['conditions'] = path.conditions
+        metadata['total_steps'] = len(steps)
         
         # Analyze steps to create description
-        api_calls = [s for s in interpreter.steps if s.step_type == StepType.API_CALL]
-        user_actions = [s for s in interpreter.steps if s.step_type == StepType.USER_ACTION]
+        api_calls = [s for s in steps if s.step_type == StepType.API_CALL]
+        user_actions = [s for s in steps if s.step_type == StepType.USER_ACTION]
         
         description_parts = []
         if user_actions:
@@ -211,15 +653,34 @@ class MermaidParser(DiagramParser):
             description_parts.append(f"{len(api_calls)} API calls")
         
         description = f"Test scenario with {', '.join(description_parts)}" if description_parts else "Test scenario"
+        if path is not None and metadata['conditions']:
+            description += f" ({', '.join(metadata['conditions'])})"
         
         scenario = TestScenario(
             name=name,
             description=description,
-            steps=interpreter.steps,
-            metadata={
-                'actors': interpreter.actors,
-                'total_steps': len(interpreter.steps)
-            }
+            steps=steps,
+            metadata=metadata
         )
         
-        return scenario
\ No newline at end of file
+        return scenario
+    
+    def _name_block(self, scenarios: List[TestScenario], name: str) -> None:
+        """Name the scenarios of one block after the block's name."""
+        for scenario in scenarios:
+            if 'path_index' in scenario.metadata:
+                scenario.name = self._path_name(name, scenario.metadata['path_index'])
+            else:
+                scenario.name = name
+    
+    @staticmethod
+    def _path_name(name: str, path_index: int) -> str:
+        """Name of the scenario for one alt/opt path of a block."""
+        return f"{name}_path_{path_index}"
+    
+    @staticmethod
+    def _scenario_name(actors: List[str], idx: int) -> str:
+        """Generate scenario name based on actors or index."""
+        if actors:
+            return f"{actors[0]}_flow_{idx}"
+        return f"scenario_{idx}"
\ No newline at end of file
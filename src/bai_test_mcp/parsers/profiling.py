@@ -0,0 +1,145 @@
+import time
+import cProfile
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Report order; "classify" runs inside "fastpath" and "interpret"
+PHASES = ('extract', 'cache', 'fastpath', 'lark', 'interpret', 'classify', 'scenarios')
+NESTED_PHASES = frozenset(['classify'])
+
+
+class ParseProfile:
+    """Per-phase timers and counters for a MermaidParser.
+    
+    Pass one to ``MermaidParser(profile=...)`` to turn instrumentation on; a
+    parser without a profile skips all of it. Phases:
+    
+    - ``extract``: finding mermaid blocks in the document
+    - ``cache``: scenario cache lookups and stores
+    - ``fastpath``: the line scanner, including the steps it builds
+    - ``lark``: Lark parsing of blocks the fast path rejected
+    - ``interpret``: visiting Lark trees
+    - ``classify``: step classification (part of fastpath/interpret)
+    - ``scenarios``: expanding paths into TestScenario objects
+    
+    Other phases, such as test generation, can be timed with ``phase()``.
+    """
+    
+    def __init__(self):
+        self.times: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.blocks = 0
+        self.failed_blocks = 0
+        self.cache_hits = 0
+        self.steps = 0
+        self.scenarios = 0
+        self.bytes = 0
+    
+    def add(self, phase: str, elapsed: float) -> None:
+        """Record one timed call of a phase."""
+        self.times[phase] = self.times.get(phase, 0.0) + elapsed
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the body of a ``with`` statement as one call of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    def timed_iter(self, phase: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Iterate while charging the time spent producing each item to a phase."""
+        clock = time.perf_counter
+        iterator = iter(iterable)
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(phase, clock() - start)
+                return
+            self.add(phase, clock() - start)
+            yield item
+    
+    @property
+    def total(self) -> float:
+        """Time spent in all top-level phases."""
+        return sum(elapsed for phase, elapsed in self.times.items() if phase not in NESTED_PHASES)
+    
+    def reset(self) -> None:
+        self.__init__()
+    
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'blocks': self.blocks,
+            'failed_blocks': self.failed_blocks,
+            'cache_hits': self.cache_hits,
+            'steps': self.steps,
+            'scenarios': self.scenarios,
+            'bytes': self.bytes,
+            'phases': {
+                phase: {'seconds': self.times[phase], 'calls': self.calls[phase]}
+                for phase in self._ordered_phases()
+            },
+        }
+    
+    def _ordered_phases(self) -> List[str]:
+        known = [phase for phase in PHASES if phase in self.times]
+        return known + sorted(phase for phase in self.times if phase not in PHASES)
+    
+    def report(self) -> str:
+        """Human-readable table of the phases and counters."""
+        total = self.total
+        lines = [f"{'phase':<12} {'ms':>10} {'calls':>8} {'share':>7}"]
+        for phase in self._ordered_phases():
+            elapsed = self.times[phase]
+            share = f"{elapsed / total * 100:6.1f}%" if total else "      -"
+            label = f"  {phase}" if phase in NESTED_PHASES else phase
+            lines.append(f"{label:<12} {elapsed * 1e3:10.2f} {self.calls[phase]:8d} {share}")
+        lines.append(f"{'total':<12} {total * 1e3:10.2f}")
+        lines.append(f"{self.blocks} block(s) ({self.failed_blocks} failed, {self.cache_hits} cached), "
+                     f"{self.steps} step(s), {self.scenarios} scenario(s), {self.bytes} byte(s)")
+        return "\n".join(lines)
+
+
+class TimedClassifier:
+    """Step classifier wrapper that charges ``classify`` calls to a profile."""
+    
+    __slots__ = ('classifier', 'profile')
+    
+    def __init__(self, classifier, profile: ParseProfile):
+        self.classifier = classifier
+        self.profile = profile
+    
+    def classify(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.classifier.classify(*args, **kwargs)
+        finally:
+            self.profile.add('classify', time.perf_counter() - start)
+    
+    def __getattr__(self, name):
+        return getattr(self.classifier, name)
+
+
+@contextmanager
+def cprofile_to(path: Optional[str]) -> Iterator[Optional[cProfile.Profile]]:
+    """Run the body under cProfile and dump the stats to ``path`` (a no-op for None).
+    
+    The dump can be read with ``python -m pstats`` or tools such as snakeviz.
+    """
+    if path is None:
+        yield None
+        return
+    
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,179 @@
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import yaml
+
+
+_HTTP_METHODS = frozenset(['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS'])
+
+# Segments that hold a value rather than naming a resource
+_PARAM_RE = re.compile(r'^\{([^{}/]+)\}$|^:([A-Za-z_][A-Za-z0-9_]*)$')
+_UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+_HEX_ID_RE = re.compile(r'^(?=[a-fA-F]*[0-9])[0-9a-fA-F]{24,}$')
+
+
+def split_path(endpoint: str) -> List[str]:
+    """Path segments of an endpoint, ignoring query string, fragment and extra slashes."""
+    path = endpoint.split('?', 1)[0].split('#', 1)[0]
+    return [segment for segment in path.split('/') if segment]
+
+
+def normalize_segment(segment: str) -> str:
+    """Template form of one raw path segment.
+    
+    ``{param}`` and ``:param`` become ``{param}``, numbers and long hex
+    strings become ``{id}``, UUIDs become ``{uuid}``; other segments are kept.
+    """
+    if segment.isdigit():
+        return '{id}'
+    if segment[0] in '{:':
+        match = _PARAM_RE.match(segment)
+        if match:
+            return '{%s}' % (match.group(1) or match.group(2))
+    if len(segment) == 36 and _UUID_RE.match(segment):
+        return '{uuid}'
+    if len(segment) >= 24 and _HEX_ID_RE.match(segment):
+        return '{id}'
+    return segment
+
+
+def _join(segments: Iterable[str]) -> str:
+    return '/' + '/'.join(segments)
+
+
+class _Node:
+    """One path segment of the route trie."""
+    
+    __slots__ = ('children', 'param', 'template')
+    
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.param: Optional['_Node'] = None
+        self.template: Optional[str] = None
+
+
+class RouteTrie:
+    """Segment trie of known route templates, used to normalize concrete endpoints.
+    
+    ``/api/users/42`` matches the route ``/api/users/{id}`` (or ``:id``) and
+    normalizes to ``/api/users/{id}``. Literal segments win over parameters,
+    so ``/api/users/me`` still matches a ``/api/users/me`` route. Endpoints
+    no route matches are normalized segment by segment instead (see
+    ``normalize_segment``).
+    """
+    
+    def __init__(self, routes: Iterable[str] = ()):
+        self._root = _Node()
+        self.routes: List[str] = []
+        for route in routes:
+            self.add(route)
+    
+    def __len__(self) -> int:
+        return len(self.routes)
+    
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the known routes, for cache keys."""
+        return hashlib.sha256("\n".join(sorted(self.routes)).encode('utf-8')).hexdigest()[:16]
+    
+    def add(self, route: str) -> str:
+        """Add a route template; a leading HTTP method is ignored.
+        
+        Returns:
+            The template as ``normalize`` reports it, with ``:param`` written as ``{param}``
+        """
+        route = route.strip()
+        method, _, rest = route.partition(' ')
+        if rest and method.upper() in _HTTP_METHODS:
+            route = rest.strip()
+        
+        node = self._root
+        segments = []
+        for segment in split_path(route):
+            match = _PARAM_RE.match(segment)
+            if match:
+                segments.append('{%s}' % (match.group(1) or match.group(2)))
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                segments.append(segment)
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Node()
+                node = child
+        
+        template = _join(segments)
+        if node.template is None:
+            node.template = template
+            self.routes.append(template)
+        return node.template
+    
+    def match(self, endpoint: str) -> Optional[str]:
+        """Template of the known route matching an endpoint, or None."""
+        return self._match(self._root, split_path(endpoint), 0)
+    
+    def _match(self, node: _Node, segments: List[str], idx: int) -> Optional[str]:
+        while idx < len(segments):
+            child = node.children.get(segments[idx])
+            if child is None:
+                if node.param is None:
+                    return None
+                node = node.param
+            elif node.param is not None:
+                # Both fit: try the literal branch first, fall back to the parameter
+                found = self._match(child, segments, idx + 1)
+                if found is not None:
+                    return found
+                node = node.param
+            else:
+                node = child
+            idx += 1
+        return node.template
+    
+    def normalize(self, endpoint: str) -> str:
+        """Template an endpoint belongs to, e.g. ``/api/users/{id}`` for ``/api/users/42?x=1``."""
+        template = self.match(endpoint)
+        if template is not None:
+            return template
+        return _join(normalize_segment(segment) for segment in split_path(endpoint))
+    
+    @classmethod
+    def from_file(cls, path: str) -> "RouteTrie":
+        """Load project routes.
+        
+        Accepts an OpenAPI document (YAML or JSON, its ``paths`` are used), a
+        YAML/JSON list of routes or ``{"routes": [...]}``, or a text file with
+        one route per line. Routes may be prefixed with an HTTP method;
+        blank lines and ``#`` comments are skipped.
+        """
+        route_path = Path(path)
+        if not route_path.exists():
+            raise FileNotFoundError(f"Route file not found: {path}")
+        
+        with open(route_path, 'r', encoding='utf-8') as f:
+            if route_path.suffix in ['.yaml', '.yml']:
+                config = yaml.safe_load(f) or []
+            elif route_path.suffix == '.json':
+                config = json.load(f)
+            else:
+                config = [line.split('#', 1)[0] for line in f]
+        
+        if isinstance(config, dict):
+            config = list(config['paths']) if 'paths' in config else config.get('routes', [])
+        
+        return cls(route for route in config if route.strip())
+
+
+_default_routes: Optional[RouteTrie] = None
+
+
+def get_default_routes() -> RouteTrie:
+    """Get the shared trie without project routes (segment heuristics only)."""
+    global _default_routes
+    if _default_routes is None:
+        _default_routes = RouteTrie()
+    return _default_routes
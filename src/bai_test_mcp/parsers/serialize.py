@@ -0,0 +1,156 @@
+import json
+import marshal
+import sys
+from typing import Any, Dict, IO, Iterable, Iterator, List, Tuple
+
+from .base import EMPTY_DATA, StepList, StepType, TestScenario, TestStep
+
+
+# Bump when the encoded layout changes; readers reject versions they don't know
+FORMAT_VERSION = 1
+
+JSONL_FORMAT = "bai-autotest-scenarios"
+BINARY_MAGIC = b"BAIS"
+
+# marshal's own format version; 4 shares repeated interned strings (actors, step types)
+_MARSHAL_VERSION = 4
+
+_STEP_TYPES: Dict[str, StepType] = {step_type.value: step_type for step_type in StepType}
+
+_new_step = TestStep.__new__
+_new_scenario = TestScenario.__new__
+
+
+def _step_type(value: Any) -> StepType:
+    try:
+        return _STEP_TYPES[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown step type {value!r}") from None
+
+
+def _check_version(version: Any) -> None:
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported scenario format version {version!r} (expected {FORMAT_VERSION})")
+
+
+def dump_jsonl(scenarios: Iterable[TestScenario], fp: IO[str]) -> int:
+    """Write scenarios as JSON lines: a header line, then one scenario per line.
+    
+    Args:
+        scenarios: Scenarios to write
+        fp: Text stream to write to
+    
+    Returns:
+        Number of scenarios written
+    """
+    fp.write(json.dumps({'format': JSONL_FORMAT, 'version': FORMAT_VERSION}) + "\n")
+    count = 0
+    for scenario in scenarios:
+        fp.write(json.dumps(scenario.to_dict(), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def load_jsonl(fp: Iterable[str]) -> Iterator[TestScenario]:
+    """Read scenarios written by ``dump_jsonl``, one line at a time.
+    
+    Raises:
+        ValueError: If the header is missing, has an unknown version or a
+            step has an unknown type
+    """
+    lines = iter(fp)
+    header = json.loads(next(lines, 'null'))
+    if not isinstance(header, dict) or header.get('format') != JSONL_FORMAT:
+        raise ValueError("Not a scenario JSON-lines stream")
+    _check_version(header.get('version'))
+    
+    for line in lines:
+        if line.strip():
+            yield _scenario_from_dict(json.loads(line))
+
+
+def _scenario_from_dict(data: Dict[str, Any]) -> TestScenario:
+    """``TestScenario.from_dict`` without the per-step constructor calls."""
+    scenario = _new_scenario(TestScenario)
+    scenario.name = data['name']
+    scenario.description = data['description']
+    scenario._steps = StepList([_step_from_dict(step) for step in data.get('steps', ())])
+    scenario.metadata = data.get('metadata', {})
+    return scenario
+
+
+def _step_from_dict(data: Dict[str, Any]) -> TestStep:
+    """``TestStep.from_dict`` setting the slots directly."""
+    step = _new_step(TestStep)
+    step.step_type = _step_type(data['type'])
+    step.actor = sys.intern(data['actor'])
+    target = data.get('target')
+    step.target = sys.intern(target) if target is not None else None
+    step.action = data.get('action', "")
+    step._data = data.get('data') or EMPTY_DATA
+    step.expected = data.get('expected')
+    step._description = data.get('description') or None
+    return step
+
+
+def _step_record(step: TestStep) -> Tuple:
+    data = step._data
+    if data and data.__class__ is not dict:
+        # marshal only takes exact dicts, not the read-only data of shared steps
+        data = dict(data)
+    return (step.step_type.value, step.actor, step.target, step.action, data or None,
+            step.expected, step._description)
+
+
+def _scenario_record(scenario: TestScenario) -> Tuple:
+    return (scenario.name, scenario.description, scenario.metadata,
+            tuple(_step_record(step) for step in scenario.steps))
+
+
+def _step_from_record(record: Tuple) -> TestStep:
+    # Slots are set directly: actor and target come back interned from marshal,
+    # and empty data and descriptions were stored as None
+    step = _new_step(TestStep)
+    step_type, step.actor, step.target, step.action, data, step.expected, step._description = record
+    step.step_type = _step_type(step_type)
+    step._data = data or EMPTY_DATA
+    return step
+
+
+def _scenario_from_record(record: Tuple) -> TestScenario:
+    scenario = _new_scenario(TestScenario)
+    scenario.name, scenario.description, scenario.metadata, steps = record
+    scenario._steps = StepList([_step_from_record(step) for step in steps])
+    return scenario
+
+
+def dumps_binary(scenarios: Iterable[TestScenario]) -> bytes:
+    """Encode scenarios in the compact binary form.
+    
+    The payload is a tuple layout serialized with ``marshal``. It is much
+    faster than pickling the objects, but marshal data is only guaranteed to
+    load on the same Python version; use JSON lines for long-term storage.
+    Step data, expected values and metadata must be plain Python data
+    (dicts, lists, tuples, strings, numbers, booleans and None).
+    
+    Warning:
+        ``marshal`` is not secure against crafted data. Never pass payloads
+        from untrusted or unauthenticated sources to ``loads_binary``.
+    """
+    records = tuple(_scenario_record(scenario) for scenario in scenarios)
+    return BINARY_MAGIC + bytes([FORMAT_VERSION]) + marshal.dumps(records, _MARSHAL_VERSION)
+
+
+def loads_binary(payload: bytes) -> List[TestScenario]:
+    """Decode scenarios encoded by ``dumps_binary``.
+    
+    Raises:
+        ValueError: If the payload is not a scenario blob, has an unknown
+            version or holds an unknown step type
+    """
+    if len(payload) <= len(BINARY_MAGIC) or payload[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("Not a binary scenario payload")
+    _check_version(payload[len(BINARY_MAGIC)])
+    
+    records = marshal.loads(payload[len(BINARY_MAGIC) + 1:])
+    return [_scenario_from_record(record) for record in records]
@@ -0,0 +1,46 @@
+"""Parallel directory parsing."""
+
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from bai_test_mcp.cli import cli
+from bai_test_mcp.parsers import BatchStats, MermaidParser, parse_directory
+
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def summary(results):
+    return [(Path(result.path).name, [s.name for s in result.scenarios]) for result in results]
+
+
+@pytest.mark.parametrize("jobs", [1, 2, 0])
+def test_parallel_results_match_a_serial_parse(jobs):
+    stats = BatchStats()
+    results = list(parse_directory(str(EXAMPLES), jobs=jobs, use_cache=False, stats=stats))
+    
+    parser = MermaidParser(use_cache=False)
+    expected = [(path.name, [s.name for s in parser.parse(path.read_text(encoding='utf-8'))])
+                for path in sorted(EXAMPLES.glob("**/*.md"))]
+    assert summary(results) == expected
+    assert stats.files == len(expected)
+    assert stats.scenarios == sum(len(scenarios) for _, scenarios in expected)
+
+
+def test_max_paths_caps_each_diagram():
+    capped = list(parse_directory(str(EXAMPLES), jobs=1, use_cache=False, max_paths=1))
+    full = list(parse_directory(str(EXAMPLES), jobs=1, use_cache=False, max_paths=None))
+    assert all(len(result.scenarios) <= result.blocks for result in capped)
+    assert sum(len(r.scenarios) for r in capped) < sum(len(r.scenarios) for r in full)
+
+
+def test_cli_options():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["parse-dir", str(EXAMPLES), "--no-cache", "-j", "1", "--max-paths", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Parsed" in result.output
+    
+    result = runner.invoke(cli, ["parse-dir", str(EXAMPLES), "-j", "-1"])
+    assert result.exit_code != 0
@@ -0,0 +1,46 @@
+"""Scenario cache tests."""
+
+from pathlib import Path
+
+import pytest
+
+from bai_test_mcp.parsers import MermaidParser, SharedStep, StepPool
+from bai_test_mcp.parsers.cache import ScenarioCache
+
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "examples" / "auth_flow.md"
+
+
+@pytest.fixture
+def cache():
+    return ScenarioCache(persistent=False)
+
+
+def test_step_sharing_is_part_of_the_cache_key(cache):
+    content = EXAMPLE.read_text(encoding='utf-8')
+    shared = MermaidParser(cache=cache, step_pool=StepPool()).parse(content)
+    plain = MermaidParser(cache=cache, share_steps=False).parse(content)
+    
+    assert cache.stats.hits == 0
+    assert plain == shared
+    assert all(isinstance(step, SharedStep) for scenario in shared for step in scenario.steps)
+    assert not any(isinstance(step, SharedStep) for scenario in plain for step in scenario.steps)
+    plain[0].steps[0].description = "edited"
+    
+    # Each setting hits its own entries
+    misses = cache.stats.misses
+    again = MermaidParser(cache=cache, share_steps=False).parse(content)
+    assert cache.stats.misses == misses and cache.stats.hits > 0
+    assert again == MermaidParser(use_cache=False, share_steps=False).parse(content)
+    assert not any(isinstance(step, SharedStep) for scenario in again for step in scenario.steps)
+
+
+def test_counters_are_reported(cache):
+    content = EXAMPLE.read_text(encoding='utf-8')
+    MermaidParser(cache=cache).parse(content)
+    MermaidParser(cache=cache).parse(content)
+    
+    stats = cache.stats
+    assert stats.misses == stats.stores == stats.memory_hits > 0
+    assert cache.stats.report() == (f"{stats.memory_hits} memory hit(s), 0 disk hit(s), "
+                                    f"{stats.misses} miss(es), {stats.stores} store(s)")
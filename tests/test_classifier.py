@@ -0,0 +1,106 @@
+"""Step classification rules."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bai_test_mcp.parsers import MermaidParser
+from bai_test_mcp.parsers.base import StepType
+from bai_test_mcp.parsers.classifier import StepClassifier
+
+
+EXAMPLES_RULES = str(Path(__file__).resolve().parent.parent / "examples" / "step_rules.yaml")
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return StepClassifier()
+
+
+@pytest.mark.parametrize("source,arrow,message,expected", [
+    ("Frontend", "->>", "POST /api/auth/login", StepType.API_CALL),
+    ("User", "->>", "Click Login", StepType.USER_ACTION),
+    ("User", "->>", "이메일 입력", StepType.USER_ACTION),
+    ("User", "->>", "ログインをクリック", StepType.USER_ACTION),
+    ("User", "->>", "点击登录", StepType.USER_ACTION),
+    ("User", "->>", "Navigate to /login", StepType.NAVIGATION),
+    ("사용자", "->>", "로그인 페이지 접속", StepType.NAVIGATION),
+    ("Frontend", "->>", "Verify the banner", StepType.USER_ACTION),
+    ("API", "-->>", "200 OK", StepType.ASSERTION),
+    ("Frontend", "->>", "render", StepType.USER_ACTION),
+])
+def test_default_rules(classifier, source, arrow, message, expected):
+    assert classifier.classify(source, "Target", arrow, message) is expected
+
+
+def test_actor_rules_only_apply_to_their_actors(classifier):
+    # "open" is a navigation keyword for users only
+    assert classifier.classify("User", "App", "->>", "open settings") is StepType.NAVIGATION
+    assert classifier.classify("Scheduler", "App", "->>", "open settings") is StepType.USER_ACTION
+
+
+@pytest.mark.parametrize("arrow,expected", [
+    ("->>", StepType.USER_ACTION),
+    ("-x", StepType.USER_ACTION),
+    ("-->>", StepType.ASSERTION),
+    ("--x", StepType.ASSERTION),
+])
+def test_checking_words_only_assert_on_reply_arrows(classifier, arrow, expected):
+    # A request to check something is not itself an assertion
+    assert classifier.classify("API", "Security", arrow, "비밀번호 검증") is expected
+
+
+def test_earlier_rules_win(classifier):
+    # Both an API verb and an assertion keyword; the API rule comes first
+    assert classifier.classify("Frontend", "API", "->>", "GET /api/verify") is StepType.API_CALL
+
+
+def test_overlapping_keywords_are_all_seen():
+    classifier = StepClassifier([
+        {"type": "wait", "keywords": ["load"]},
+        {"type": "navigation", "keywords": ["lo"]},
+    ])
+    assert classifier.classify("A", "B", "->>", "reload page") is StepType.WAIT
+    assert classifier.classify("A", "B", "->>", "lower page") is StepType.NAVIGATION
+    assert classifier.classify("A", "B", "->>", "nothing") is StepType.USER_ACTION
+
+
+def test_patterns():
+    classifier = StepClassifier([{"type": "api_call", "patterns": [r"\b(?:head|options)\s+/"]}],
+                                default=StepType.WAIT)
+    assert classifier.classify("A", "B", "->>", "HEAD /health") is StepType.API_CALL
+    assert classifier.classify("A", "B", "->>", "ahead /x") is StepType.WAIT
+
+
+def test_project_rules_extend_the_defaults():
+    classifier = StepClassifier.from_file(EXAMPLES_RULES)
+    assert classifier.classify("Frontend", "User", "->>", "대기") is StepType.WAIT
+    assert classifier.classify("Frontend", "User", "->>", "대시보드로 이동") is StepType.NAVIGATION
+    assert classifier.classify("Frontend", "API", "->>", "OPTIONS /api/x") is StepType.API_CALL
+    assert classifier.classify("User", "Frontend", "->>", "클릭") is StepType.USER_ACTION
+
+
+def test_project_rules_can_replace_the_defaults(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"extend": False, "default": "wait",
+                                "rules": [{"type": "api_call", "keywords": ["call"]}]}))
+    classifier = StepClassifier.from_file(str(path))
+    assert classifier.classify("A", "B", "->>", "call it") is StepType.API_CALL
+    assert classifier.classify("A", "B", "->>", "GET /api/x") is StepType.WAIT
+
+
+def test_unsupported_rule_file(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("")
+    with pytest.raises(ValueError):
+        StepClassifier.from_file(str(path))
+    with pytest.raises(FileNotFoundError):
+        StepClassifier.from_file(str(tmp_path / "missing.yaml"))
+
+
+def test_fingerprint_follows_the_rules():
+    assert StepClassifier().fingerprint == StepClassifier().fingerprint
+    assert StepClassifier().fingerprint != StepClassifier([]).fingerprint
+    assert MermaidParser(use_cache=False).version != \
+        MermaidParser(use_cache=False, classifier=StepClassifier([])).version
@@ -0,0 +1,119 @@
+"""Differential tests: the fast-path line parser against the Lark grammar path."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from bai_test_mcp.parsers.fastpath import scan_sequence
+from bai_test_mcp.parsers.mermaid import MermaidInterpreter, MermaidParser
+
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def example_blocks():
+    blocks = []
+    for path in sorted(EXAMPLES.glob("*.md")):
+        blocks.extend(re.findall(r'```mermaid\s*\n(.*?)\n```', path.read_text(encoding='utf-8'), re.DOTALL))
+    return blocks
+
+
+# Inside the fast-path subset
+SUPPORTED = [
+    "sequenceDiagram\n    participant A as \"Quoted\"  \n    A  ->>  B  :   hi  \n",
+    "sequenceDiagram\n    User->>Frontend: \"Click Login\"\n    Frontend-->>User: \"Welcome, {name}\"\n",
+    "sequenceDiagram\n    A-->>B: done\n    A-->>+B: GET /api/x\n    B<<--A: back\n    B<<-A: back\n",
+    "sequenceDiagram\n    A->>B\n    A-xB: y\n    A--xB: z\n    A->>+B: GET /api/x\n    B-->>A: ok\n",
+    "sequenceDiagram\n    Note overAPI: hi\n    Note over A , B : both\n    Note left of A: x\n    Note right of B: y\n",
+    "sequenceDiagram\n    A->>Note: x\n    as->>participant: y\n",
+    "sequenceDiagram\n    A->>end: x\n    altitude->>B: y\n    Notes->>B: z\n",
+    "\n\n  sequenceDiagram  \r\n    User->>Frontend: Click \"Login\"\r\n",
+    "sequenceDiagram\n    alt ok\n    A->>B: x\n    opt\n    B-->>A: y\n    end\n    else \"fail\"  \n    end\n",
+    "sequenceDiagram\n    par a\n    A->>B: x\n    and b\n    loop every 5s\n    B->>A: y\n    end\n    end\n",
+]
+
+# Rejected by the grammar; the fast path must not accept them either
+INVALID = [
+    "sequenceDiagram\n    Note->>B: x\n",
+    "sequenceDiagram\n    end->>B: x\n",
+    "sequenceDiagram\n    participant->>B: x\n",
+    "sequenceDiagram\n    A->>B:\n",
+    "sequenceDiagram\n    A-)B: async\n",
+    "sequenceDiagram\n    autonumber\n    A->>B: x\n",
+    "sequenceDiagram\n    activate A\n",
+    "sequenceDiagram\n    Note left  of A: x\n",
+    "sequenceDiagram\n    participant A as\n",
+    "sequenceDiagram\n    alt x\n    A->>B: y\n",
+    "sequenceDiagram\n    par x\n    else y\n    end\n",
+    "sequenceDiagram\n    A->>B: y\n    end\n",
+    "graph TD\n    A-->B\n",
+]
+
+# Valid for the grammar but outside the fast-path subset; must fall back to Lark
+FALLBACK = [
+    "sequenceDiagram\n    participant A asB\n",
+    "sequenceDiagram\n    alt:x\n    end\n",
+]
+
+
+def scan(block):
+    interpreter = MermaidInterpreter()
+    return scan_sequence(MermaidParser._normalize_block(block), interpreter), interpreter
+
+
+@pytest.fixture(scope="module")
+def lark_parser():
+    return MermaidParser(use_cache=False, fast_path=False, share_steps=False)
+
+
+@pytest.fixture(scope="module")
+def fast_parser():
+    return MermaidParser(use_cache=False, fast_path=True, share_steps=False)
+
+
+def test_examples_are_loaded():
+    assert example_blocks()
+
+
+@pytest.mark.parametrize("block", example_blocks() + SUPPORTED)
+def test_fast_path_matches_lark(block, lark_parser):
+    accepted, fast = scan(block)
+    assert accepted
+    
+    slow = lark_parser._interpret(block)
+    assert slow is not None
+    assert fast.steps == slow.steps
+    assert fast.actors == slow.actors
+    assert fast.flow == slow.flow
+    assert fast.branch_points == slow.branch_points
+
+
+@pytest.mark.parametrize("block", INVALID)
+def test_fast_path_rejects_what_lark_rejects(block, lark_parser, fast_parser):
+    accepted, _ = scan(block)
+    assert not accepted
+    assert lark_parser._interpret(block) is None
+    assert fast_parser._interpret(block) is None
+    assert not fast_parser.validate(block)
+
+
+@pytest.mark.parametrize("block", FALLBACK)
+def test_unsupported_constructs_fall_back_to_lark(block, lark_parser, fast_parser):
+    accepted, _ = scan(block)
+    assert not accepted
+    
+    fast = fast_parser._interpret(block)
+    slow = lark_parser._interpret(block)
+    assert fast is not None and slow is not None
+    assert fast.steps == slow.steps
+    assert fast.actors == slow.actors
+    assert fast_parser.validate(block)
+
+
+@pytest.mark.parametrize("block", example_blocks() + SUPPORTED + INVALID + FALLBACK)
+def test_parse_results_are_identical(block, lark_parser, fast_parser):
+    fast = fast_parser.parse(block)
+    slow = lark_parser.parse(block)
+    assert [(s.name, s.description, s.steps, s.metadata) for s in fast] == \
+        [(s.name, s.description, s.steps, s.metadata) for s in slow]
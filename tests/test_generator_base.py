@@ -0,0 +1,40 @@
+"""Defaults of the TestGenerator base class."""
+
+from bai_test_mcp.generators.base import GeneratedTest, ScenarioBundle, TestGenerator, fan_out
+from bai_test_mcp.parsers.base import StepType, TestScenario as Scenario, TestStep as Step
+
+
+class OutlineGenerator(TestGenerator):
+    """Writes each scenario as a commented outline, with no bundling of its own."""
+    
+    def generate(self, scenario):
+        return GeneratedTest(
+            name=f"{scenario.name}.txt",
+            code="\n".join([f"# {scenario.name}"] + [self.generate_step(step) for step in scenario.steps]),
+            language="text",
+            framework="outline",
+            imports=["# outline v1"],
+            setup_code="# setup"
+        )
+    
+    def generate_step(self, step):
+        return f"- {step.description}"
+
+
+def scenario(name, *actions):
+    return Scenario(name, "", [Step(StepType.USER_ACTION, "User", "Frontend", action) for action in actions])
+
+
+def test_default_bundle_concatenates_the_scenarios():
+    bundle = ScenarioBundle("bundle_001", [scenario("login", "click"), scenario("login", "type"), scenario("cart", "add")])
+    test = fan_out(bundle, {'outline': OutlineGenerator()})['outline']
+    
+    assert test.name == "bundle_001.txt"
+    assert test.metadata['scenario_names'] == ["login", "login_2", "cart"]
+    assert test.get_full_code() == "\n".join([
+        "# outline v1", "",
+        "# setup", "",
+        "# login", "- User click to Frontend", "",
+        "# login_2", "- User type to Frontend", "",
+        "# cart", "- User add to Frontend"
+    ])
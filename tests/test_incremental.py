@@ -0,0 +1,79 @@
+"""Incremental re-parsing of edited documents."""
+
+import pytest
+
+from bai_test_mcp.parsers import MermaidParser
+
+
+def block(*lines):
+    return "```mermaid\nsequenceDiagram\n" + "".join(f"    {line}\n" for line in lines) + "```\n"
+
+
+LOGIN = block("participant User", "User->>Frontend: 이메일 입력", "Frontend->>API: POST /api/auth/login")
+ORDERS = block("participant Shop", "Shop->>API: GET /api/orders", "API-->>Shop: 200 OK")
+PROFILE = block("participant Admin", "Admin->>API: GET /api/users/1")
+
+
+def document(*blocks):
+    return "\n# Section\n\n".join(blocks)
+
+
+@pytest.fixture
+def parser():
+    return MermaidParser(use_cache=False)
+
+
+def test_first_parse_adds_every_scenario(parser):
+    state, diff = parser.parse_incremental(document(LOGIN, ORDERS))
+    
+    assert diff.added == ["User_flow_0", "Shop_flow_1"]
+    assert diff.changed == diff.removed == diff.unchanged == []
+    assert diff.reparsed_blocks == 2
+    assert [s.name for s in state.scenarios] == [s.name for s in parser.parse(document(LOGIN, ORDERS))]
+
+
+def test_unchanged_document_reparses_nothing(parser):
+    state, _ = parser.parse_incremental(document(LOGIN, ORDERS))
+    again, diff = parser.parse_incremental(document(LOGIN, ORDERS), state)
+    
+    assert diff.reparsed_blocks == 0
+    assert diff.added == diff.changed == diff.removed == []
+    assert sorted(diff.unchanged) == ["Shop_flow_1", "User_flow_0"]
+    assert all(new is old for new, old in zip(again.scenarios, state.scenarios))
+
+
+def test_edited_block_keeps_its_name(parser):
+    state, _ = parser.parse_incremental(document(LOGIN, ORDERS))
+    edited = block("participant Shop", "Shop->>API: GET /api/orders?page=2", "API-->>Shop: 200 OK")
+    again, diff = parser.parse_incremental(document(LOGIN, edited), state)
+    
+    assert diff.reparsed_blocks == 1
+    assert diff.changed == ["Shop_flow_1"]
+    assert diff.added == diff.removed == []
+    assert again.scenarios[0] is state.scenarios[0]
+    assert again.scenarios[1].steps[0].action == "GET /api/orders?page=2"
+
+
+def test_shifted_blocks_keep_their_scenarios(parser):
+    state, _ = parser.parse_incremental(document(LOGIN, ORDERS))
+    again, diff = parser.parse_incremental(document(PROFILE, LOGIN, ORDERS), state)
+    
+    assert diff.reparsed_blocks == 1
+    assert diff.changed == diff.removed == []
+    assert diff.added == ["Admin_flow_0"]
+    assert [s.name for s in again.scenarios] == ["Admin_flow_0", "User_flow_0", "Shop_flow_1"]
+    assert again.scenarios[1] is state.scenarios[0] and again.scenarios[2] is state.scenarios[1]
+
+
+def test_added_and_removed_blocks(parser):
+    state, _ = parser.parse_incremental(document(LOGIN, ORDERS))
+    again, diff = parser.parse_incremental(document(LOGIN, PROFILE), state)
+    
+    assert diff.removed == ["Shop_flow_1"]
+    assert diff.added == ["Admin_flow_1"]
+    assert diff.unchanged == ["User_flow_0"]
+    
+    # A new block never takes a name that is still in use
+    third, diff = parser.parse_incremental(document(LOGIN, PROFILE, block("participant User", "User->>API: GET /api/me")), again)
+    assert diff.added == ["User_flow_2"]
+    assert len({s.name for s in third.scenarios}) == 3
@@ -0,0 +1,61 @@
+"""Planning which API calls of a scenario can run concurrently."""
+
+import pytest
+
+from bai_test_mcp.generators.lowering import lower_scenario, plan_call_batches
+from bai_test_mcp.parsers.base import StepType, TestScenario as Scenario, TestStep as Step
+
+
+def call(method, endpoint, payload=None, action=None):
+    data = {'method': method, 'endpoint': endpoint}
+    if payload is not None:
+        data['payload'] = payload
+    return Step(StepType.API_CALL, "Frontend", "API", action or f"{method} {endpoint}", data)
+
+
+def plan(*steps):
+    runs = plan_call_batches(lower_scenario(Scenario("s", "", list(steps))).steps)
+    return [[step.index for step in run] for run in runs]
+
+
+def test_independent_reads_share_a_run():
+    assert plan(call("GET", "/api/users"), call("GET", "/api/orders"), call("GET", "/api/users")) == [[1, 2, 3]]
+
+
+def test_auth_calls_order_everything_after_them():
+    assert plan(call("POST", "/api/auth/login"), call("GET", "/api/users"), call("GET", "/api/orders")) == \
+        [[1], [2, 3]]
+
+
+@pytest.mark.parametrize("later", [
+    call("GET", "/api/users/{id}"),
+    call("GET", "/api/users/:id/orders"),
+    call("GET", "/api/me", action="GET /api/me with the JWT token"),
+    call("POST", "/api/cart", payload='{"session": "s"}'),
+])
+def test_calls_using_earlier_data_start_a_run(later):
+    assert plan(call("GET", "/api/users"), later) == [[1], [2]]
+
+
+def test_writes_order_calls_on_the_same_resource():
+    assert plan(call("POST", "/api/orders"), call("GET", "/api/orders/42")) == [[1], [2]]
+    assert plan(call("GET", "/api/orders"), call("DELETE", "/api/orders/7")) == [[1], [2]]
+    assert plan(call("POST", "/api/orders"), call("POST", "/api/users")) == [[1, 2]]
+
+
+def test_assertions_follow_their_run_and_actions_are_barriers():
+    steps = [
+        call("GET", "/api/users"),
+        Step(StepType.ASSERTION, "API", "Frontend", "200 OK"),
+        call("GET", "/api/orders"),
+        Step(StepType.USER_ACTION, "User", "Frontend", "click"),
+        call("GET", "/api/items"),
+        Step(StepType.ASSERTION, "API", "Frontend", "토큰 발급"),
+    ]
+    assert plan(*steps) == [[1, 2, 3], [4], [5], [6]]
+
+
+def test_runs_cover_every_step_in_order():
+    steps = [call("GET", "/api/a"), Step(StepType.NOTE, "API"), call("POST", "/api/auth/token"),
+             call("GET", "/api/b"), Step(StepType.WAIT, "User"), call("GET", "/api/c/{id}")]
+    assert [index for run in plan(*steps) for index in run] == list(range(1, len(steps) + 1))
@@ -0,0 +1,119 @@
+"""Build manifest: generate re-runs skip work whose inputs are unchanged."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from bai_test_mcp.cli import cli
+from bai_test_mcp.generators import MANIFEST_NAME, BuildManifest
+from bai_test_mcp.generators.manifest import MANIFEST_VERSION
+
+
+def block(*lines):
+    return "```mermaid\nsequenceDiagram\n" + "".join(f"    {line}\n" for line in lines) + "```\n"
+
+
+LOGIN = block("participant User", "User->>Frontend: 이메일 입력", "Frontend->>API: POST /api/auth/login",
+              "API-->>Frontend: 200 OK")
+ORDERS = block("participant Shop", "Shop->>API: GET /api/orders", "API-->>Shop: 200 OK")
+
+
+@pytest.fixture
+def project(tmp_path):
+    diagram = tmp_path / "flow.md"
+    diagram.write_text(LOGIN + "\n" + ORDERS, encoding='utf-8')
+    return diagram, tmp_path / "out"
+
+
+def generate(diagram, output, *args):
+    result = CliRunner().invoke(cli, ["generate", str(diagram), "-o", str(output), "-f", "pytest", "--no-cache", *args],
+                                catch_exceptions=False)
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def inodes(output):
+    # Files are swapped in with os.replace, so a rewritten file gets a new inode
+    return {path.name: path.stat().st_ino for path in output.iterdir() if path.name != MANIFEST_NAME}
+
+
+def test_unchanged_run_is_skipped(project):
+    diagram, output = project
+    generate(diagram, output)
+    before = inodes(output)
+    assert len(before) == 2
+    assert (output / MANIFEST_NAME).exists()
+    
+    out = generate(diagram, output)
+    assert "Up to date" in out
+    assert inodes(output) == before
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_only_the_edited_scenario_is_rewritten(project, jobs):
+    diagram, output = project
+    generate(diagram, output, "--jobs", jobs)
+    before = inodes(output)
+    
+    diagram.write_text(LOGIN + "\n" + ORDERS.replace("/api/orders", "/api/orders?page=2"), encoding='utf-8')
+    out = generate(diagram, output, "--jobs", jobs)
+    after = inodes(output)
+    assert [name for name in after if after[name] != before[name]] == ["test_Shop_flow_1"]
+    assert "/api/orders?page=2" in (output / "test_Shop_flow_1").read_text(encoding='utf-8')
+    assert "1 up to date" in out
+
+
+def test_edited_output_is_restored(project):
+    diagram, output = project
+    generate(diagram, output)
+    test_file = output / "test_User_flow_0"
+    original = test_file.read_text(encoding='utf-8')
+    test_file.write_text(original + "# edited\n", encoding='utf-8')
+    before = inodes(output)
+    
+    generate(diagram, output)
+    after = inodes(output)
+    assert test_file.read_text(encoding='utf-8') == original
+    assert [name for name in after if after[name] != before[name]] == ["test_User_flow_0"]
+
+
+def test_identical_code_is_not_rewritten(project):
+    diagram, output = project
+    generate(diagram, output)
+    before = inodes(output)
+    
+    # Without a manifest every test is rendered again, but none of them differs
+    (output / MANIFEST_NAME).unlink()
+    out = generate(diagram, output)
+    assert "2 unchanged" in out
+    assert inodes(output) == before
+
+
+def test_no_manifest_rewrites_everything(project):
+    diagram, output = project
+    generate(diagram, output, "--no-manifest")
+    assert not (output / MANIFEST_NAME).exists()
+    before = inodes(output)
+    
+    generate(diagram, output, "--no-manifest")
+    after = inodes(output)
+    assert all(after[name] != before[name] for name in before)
+
+
+def test_removed_outputs_are_dropped_from_the_manifest(project):
+    diagram, output = project
+    generate(diagram, output)
+    diagram.write_text(LOGIN, encoding='utf-8')
+    generate(diagram, output)
+    
+    data = json.loads((output / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert list(data['outputs']) == ["test_User_flow_0"]
+    assert [source['outputs'] for source in data['sources'].values()] == [["test_User_flow_0"]]
+
+
+@pytest.mark.parametrize("text", ["not json", "[]", json.dumps({'version': MANIFEST_VERSION + 1, 'sources': {'x': {}}})])
+def test_unreadable_manifests_start_empty(tmp_path, text):
+    (tmp_path / MANIFEST_NAME).write_text(text, encoding='utf-8')
+    manifest = BuildManifest.load(tmp_path)
+    assert manifest.sources == {} and manifest.outputs == {}
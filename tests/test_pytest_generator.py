@@ -0,0 +1,178 @@
+"""Generated pytest suites: per-test and pooled clients, run against a local stub server."""
+
+import importlib.util
+import re
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bai_test_mcp.generators import PytestGenerator, ScenarioBundle, fan_out
+from bai_test_mcp.parsers.base import StepType, TestScenario as Scenario, TestStep as Step
+
+
+HAS_ASYNC = all(importlib.util.find_spec(name) for name in ("aiohttp", "pytest_asyncio"))
+needs_async = pytest.mark.skipif(not HAS_ASYNC, reason="aiohttp/pytest-asyncio not installed")
+
+SCENARIOS, CALLS = 4, 3
+
+_SCENARIO = re.compile(r"^/s(\d+)/")
+_COOKIE = re.compile(r"scenario=(\d+)")
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self):
+        super().__init__(("localhost", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.delay = 0.0
+        self.reset()
+    
+    def reset(self):
+        self.requests = self.connections = self.leaks = self.in_flight = self.peak = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+    
+    def do_GET(self):
+        # Each scenario gets a cookie naming it; seeing another scenario's means cookies leaked
+        scenario = _SCENARIO.match(self.path).group(1)
+        cookie = _COOKIE.search(self.headers.get("Cookie", ""))
+        with self.server.lock:
+            self.server.requests += 1
+            if cookie and cookie.group(1) != scenario:
+                self.server.leaks += 1
+            self.server.in_flight += 1
+            self.server.peak = max(self.server.peak, self.server.in_flight)
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"scenario={scenario}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def make_scenarios():
+    return [Scenario(f"flow_{n}", f"Scenario {n}", [
+        Step(StepType.API_CALL, "Frontend", "API", f"GET /s{n}/items/{i}", {'method': 'GET', 'endpoint': f"/s{n}/items/{i}"})
+        for i in range(CALLS)
+    ]) for n in range(SCENARIOS)]
+
+
+def run_bundle(server, tmp_path, config, *args):
+    """Generate one module for all scenarios, run it with pytest and return the pytest output."""
+    base_url = f"http://localhost:{server.server_address[1]}"
+    generator = PytestGenerator({'base_url': base_url, **config})
+    test = fan_out(ScenarioBundle("stub", make_scenarios()), {'pytest': generator})['pytest']
+    test.save(tmp_path / test.name)
+    
+    server.reset()
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *args, test.name],
+                            capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout[-3000:] + result.stderr[-2000:]
+    assert f"{SCENARIOS} passed" in result.stdout
+    assert server.requests == SCENARIOS * CALLS
+    assert server.leaks == 0
+    return result.stdout
+
+
+def test_default_output_is_unchanged():
+    fixtures = PytestGenerator({})._generate_fixtures()
+    assert 'scope="session"' not in fixtures
+    assert "HTTPAdapter" not in "\n".join(PytestGenerator({})._generate_imports())
+
+
+def test_pool_options_are_emitted():
+    generator = PytestGenerator({'pooled_client': True, 'pool_size': 4, 'max_retries': 2})
+    fixtures = generator._generate_fixtures()
+    assert "pool_maxsize=4" in fixtures and "Retry(total=2" in fixtures
+    compile("\n".join(generator._generate_imports()) + "\n" + fixtures, "<fixtures>", "exec")
+
+
+def test_per_test_client_connects_per_test(server, tmp_path):
+    run_bundle(server, tmp_path, {})
+    assert server.connections == SCENARIOS
+
+
+def test_pooled_client_reuses_one_connection(server, tmp_path):
+    run_bundle(server, tmp_path, {'pooled_client': True})
+    assert server.connections == 1
+
+
+def test_pooled_client_gives_each_xdist_worker_its_pool(server, tmp_path):
+    pytest.importorskip("xdist")
+    run_bundle(server, tmp_path, {'pooled_client': True}, "-n", "2")
+    assert server.connections <= 2
+
+
+@needs_async
+def test_async_pooled_client_reuses_one_connection(server, tmp_path):
+    run_bundle(server, tmp_path, {'use_async': True, 'pooled_client': True}, "-p", "asyncio")
+    assert server.connections == 1
+
+
+@needs_async
+def test_concurrent_calls_stay_within_the_limit(server, tmp_path):
+    server.delay = 0.05
+    try:
+        run_bundle(server, tmp_path, {'use_async': True, 'pooled_client': True, 'max_concurrency': 2}, "-p", "asyncio")
+    finally:
+        server.delay = 0.0
+    # Each test's calls are independent reads, so two of them are always in flight together
+    assert server.peak == 2
+    
+    code = (tmp_path / "test_stub.py").read_text(encoding='utf-8')
+    assert code.count("await gather_limited(") == SCENARIOS
+
+
+@needs_async
+def test_concurrent_calls_without_a_pooled_client(server, tmp_path):
+    server.delay = 0.05
+    try:
+        run_bundle(server, tmp_path, {'use_async': True, 'max_concurrency': 2}, "-p", "asyncio")
+    finally:
+        server.delay = 0.0
+    assert server.peak == 2
+
+
+def test_concurrent_output_keeps_the_run_order():
+    steps = [
+        Step(StepType.API_CALL, "Frontend", "API", "GET /api/users", {'method': 'GET', 'endpoint': '/api/users'}),
+        Step(StepType.ASSERTION, "API", "Frontend", "users", expected=200),
+        Step(StepType.API_CALL, "Frontend", "API", "GET /api/orders", {'method': 'GET', 'endpoint': '/api/orders'}),
+        Step(StepType.ASSERTION, "API", "Frontend", "orders"),
+    ]
+    code = PytestGenerator({'use_async': True, 'max_concurrency': 4}).generate(Scenario("shop", "", steps)).get_full_code()
+    compile(code, "<test>", "exec")
+    
+    lines = [line.strip() for line in code.splitlines()]
+    start = lines.index("# Steps 1, 3: independent API calls, run concurrently")
+    assert lines[start + 1] == "# Steps 2 come between these calls and are checked once all of them are done"
+    gather = lines.index("data_1, data_2 = await gather_limited(call_1(), call_2())")
+    assert start < gather < lines.index("# Step 2: API users to Frontend") < lines.index("# Step 4: API orders to Frontend")
+    assert "pytestmark = pytest.mark.asyncio" in lines and "@pytest_asyncio.fixture" in lines
@@ -0,0 +1,42 @@
+"""The tree-less recognizer behind MermaidParser.validate()."""
+
+import pytest
+from lark.exceptions import LarkError
+
+from bai_test_mcp.parsers.mermaid import get_compiled_parser
+
+
+VALID = [
+    "sequenceDiagram\n    participant User as 사용자\n    User->>API: POST /api/login\n    API-->>User: 200 OK\n",
+    "sequenceDiagram\n    alt ok\n    A->>B: x\n    opt\n    B-->>A: y\n    end\n    else fail\n    end\n",
+    "sequenceDiagram\n    par a\n    A->>B: x\n    and b\n    loop every 5s\n    B->>A: y\n    end\n    end\n",
+    "sequenceDiagram\n    Note over A, B: both\n",
+]
+
+INVALID = [
+    "sequenceDiagram\n    A->>B:\n",
+    "sequenceDiagram\n    alt x\n    A->>B: y\n",
+    "graph TD\n    A-->B\n",
+]
+
+
+@pytest.mark.parametrize("block", VALID)
+def test_recognizer_accepts_without_building_a_tree(block):
+    # The tree parser accepts the same block
+    assert get_compiled_parser().parse(block) is not None
+    assert get_compiled_parser(recognizer=True).parse(block) is None
+
+
+@pytest.mark.parametrize("block", INVALID)
+def test_recognizer_rejects_what_the_tree_parser_rejects(block):
+    with pytest.raises(LarkError):
+        get_compiled_parser().parse(block)
+    with pytest.raises(LarkError):
+        get_compiled_parser(recognizer=True).parse(block)
+
+
+def test_tree_parser_is_not_affected():
+    recognizer = get_compiled_parser(recognizer=True)
+    tree = get_compiled_parser().parse(VALID[0])
+    assert recognizer is not get_compiled_parser()
+    assert tree.data == "sequence" and len(tree.children) == 3
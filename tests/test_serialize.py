@@ -0,0 +1,161 @@
+"""Round-trip tests for the JSON-lines and binary scenario formats."""
+
+import io
+import json
+
+import pytest
+
+from bai_test_mcp.parsers import MermaidParser, StepPool, SharedStep
+# Aliased so pytest doesn't try to collect them as test classes
+from bai_test_mcp.parsers.base import StepType, TestScenario as Scenario, TestStep as Step
+from bai_test_mcp.parsers.serialize import (
+    BINARY_MAGIC, FORMAT_VERSION, dump_jsonl, dumps_binary, load_jsonl, loads_binary
+)
+
+
+DIAGRAM = """
+```mermaid
+sequenceDiagram
+    participant User as 사용자
+    User->>Frontend: 이메일 입력
+    Frontend->>API: POST /api/auth/login {"email": "ü@example.com"}
+    API-->>Frontend: JWT 토큰 발급
+    Note over API: 토큰은 1시간 유효 ✓
+    alt 성공
+        Frontend->>User: 메인 페이지로 리다이렉트
+    else 실패
+        Frontend->>User: "Error 😢"
+    end
+```
+"""
+
+
+def jsonl_round_trip(scenarios):
+    buffer = io.StringIO()
+    assert dump_jsonl(scenarios, buffer) == len(scenarios)
+    return list(load_jsonl(io.StringIO(buffer.getvalue())))
+
+
+def binary_round_trip(scenarios):
+    return loads_binary(dumps_binary(scenarios))
+
+
+ROUND_TRIPS = [jsonl_round_trip, binary_round_trip]
+
+
+def assert_same(decoded, scenarios):
+    assert decoded == scenarios
+    for got, want in zip(decoded, scenarios):
+        assert [step.description for step in got.steps] == [step.description for step in want.steps]
+        assert got.get_endpoints() == want.get_endpoints()
+        assert got.get_actors() == want.get_actors()
+        for step_type in StepType:
+            assert list(got.get_steps(step_type)) == list(want.get_steps(step_type))
+
+
+@pytest.fixture
+def shared_scenarios():
+    parser = MermaidParser(use_cache=False, step_pool=StepPool())
+    return parser.parse(DIAGRAM)
+
+
+@pytest.mark.parametrize("round_trip", ROUND_TRIPS)
+def test_round_trip_with_shared_steps(round_trip, shared_scenarios):
+    # Both alt paths hold the same shared steps before the branch
+    assert len(shared_scenarios) == 2
+    assert shared_scenarios[0].steps[0] is shared_scenarios[1].steps[0]
+    assert isinstance(shared_scenarios[0].steps[0], SharedStep)
+    
+    decoded = round_trip(shared_scenarios)
+    assert_same(decoded, shared_scenarios)
+    
+    # Decoded steps are independent and mutable
+    decoded[0].steps[0].set_data('note', 'x')
+    assert 'note' not in decoded[1].steps[0].data
+    assert 'note' not in shared_scenarios[0].steps[0].data
+
+
+@pytest.mark.parametrize("round_trip", ROUND_TRIPS)
+def test_round_trip_with_empty_data_and_defaults(round_trip):
+    scenarios = [
+        Scenario("empty", "", []),
+        Scenario("defaults", "no data", [
+            Step(StepType.USER_ACTION, "User"),
+            Step(StepType.WAIT, "User", None, "", {}, None, ""),
+            Step(StepType.API_CALL, "Frontend", "API", "GET /api/items",
+                     {'method': 'GET', 'endpoint': '/api/items'}, {'status': 200}, "목록 조회"),
+        ], {}),
+    ]
+    decoded = round_trip(scenarios)
+    assert_same(decoded, scenarios)
+    
+    empty_step = decoded[1].steps[0]
+    assert empty_step.data == {}
+    assert empty_step.target is None
+    assert empty_step.description == "User "
+    empty_step.set_data('k', 1)
+    assert decoded[1].steps[1].data == {}
+
+
+@pytest.mark.parametrize("round_trip", ROUND_TRIPS)
+def test_round_trip_with_unicode(round_trip):
+    scenarios = [Scenario("유니코드_흐름", "이메일 ✉️ 및 비밀번호 🔐", [
+        Step(StepType.ASSERTION, "API", "사용자", "토큰 발급 ✓", {'payload': '{"name": "Zoë"}'},
+                 "응답 😀", "설명 – ünïcödé"),
+    ], {'actors': {'API': 'API', '사용자': '사용자'}, 'conditions': ['성공 ✓']})]
+    assert_same(round_trip(scenarios), scenarios)
+
+
+def test_jsonl_is_readable_text():
+    buffer = io.StringIO()
+    dump_jsonl([Scenario("s", "이메일", [Step(StepType.NOTE, "API", action="✓")])], buffer)
+    header, line = buffer.getvalue().splitlines()
+    assert json.loads(header)['version'] == FORMAT_VERSION
+    assert "이메일" in line and "✓" in line
+
+
+def test_jsonl_rejects_a_bad_header():
+    with pytest.raises(ValueError, match="Not a scenario JSON-lines stream"):
+        list(load_jsonl(io.StringIO('{"format": "something-else", "version": 1}\n')))
+    with pytest.raises(ValueError, match="Not a scenario JSON-lines stream"):
+        list(load_jsonl(io.StringIO("")))
+
+
+def test_jsonl_rejects_a_version_mismatch():
+    buffer = io.StringIO()
+    dump_jsonl([Scenario("s", "d", [])], buffer)
+    header, rest = buffer.getvalue().split("\n", 1)
+    header = json.loads(header)
+    header['version'] = FORMAT_VERSION + 1
+    with pytest.raises(ValueError, match="Unsupported scenario format version"):
+        list(load_jsonl(io.StringIO(json.dumps(header) + "\n" + rest)))
+
+
+def test_binary_rejects_a_bad_magic_header():
+    payload = dumps_binary([Scenario("s", "d", [])])
+    with pytest.raises(ValueError, match="Not a binary scenario payload"):
+        loads_binary(b"XXXX" + payload[len(BINARY_MAGIC):])
+    with pytest.raises(ValueError, match="Not a binary scenario payload"):
+        loads_binary(b"")
+    with pytest.raises(ValueError, match="Not a binary scenario payload"):
+        loads_binary(BINARY_MAGIC)
+
+
+def test_binary_rejects_a_version_mismatch():
+    payload = bytearray(dumps_binary([Scenario("s", "d", [])]))
+    payload[len(BINARY_MAGIC)] = FORMAT_VERSION + 1
+    with pytest.raises(ValueError, match="Unsupported scenario format version"):
+        loads_binary(bytes(payload))
+
+
+def test_unknown_step_types_are_rejected():
+    scenario = Scenario("s", "d", [Step(StepType.NOTE, "User", action="hi")])
+    
+    buffer = io.StringIO()
+    dump_jsonl([scenario], buffer)
+    with pytest.raises(ValueError, match="Unknown step type 'teleport'"):
+        list(load_jsonl(io.StringIO(buffer.getvalue().replace('"note"', '"teleport"'))))
+    
+    payload = dumps_binary([scenario])
+    with pytest.raises(ValueError, match="Unknown step type 'notx'"):
+        loads_binary(payload.replace(b"note", b"notx"))
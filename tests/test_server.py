@@ -0,0 +1,65 @@
+"""MCP server tool handlers, called directly without an MCP session."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from bai_test_mcp.mcp.server import TestAutomationServer as AutomationServer  # noqa: E402
+
+
+def block(*lines):
+    return "```mermaid\nsequenceDiagram\n" + "".join(f"    {line}\n" for line in lines) + "```\n"
+
+
+LOGIN = block("participant User", "User->>Frontend: 이메일 입력", "Frontend->>API: POST /api/auth/login")
+ORDERS = block("participant Shop", "Shop->>API: GET /api/orders", "API-->>Shop: 200 OK")
+OTHER_LOGIN = block("participant User", "User->>API: GET /api/other")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # The handlers only wire the tools into an MCP session, which these tests don't use
+    monkeypatch.setattr(AutomationServer, "_register_handlers", lambda self: None)
+    return AutomationServer(use_cache=False)
+
+
+def call(handler, **args):
+    return json.loads(asyncio.run(handler(args))[0].text)
+
+
+def test_update_diagram_tracks_edits(server):
+    result = call(server._update_diagram, content=LOGIN + ORDERS, document_id="a")
+    assert result["added"] == ["User_flow_0", "Shop_flow_1"]
+    assert sorted(server.scenarios) == ["Shop_flow_1", "User_flow_0"]
+    
+    result = call(server._update_diagram, content=LOGIN, document_id="a")
+    assert result["removed"] == ["Shop_flow_1"]
+    assert result["reparsed_blocks"] == 0
+    assert sorted(server.scenarios) == ["User_flow_0"]
+    assert server.endpoints.scenarios_for("/api/orders") == []
+
+
+def test_removing_a_block_keeps_another_documents_scenario(server):
+    call(server._update_diagram, content=LOGIN, document_id="a")
+    call(server._update_diagram, content=OTHER_LOGIN, document_id="b")
+    # Both documents name their scenario User_flow_0; b's was stored last
+    theirs = server.documents["b"].scenarios[0]
+    assert server.scenarios["User_flow_0"] is theirs
+    
+    call(server._update_diagram, content=ORDERS, document_id="a")
+    assert server.scenarios["User_flow_0"] is theirs
+    assert server.endpoints.scenarios_for("/api/other") == ["User_flow_0"]
+    assert "Shop_flow_0" in server.scenarios
+
+
+def test_unchanged_scenarios_dont_take_a_name_back(server):
+    call(server._update_diagram, content=LOGIN, document_id="a")
+    call(server._update_diagram, content=OTHER_LOGIN, document_id="b")
+    theirs = server.scenarios["User_flow_0"]
+    
+    result = call(server._update_diagram, content=LOGIN + ORDERS, document_id="a")
+    assert result["unchanged"] == 1
+    assert server.scenarios["User_flow_0"] is theirs
@@ -0,0 +1,196 @@
+"""Per-type step indexes of TestScenario."""
+
+import dataclasses
+import pickle
+
+import pytest
+
+from bai_test_mcp.parsers.base import SharedStep, StepPool, StepType, TestScenario as Scenario, TestStep as Step
+
+
+def api(method, endpoint, actor="Frontend"):
+    return Step(StepType.API_CALL, actor, "API", f"{method} {endpoint}", {"method": method, "endpoint": endpoint})
+
+
+def click(actor="User"):
+    return Step(StepType.USER_ACTION, actor, "Frontend", "click")
+
+
+def check(scenario):
+    """The indexes must equal what a scan of the steps gives."""
+    fresh = Scenario(scenario.name, "", list(scenario.steps))
+    for step_type in StepType:
+        assert list(scenario.get_steps(step_type)) == [s for s in scenario.steps if s.step_type == step_type]
+        assert list(scenario.get_steps(step_type)) == list(fresh.get_steps(step_type))
+    assert list(scenario.get_actors()) == list(dict.fromkeys(s.actor for s in scenario.steps if s.actor))
+    assert list(scenario.get_endpoints()) == list(fresh.get_endpoints())
+
+
+@pytest.fixture
+def scenario():
+    return Scenario("login", "", [click(), api("POST", "/api/login"), api("GET", "/api/me", "Shop")])
+
+
+def test_lookups(scenario):
+    assert [s.action for s in scenario.get_api_calls()] == ["POST /api/login", "GET /api/me"]
+    assert len(scenario.get_user_actions()) == 1
+    assert list(scenario.get_steps(StepType.WAIT)) == []
+    assert scenario.get_actors() == ["User", "Frontend", "Shop"]
+    assert list(scenario.get_endpoints()) == ["POST /api/login", "GET /api/me"]
+
+
+def test_views_are_live(scenario):
+    calls = scenario.get_api_calls()
+    actors = scenario.actors_view()
+    scenario.add_step(api("DELETE", "/api/me", "Admin"))
+    assert len(calls) == 3
+    assert list(actors) == ["User", "Frontend", "Shop", "Admin"]
+    check(scenario)
+
+
+def test_get_actors_returns_a_list(scenario):
+    actors = scenario.get_actors()
+    assert isinstance(actors, list)
+    actors.append("Ghost")
+    assert "Ghost" not in scenario.get_actors()
+
+
+def test_views_are_read_only(scenario):
+    with pytest.raises(TypeError):
+        scenario.get_api_calls()[0] = click()
+
+
+def test_add_and_pop_update_counts(scenario):
+    repeat = api("POST", "/api/login")
+    scenario.add_step(repeat)
+    assert scenario.steps.pop() is repeat
+    # Still used by the first call
+    assert "POST /api/login" in list(scenario.get_endpoints())
+    
+    scenario.steps.pop()
+    assert list(scenario.get_endpoints()) == ["POST /api/login"]
+    assert list(scenario.get_actors()) == ["User", "Frontend"]
+    check(scenario)
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda steps: steps.insert(0, api("PUT", "/api/x", "Admin")),
+    lambda steps: steps.pop(0),
+    lambda steps: steps.remove(steps[1]),
+    lambda steps: steps.reverse(),
+    lambda steps: steps.sort(key=lambda s: s.action),
+    lambda steps: steps.__setitem__(0, api("PUT", "/api/x", "Admin")),
+    lambda steps: steps.__setitem__(slice(0, 2), [click("Admin")]),
+    lambda steps: steps.__delitem__(slice(1, None)),
+    lambda steps: steps.extend([click("Admin"), api("GET", "/api/y")]),
+    lambda steps: steps.__iadd__([click("Admin")]),
+    lambda steps: steps.__imul__(2),
+    lambda steps: steps.clear(),
+])
+def test_list_mutations_keep_indexes_in_sync(scenario, mutate):
+    mutate(scenario.steps)
+    check(scenario)
+
+
+def test_remove_step(scenario):
+    scenario.remove_step(scenario.steps[0])
+    assert list(scenario.get_actors()) == ["Frontend", "Shop"]
+    assert len(scenario.get_user_actions()) == 0
+    check(scenario)
+
+
+def test_assigning_steps_rebuilds_indexes(scenario):
+    scenario.steps = [click("Admin")]
+    assert list(scenario.get_actors()) == ["Admin"]
+    assert list(scenario.get_api_calls()) == []
+    check(scenario)
+
+
+def test_pickle_rebuilds_indexes(scenario):
+    loaded = pickle.loads(pickle.dumps(scenario))
+    assert loaded == scenario
+    assert list(loaded.get_endpoints()) == list(scenario.get_endpoints())
+    loaded.add_step(click("Admin"))
+    check(loaded)
+
+
+def test_pool_shares_equal_steps():
+    pool = StepPool()
+    first = pool.intern(api("POST", "/api/login"))
+    second = pool.intern(api("POST", "/api/login"))
+    assert first is second and isinstance(first, SharedStep)
+    assert pool.intern(api("POST", "/api/logout")) is not first
+    assert (pool.hits, pool.misses, len(pool)) == (1, 2, 2)
+
+
+def test_pool_keeps_equal_but_differently_typed_data_apart():
+    pool = StepPool()
+    step = Step(StepType.WAIT, "User", data={"seconds": 1})
+    assert pool.intern(step) is not pool.intern(Step(StepType.WAIT, "User", data={"seconds": 1.0}))
+    assert pool.intern(step) is not pool.intern(Step(StepType.WAIT, "User", data={"seconds": True}))
+
+
+def test_pool_returns_steps_with_unhashable_data_unchanged():
+    step = Step(StepType.WAIT, "User", data={"until": {1, 2}})
+    assert StepPool().intern(step) is step
+
+
+def test_shared_steps_are_immutable():
+    shared = StepPool().intern(api("POST", "/api/login"))
+    with pytest.raises(TypeError):
+        shared.action = "x"
+    with pytest.raises(TypeError):
+        shared.set_data("k", 1)
+    with pytest.raises(TypeError):
+        shared.data["k"] = 1
+    
+    annotated = shared.with_data(response_var="login")
+    assert annotated.data["response_var"] == "login"
+    assert "response_var" not in shared.data
+
+
+def test_edit_step_copies_on_write():
+    pool = StepPool()
+    first = Scenario("a", "", [pool.intern(click()), pool.intern(api("POST", "/api/login"))])
+    second = Scenario("b", "", [pool.intern(click()), pool.intern(api("POST", "/api/login"))])
+    
+    step = first.edit_step(1)
+    step.set_data("response_var", "login")
+    assert first.steps[1] is step and not isinstance(step, SharedStep)
+    assert "response_var" not in second.steps[1].data
+    assert first.get_api_calls()[0] is step
+    check(first)
+
+
+def test_data_of_a_step_without_data_is_its_own():
+    first, second = click(), click()
+    first.data["selector"] = "#login"
+    
+    handle = second.data
+    handle["x"] = 1
+    handle["y"] = 2
+    
+    assert first.data == {"selector": "#login"}
+    assert second.data == {"x": 1, "y": 2}
+    assert click().data == {}
+    assert pickle.loads(pickle.dumps(second)) == second
+
+
+def test_shared_empty_data_stays_read_only():
+    shared = StepPool().intern(click())
+    with pytest.raises(TypeError):
+        shared.data["k"] = 1
+    assert click().data == {}
+
+
+def test_dataclass_helpers():
+    step = api("POST", "/api/login")
+    
+    assert [f.name for f in dataclasses.fields(step)] == \
+        ["step_type", "actor", "target", "action", "data", "expected", "description"]
+    assert dataclasses.asdict(click())["data"] == {}
+    assert dataclasses.asdict(step)["data"] == {"method": "POST", "endpoint": "/api/login"}
+    
+    moved = dataclasses.replace(step, actor="Shop")
+    assert moved.actor == "Shop" and step.actor == "Frontend"
+    assert moved.data == step.data
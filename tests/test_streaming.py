@@ -0,0 +1,62 @@
+"""Streaming block extraction and parse_iter()."""
+
+import io
+
+import pytest
+
+from bai_test_mcp.parsers import MermaidParser
+
+
+BARE = "sequenceDiagram\n    participant User\n    User->>API: GET /api/me\n"
+
+
+def block(*lines):
+    return "```mermaid\nsequenceDiagram\n" + "".join(f"    {line}\n" for line in lines) + "```\n"
+
+
+class Lines:
+    """Non-seekable line stream that records how far it has been read."""
+    
+    def __init__(self, text):
+        self.lines = text.splitlines(keepends=True)
+        self.read = 0
+    
+    def __iter__(self):
+        for line in self.lines:
+            self.read += 1
+            yield line
+
+
+@pytest.fixture
+def parser():
+    return MermaidParser(use_cache=False)
+
+
+def test_blocks_are_yielded_as_soon_as_they_close(parser):
+    stream = Lines("# Title\n\n" + block("participant User", "User->>API: GET /a") + "\nprose\n" * 100
+                   + block("participant Shop", "Shop->>API: GET /b"))
+    blocks = parser.iter_blocks(stream)
+    assert next(blocks).startswith("sequenceDiagram")
+    assert stream.read == 7
+    assert len(list(blocks)) == 1
+
+
+def test_bare_diagram_from_a_stream(parser):
+    for stream in (Lines("\n\n" + BARE), io.StringIO(BARE)):
+        assert [s.name for s in parser.parse_iter(stream)] == ["User_flow_0"]
+
+
+def test_prose_without_fences_is_not_a_diagram(parser):
+    # Mentioning sequenceDiagram in prose doesn't make the document a diagram
+    assert list(parser.iter_blocks(Lines("# Notes\nWe use sequenceDiagram blocks.\n" * 50))) == []
+
+
+def test_fences_win_over_a_bare_start(parser):
+    text = BARE + "\n" + block("participant Shop", "Shop->>API: GET /b")
+    assert [s.name for s in parser.parse_iter(Lines(text))] == ["Shop_flow_0"]
+
+
+def test_parse_iter_matches_parse(parser):
+    text = block("participant User", "User->>API: GET /a") + "\ntext\n" + block("participant Shop", "Shop->>API: GET /b")
+    assert list(parser.parse_iter(Lines(text))) == parser.parse(text)
+    assert list(parser.parse_iter(Lines(BARE))) == parser.parse(BARE)